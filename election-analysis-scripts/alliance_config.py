@@ -0,0 +1,116 @@
+# Alliance membership per election, compiled into one tagging pass by alliance_rules.py
+# For each election year and alliance:
+# - parties: member parties everywhere (party names as in the results; matching ignores case, & vs AND, punctuation)
+# - state_parties: parties that were only alliance members in some states {party: [states]}; their candidates
+#   elsewhere were in friendly contests or are a different party with the same name
+# - candidates: individual candidates backed by the alliance, e.g. independents [(state, constituency, candidate)]
+# - friendly_contests: where several members contest the same seat, "strongest" keeps the member with most votes as
+#   the alliance candidate; "all" keeps every member
+# States and constituencies use canonical names (election-data/constituencies.csv)
+
+alliances = {
+    2024: {
+        "NDA": {
+            "parties": ['BHARATIYA JANATA PARTY', 'TELUGU DESAM',
+                        'JANATA DAL (UNITED)', 'SHIV SENA',
+                        'PATTALI MAKKAL KATCHI', 'LOK JANSHAKTI PARTY(RAM VILAS)',
+                        'NATIONALIST CONGRESS PARTY', 'BHARATH DHARMA JANA SENA',
+                        'JANATA DAL (SECULAR)', 'TAMIL MAANILA CONGRESS (MOOPANAR)',
+                        'AMMA MAKKAL MUNNETTRA KAZAGAM', 'APNA DAL (SONEYLAL)',
+                        'ASOM GANA PARISHAD', 'JANASENA PARTY',
+                        'RASHTRIYA LOK DAL',
+                        'HINDUSTANI AWAM MORCHA (SECULAR)',
+                        'NAGA PEOPLES FRONT', 'NATIONALIST DEMOCRATIC PROGRESSIVE PARTY',
+                        'SIKKIM KRANTIKARI MORCHA', 'RASHTRIYA LOK MORCHA',
+                        'SUHELDEV BHARATIYA SAMAJ PARTY',
+                        "UNITED PEOPLE'S PARTY, LIBERAL"],
+            "state_parties": {
+                # The Rashtriya Samaj Paksha (RSP) contested 18 seats, of which only 1 (in Maharashtra) was part of the
+                # NDA. In the other 17 seats they must have had friendly contests and got <1% vote share
+                'RASHTRIYA SAMAJ PAKSHA': ['MAHARASHTRA'],
+                # The AJSU contested 3 seats, of which only 1 (Giridih in Jharkhand) was part of NDA.
+                # In the other 2 seats they must have had friendly contests and got <0.5% vote share
+                'AJSU PARTY': ['JHARKHAND'],
+                # The National People's Party contested 3 seats, of which 2 (both in Meghalaya) were part of NDA
+                # The other seat is in Mumbai so probably a totally different one-seat party
+                "NATIONAL PEOPLE'S PARTY": ['MEGHALAYA'],
+            },
+            # Independent O. Paneerselvam in TN - Ramanathapuram
+            "candidates": [('TAMIL NADU', 'RAMANATHAPURAM', 'PANNEERSELVAM O S/O OTTAKARATHEVAR')],
+            # In Sikkim's lone seat, SKM and BJP are both part of NDA and both contested
+            # But SKM got ~8x BJP's votes and was the main NDA contestant
+            "friendly_contests": "strongest",
+        },
+        "INDIA": {
+            "parties": ['INDIAN NATIONAL CONGRESS', 'SAMAJWADI PARTY',
+                        'ALL INDIA TRINAMOOL CONGRESS', 'DRAVIDA MUNNETRA KAZHAGAM',
+                        'SHIV SENA (UDDHAV BALASAHEB THACKREY)', 'NATIONALIST CONGRESS PARTY – SHARADCHANDRA PAWAR',
+                        'RASHTRIYA JANATA DAL', 'AAM AADMI PARTY',
+                        'JHARKHAND MUKTI MORCHA', 'COMMUNIST PARTY OF INDIA (MARXIST)',
+                        'INDIAN UNION MUSLIM LEAGUE', 'JAMMU & KASHMIR NATIONAL CONFERENCE',
+                        'COMMUNIST PARTY OF INDIA', 'KERALA CONGRESS (M)',
+                        'VIDUTHALAI CHIRUTHAIGAL KATCHI', 'REVOLUTIONARY SOCIALIST PARTY',
+                        'MARUMALARCHI DRAVIDA MUNNETRA KAZHAGAM',
+                        'COMMUNIST PARTY OF INDIA (MARXIST–LENINIST) LIBERATION',
+                        'KERALA CONGRESS', 'PEASANTS AND WORKERS PARTY OF INDIA',
+                        'ALL INDIA FORWARD BLOC', 'JAMMU AND KASHMIR PEOPLES DEMOCRATIC PARTY',
+                        'MANITHANEYA MAKKAL KATCHI', 'KONGUNADU MAKKAL DESIA KATCHI',
+                        'RAIJOR DAL', 'ASSAM JATIYA PARISHAD',
+                        'ALL PARTY HILL LEADERS CONFERENCE', 'ANCHALIK GANA MORCHA',
+                        'MAKKAL NEEDHI MAIAM', 'GOA FORWARD PARTY',
+                        'RASHTRIYA LOKTANTRIK PARTY', 'PURBANCHAL LOK PARISHAD',
+                        'JATIYA DAL ASSAM', 'SAMAJWADI GANARAJYA PARTY',
+                        'INDIAN NATIONAL LEAGUE', 'BHARAT ADIVASI PARTY'],
+            "state_parties": {},
+            "candidates": [],
+            # e.g. INC vs Left in Kerala, INC vs AITC in West Bengal
+            "friendly_contests": "strongest",
+        },
+    },
+    2019: {
+        # The list of full party names is from Wikipedia. I have manually matched full names to acronyms in the EC
+        # election results data
+        "NDA": {
+            "parties": ["BJP", "ADMK", "SAD",
+                        "PMK", "LJP", "BDJS", "DMDK", "AGP",
+                        "ADAL", "AJSUP", "TMC(M)", "AINRC",
+                        "BOPF", "NDPP", "KEC(M)", "RLTP"],  # NB. "Puthiya Tamilagam" in TN subsumed in ADMK in EC data
+            "state_parties": {
+                # SHS and JD(U) have tiny presences in WB, Bihar, UP, Punjab (SHS) and UP, J&K, Lakshadweep, MP,
+                # Manipur, Punjab (JD(U)); their candidates there were not in official NDA grouping
+                "SHS": ["MAHARASHTRA"],
+                "JD(U)": ["BIHAR"],
+            },
+            # Mandya, where "Sumalatha (Independent candidate)" is NDA
+            "candidates": [("KARNATAKA", "MANDYA", "SUMALATHA AMBAREESH")],
+            "friendly_contests": "strongest",
+        },
+        "UPA": {
+            # NB: "Marumalarchi Dravida Munnetra Kazhagam", "Kongunadu Makkal Desia Katchi", and "Indhiya Jananayaga
+            # Katchi" (1 seat each in TN) all subsumed into DMK in ECI results
+            # Need to add independent candidates
+            "parties": ["INC",
+                        "DMK",
+                        "NCP",
+                        "JD(S)",
+                        "BLSP",
+                        "JMM",  # Jharkhand Mukti Morcha
+                        "CPI",
+                        "CPIM",  # Not in Kerala!
+                        "HAMS",
+                        "VSIP",
+                        "IUML",
+                        "JANADIP",  # What was SP doing in UP?
+                        "VCK",  # One of VCK's two candidates (Viluppuram, TN) seems to have been labelled as DMK
+                        "JVM",
+                        "SWP",
+                        "BVA",
+                        "CPI(ML)(L)",
+                        "KEC(M)",
+                        "RSP"],
+            "state_parties": {},
+            "candidates": [],
+            "friendly_contests": "strongest",
+        },
+    },
+}
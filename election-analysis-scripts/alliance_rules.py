@@ -0,0 +1,100 @@
+# Alliance tagging: compiles the declarative alliance config (alliance_config.py) into lookup tables, then tags every
+# candidate row for every alliance and year in one vectorised pass
+# Result is an integer array with one bit per alliance, so candidates can belong to several alliances (e.g. a party
+# listed under two alliances in the same year) and one array covers all alliances and years.
+# Replaces per-alliance party-list isin() checks followed by a chain of copy-and-filter exceptions.
+
+# Load packages
+import numpy as np
+import pandas as pd
+
+from alliance_config import alliances
+from name_resolution import match_key
+
+
+class AllianceRules:
+    """Alliance membership rules for all elections, compiled for vectorised tagging."""
+
+    def __init__(self, config=alliances):
+        self.config = config
+        self.names = list(dict.fromkeys(name for year in config.values() for name in year))
+        self.bits = {name: 1 << position for position, name in enumerate(self.names)}
+
+        # Lookup tables: bitmask of alliances per (year, party), (year, party, state) and (year, state, constituency,
+        # candidate). Party names are compared by match key, so "&"/"AND" and punctuation variants still match
+        party_bits, state_party_bits, candidate_bits = {}, {}, {}
+        self.strongest = []  # (year, bit) of alliances whose friendly contests keep the strongest member
+        for year, year_alliances in config.items():
+            for name, rules in year_alliances.items():
+                bit = self.bits[name]
+                for party in rules.get("parties", []):
+                    key = (year, match_key(party))
+                    party_bits[key] = party_bits.get(key, 0) | bit
+                for party, states in rules.get("state_parties", {}).items():
+                    for state in states:
+                        key = (year, match_key(party), state)
+                        state_party_bits[key] = state_party_bits.get(key, 0) | bit
+                for state, constituency, candidate in rules.get("candidates", []):
+                    key = (year, state, constituency, candidate)
+                    candidate_bits[key] = candidate_bits.get(key, 0) | bit
+                if rules.get("friendly_contests", "all") == "strongest":
+                    self.strongest.append((year, bit))
+        self.party_bits = self.lookup_table(party_bits)
+        self.state_party_bits = self.lookup_table(state_party_bits)
+        self.candidate_bits = self.lookup_table(candidate_bits)
+
+    @staticmethod
+    def lookup_table(bits):
+        if not bits:
+            return pd.Series(dtype="int64")
+        return pd.Series(list(bits.values()), index=pd.MultiIndex.from_tuples(list(bits)), dtype="int64")
+
+    @staticmethod
+    def lookup(table, keys):
+        # Bitmask per row: hash lookup of every row's key at once (0 where there's no rule)
+        if table.empty:
+            return np.zeros(len(keys[0]), dtype="int64")
+        return table.reindex(pd.MultiIndex.from_arrays(keys)).fillna(0).to_numpy(dtype="int64")
+
+    def tag(self, results, year=None, friendly_contests=True):
+        """Alliance bitmask per candidate row.
+
+        results needs Party, State, Constituency, Candidate, Constituency ID and Total Votes columns, plus Year unless
+        `year` is given. With friendly_contests=False, every member is tagged: friendly contests aren't resolved.
+        """
+        years = results["Year"].to_numpy() if year is None else np.full(len(results), year)
+
+        # Match keys are computed once per distinct party name, not per row
+        party_codes, party_names = pd.factorize(results["Party"].astype(object))
+        party_keys = np.array([match_key(party) for party in party_names] + [None], dtype=object)[party_codes]
+
+        codes = (self.lookup(self.party_bits, [years, party_keys])
+                 | self.lookup(self.state_party_bits, [years, party_keys, results["State"].to_numpy(dtype=object)])
+                 | self.lookup(self.candidate_bits, [years, results["State"].to_numpy(dtype=object),
+                                                     results["Constituency"].to_numpy(dtype=object),
+                                                     results["Candidate"].to_numpy(dtype=object)]))
+        return self.resolve_friendly_contests(codes, results, years) if friendly_contests else codes
+
+    def resolve_friendly_contests(self, codes, results, years):
+        # Where several members of a "strongest" alliance contest a seat, only the one with most votes keeps the tag
+        constituency_ids = results["Constituency ID"].to_numpy(dtype="int64")
+        votes = results["Total Votes"].to_numpy(dtype="float64")
+        for year, bit in self.strongest:
+            members = np.flatnonzero(((codes & bit) != 0) & (years == year))
+            # Stable sort by constituency, most votes first: the first member of each constituency is the strongest
+            order = members[np.lexsort((-votes[members], constituency_ids[members]))]
+            weaker = np.zeros(len(order), dtype=bool)
+            weaker[1:] = constituency_ids[order][1:] == constituency_ids[order][:-1]
+            codes[order[weaker]] &= ~bit
+        return codes
+
+    def is_member(self, codes, alliance):
+        """Boolean mask of the rows tagged with an alliance."""
+        return (codes & self.bits[alliance]) != 0
+
+    def unmatched_parties(self, results, year):
+        """Parties in the year's config that don't appear in the results (likely spelling differences)."""
+        result_keys = {match_key(party) for party in pd.unique(results["Party"].astype(object))}
+        return sorted({party for rules in self.config[year].values()
+                       for party in [*rules.get("parties", []), *rules.get("state_parties", {})]
+                       if match_key(party) not in result_keys})
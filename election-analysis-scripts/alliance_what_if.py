@@ -0,0 +1,200 @@
+# Alliance what-ifs: seats under hypothetical alliance maps, many at once
+# A scenario moves parties between alliances, relative to the alliance config's membership for the year:
+#   {"AAP in NDA": {"AAM AADMI PARTY": "NDA"},              # AAP's candidates leave INDIA and join the NDA
+#    "JD(U) in INDIA": {"JANATA DAL (UNITED)": "INDIA"},
+#    "No TDP": {"TELUGU DESAM": None}}                       # None: the party stands alone
+# A moved party's candidates in every state move; alliance names not in the config make new alliances. alliance_maps()
+# enumerates every combination of choices, e.g. alliance_maps({"AAM AADMI PARTY": ["INDIA", "NDA", None], ...}).
+# Under each scenario every alliance fields one candidate per constituency, its strongest member, with all its members'
+# votes pooled: partners don't field rival candidates. With pool=False, friendly contests are resolved as in
+# alliance_rules.py instead: the strongest member is the alliance's candidate and the others stand alone (with the
+# config's membership, this gives the actual results). The winner is the candidate or alliance with most votes.
+# Only candidates whose alliance can differ between scenarios are evaluated per scenario: every alliance member and
+# every candidate of a moved party, in a constituency x slot layout (slot 0: the strongest of the other candidates,
+# which never changes). Alliance votes for all scenarios and alliances come from one sparse aggregation: a scenario
+# x alliance x candidate membership matrix times a candidate x constituency votes matrix.
+#   what_if = alliance_what_if(2024, scenarios)
+#   what_if.alliance_seats; what_if.winners("AAP in NDA")
+
+# Load packages
+from itertools import product
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from alliance_rules import AllianceRules
+from name_resolution import match_key
+from results_store import load_results
+
+default_chunk_size = 500  # Scenarios per batch
+
+
+def alliance_maps(choices):
+    """Scenarios for every combination of choices {party: [alliance or None, ...]}, named after their moves."""
+    parties = list(choices)
+    return {"; ".join(f"{party}: {alliance or 'alone'}" for party, alliance in zip(parties, combination)):
+            dict(zip(parties, combination)) for combination in product(*choices.values())}
+
+
+class WhatIfResults:
+    """Seats and winners under each scenario.
+
+    - alliance_seats: scenario x alliance seat counts
+    - party_seats: scenario x party seat counts (an alliance's seats go to its strongest member there), for every
+      party that won a seat under any scenario
+    - winner_parties, winner_alliances: scenario x constituency positions in `parties`/`alliances` (-1: none)
+    """
+
+    def __init__(self, scenarios, constituencies, parties, alliances, winner_parties, winner_alliances):
+        self.scenarios, self.constituencies = pd.Index(scenarios, name="scenario"), constituencies
+        self.parties, self.alliances = parties, alliances
+        self.winner_parties, self.winner_alliances = winner_parties, winner_alliances
+        rows = np.arange(len(self.scenarios))[:, None]
+        seats = np.zeros((len(self.scenarios), len(alliances) + 1), dtype=int)
+        np.add.at(seats, (rows, winner_alliances), 1)  # Column -1: seats won outside the alliances
+        self.alliance_seats = pd.DataFrame(seats[:, :-1], index=self.scenarios,
+                                           columns=pd.Index(alliances, name="alliance"))
+        seats = np.zeros((len(self.scenarios), len(parties)), dtype=int)
+        np.add.at(seats, (rows, winner_parties), 1)
+        won = seats.any(axis=0)
+        self.party_seats = pd.DataFrame(seats[:, won], index=self.scenarios,
+                                        columns=pd.Index(np.asarray(parties)[won], name="party"))
+
+    def winners(self, scenario):
+        """Winning party and alliance (None outside the alliances) in every constituency under one scenario."""
+        position = self.scenarios.get_loc(scenario)
+        alliances = np.array(list(self.alliances) + [None], dtype=object)
+        return pd.DataFrame({"Party": np.asarray(self.parties, dtype=object)[self.winner_parties[position]],
+                             "Alliance": alliances[self.winner_alliances[position]]}, index=self.constituencies)
+
+
+class AllianceWhatIf:
+    """One election's candidate results and alliance membership, for evaluating alliance scenarios in batches."""
+
+    def __init__(self, results, year, alliance_rules=None):
+        # results: candidate-level results with the columns AllianceRules.tag needs
+        alliance_rules = alliance_rules or AllianceRules()
+        results = results.reset_index(drop=True)
+        codes = alliance_rules.tag(results, year=year, friendly_contests=False)
+        self.alliances = list(alliance_rules.config.get(year, {}))
+        self.member = np.column_stack([alliance_rules.is_member(codes, alliance) for alliance in self.alliances]
+                                      + [np.zeros((len(results), 0), dtype=bool)])
+
+        self.party_codes, self.parties = pd.factorize(results["Party"].astype(object))
+        self.party_positions = {}
+        for position, party in enumerate(self.parties):
+            self.party_positions.setdefault(match_key(party), position)
+        constituency_ids = results["Constituency ID"].to_numpy(dtype="int64")
+        self.constituencies = pd.Index(np.unique(constituency_ids), name="Constituency ID")
+        self.rows = self.constituencies.get_indexer(constituency_ids)
+        self.votes = results["Total Votes"].to_numpy(dtype=float)
+
+    def party_position(self, party):
+        position = self.party_positions.get(match_key(party))
+        if position is None:
+            raise ValueError(f"Party not in the results: {party}")
+        return position
+
+    def evaluate(self, scenarios, pool=True, chunk_size=default_chunk_size):
+        """WhatIfResults of scenarios {name: {party: alliance or None}}, in batches of chunk_size scenarios.
+
+        pool: pool the votes of an alliance's members in each constituency; False: only its strongest member's count.
+        """
+        names = list(scenarios)
+        alliances = list(dict.fromkeys(self.alliances + [alliance for moves in scenarios.values()
+                                                         for alliance in moves.values() if alliance is not None]))
+        moves = [{self.party_position(party): alliance for party, alliance in scenario.items()}
+                 for scenario in scenarios.values()]
+        moved_parties = np.array(sorted({party for scenario in moves for party in scenario}), dtype=int)
+
+        # Slot candidates: alliance members and moved parties' candidates, strongest first within each constituency
+        member = np.zeros((len(self.votes), len(alliances)), dtype=bool)
+        member[:, :len(self.alliances)] = self.member
+        slotted = np.flatnonzero(member.any(axis=1) | np.isin(self.party_codes, moved_parties))
+        slotted = slotted[np.lexsort((-self.votes[slotted], self.rows[slotted]))]
+        slot_rows = self.rows[slotted]
+        slot = np.arange(len(slotted)) - np.searchsorted(slot_rows, slot_rows) + 1
+        slots = slot.max() + 1 if len(slotted) else 1
+
+        # Slot 0: the strongest of the other candidates in each constituency
+        others = np.ones(len(self.votes), dtype=bool)
+        others[slotted] = False
+        other_order = np.flatnonzero(others)[np.lexsort((-self.votes[others], self.rows[others]))]
+        first_other = other_order[np.unique(self.rows[other_order], return_index=True)[1]]
+        slot_party = np.full((len(self.constituencies), slots), -1)
+        slot_votes = np.full(slot_party.shape, -np.inf)
+        slot_party[self.rows[first_other], 0] = self.party_codes[first_other]
+        slot_votes[self.rows[first_other], 0] = self.votes[first_other]
+        slot_party[slot_rows, slot] = self.party_codes[slotted]
+        slot_votes[slot_rows, slot] = self.votes[slotted]
+        slot_positions = np.ravel_multi_index((slot_rows, slot), slot_party.shape)
+        # Candidate x constituency votes, for pooling alliance votes with one sparse product
+        pooling = sp.csr_matrix((self.votes[slotted], (np.arange(len(slotted)), slot_rows)),
+                                shape=(len(slotted), len(self.constituencies)))
+
+        # Membership of the slot candidates under each scenario: the config's, except for moved parties
+        slotted_member = member[slotted]
+        party_slots = {party: np.flatnonzero(self.party_codes[slotted] == party) for party in moved_parties}
+        winner_parties, winner_alliances = [], []
+        for start in range(0, len(names), chunk_size):
+            chunk = moves[start:start + chunk_size]
+            scenario_member = np.broadcast_to(slotted_member, (len(chunk), *slotted_member.shape)).copy()
+            for position, scenario in enumerate(chunk):
+                for party, alliance in scenario.items():
+                    scenario_member[position, party_slots[party]] = False
+                    if alliance is not None:
+                        scenario_member[position, party_slots[party], alliances.index(alliance)] = True
+            parties, alliance_won = self.chunk_winners(scenario_member, pooling, slot_party, slot_votes,
+                                                       slot_positions, pool)
+            winner_parties.append(parties)
+            winner_alliances.append(alliance_won)
+
+        empty = np.zeros((0, len(self.constituencies)), dtype=int)
+        return WhatIfResults(names, self.constituencies, self.parties, alliances,
+                             np.concatenate(winner_parties + [empty]), np.concatenate(winner_alliances + [empty]))
+
+    @staticmethod
+    def chunk_winners(scenario_member, pooling, slot_party, slot_votes, slot_positions, pool=True):
+        """Winning party and alliance positions (scenario x constituency) for a batch of scenario memberships."""
+        scenarios, candidates, alliances = scenario_member.shape
+        constituencies, slots = slot_party.shape
+
+        member_slots = np.zeros((scenarios, constituencies * slots, alliances), dtype=bool)
+        member_slots[:, slot_positions] = scenario_member
+        member_slots = member_slots.reshape(scenarios, constituencies, slots, alliances)
+        fielded = member_slots.any(axis=2)
+        # Each alliance's candidate is its strongest member (slots are strongest first)
+        rows = np.arange(constituencies)[None, :, None]
+        strongest_slot = member_slots.argmax(axis=2)
+        strongest = slot_party[rows, strongest_slot]
+
+        if pool:
+            # Pooled votes of every alliance in every constituency: (scenario x alliance) x candidate membership,
+            # times candidate x constituency votes
+            membership = sp.csr_matrix(scenario_member.transpose(0, 2, 1).reshape(scenarios * alliances, candidates))
+            alliance_votes = (membership @ pooling).toarray().reshape(scenarios, alliances, constituencies)
+            alliance_votes = alliance_votes.transpose(0, 2, 1)
+            # Candidates outside every alliance stand alone
+            standing = member_slots.any(axis=3)
+        else:
+            alliance_votes = slot_votes[rows, strongest_slot]
+            # Members other than their alliance's candidate stand alone
+            standing = np.zeros(member_slots.shape[:3], dtype=bool)
+            np.put_along_axis(standing, strongest_slot, fielded, axis=2)
+        alliance_votes = np.where(fielded, alliance_votes, -np.inf)
+        alone = np.where(standing, -np.inf, slot_votes)
+        winners = np.concatenate([alone, alliance_votes], axis=2).argmax(axis=2)
+        by_alliance = winners >= slots
+        alliance_won = np.where(by_alliance, winners - slots, -1)
+        parties = np.where(by_alliance,
+                           np.take_along_axis(strongest, np.maximum(alliance_won, 0)[:, :, None], axis=2)[:, :, 0],
+                           slot_party[np.arange(constituencies), np.minimum(winners, slots - 1)])
+        return parties, alliance_won
+
+
+def alliance_what_if(year, scenarios, alliance_rules=None, pool=True, chunk_size=default_chunk_size):
+    """WhatIfResults of alliance scenarios for one election in the results store."""
+    results = load_results(years=[year], columns=["State", "Constituency ID", "Constituency", "Candidate", "Party",
+                                                  "Total Votes"])
+    return AllianceWhatIf(results, year, alliance_rules).evaluate(scenarios, pool=pool, chunk_size=chunk_size)
@@ -4,7 +4,7 @@
 import geopandas as gpd
 import pandas as pd
 import numpy as np
-import os
+from pathlib import Path
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
 from matplotlib.patches import FancyArrow
@@ -12,227 +12,59 @@ import xlrd
 import folium
 from branca.colormap import LinearColormap
 from branca.colormap import StepColormap
+from results_store import load_results
+from alliance_rules import AllianceRules
+from constituency_tables import ResultsMatrix
+from geometry_cache import load_geometry_cache, at_level
+from web_geometry import topojson_layer
 
 # Set loc and define paths used to load and save data
-os.getwd()
-base_path = Path().resolve().parent 
-shapefile_path = base_path / "raw-map-data/parliamentary-constituencies/india_pc_2019.shp"
-election_data_path = base_path / "election-data/election_results.csv"
+base_path = Path().resolve().parent  # Run from election-analysis-scripts
 
-# Load scraped election results data
-results = pd.read_csv(election_data_path)
-results.describe()  # 9445 rows
-
-# Basic cleaning of strings
-cols_to_edit = ['Candidate', 'Constituency', 'Party']
-for i in cols_to_edit:
-    results[i] = results[i].str.strip().str.upper()
-
-# Separate the Constituency column into Constituency name, Reservation status, and State name; extract Constituency code and verify that it matches Constituency number
-pattern = r"(?P<constituency_code>\d+) - (?P<constituency_name>[^(]+)(?:\((?P<reservation_status>ST|SC)\))? \((?P<state>.+)\)"  # regex
-
-# Update the original DataFrame with new columns
-results[['Constituency Code', 'Constituency Name', 'Reservation Status', 'State']] = results['Constituency'].str.extract(pattern)
-for col in ['Constituency Name', 'State']:
-    results[col] = results[col].str.strip()
-
-# verify that constituency code it matches Constituency number (both are from ECI web scraping, but appear on different parts of the webpage)
-results['Constituency Code'] = results['Constituency Code'].astype(int)
-assert (results['Constituency Code'] == results['Constituency Number']).all()  # True, can drop one of the cols
-
-# Res status is hardly populated in ECI website data. Only 5 are labelled. Drop column later.
-results['Constituency Name'][results['Reservation Status'].notna()].value_counts(dropna=False)
-
-# Reshape to get Total votes rows as a column, to verify vote shares. Before doing so, need to convert votes data to numeric
-vars_to_num = ['EVM Votes', 'Postal Votes', 'Total Votes', '% of Votes']
-for col in vars_to_num:
-    results[col] = results[col].replace("-", np.nan)
-    results[col] = results[col].astype(float)
-    print(results[col].dtype)
-
-# Replace NaN with 0 and convert to int
-results[['EVM Votes', 'Postal Votes', 'Total Votes']] = results[['EVM Votes', 'Postal Votes', 'Total Votes']].fillna(0).astype(int)  #
-
-# Verify total
-assert (results["EVM Votes"] + results["Postal Votes"] == results["Total Votes"]).all() # Correct sum
-
-# Now create Total Votes Cast column
-# Step 1: Extract total votes cast for each constituency. Filter rows where 'Candidate Name' is 'Total' and create a mapping of Constituency to Total Votes
-total_votes_mapping = results[results['Candidate'] == 'TOTAL'].set_index('Constituency')['Total Votes']
-
-# Step 2: Map the total votes to the main DataFrame
-results['Total Votes Cast'] = results['Constituency'].map(total_votes_mapping)
-
-# Step 3: Calculate vote share for each candidate
-results['Vote Share (%)'] = (results['Total Votes'] / results['Total Votes Cast']) * 100
-
-# Verify total votes column - yes, correct
-assert (results[results['Candidate'] == 'TOTAL']['Total Votes Cast'] == results[results['Candidate'] == 'TOTAL']['Total Votes']).all(), "Mismatch in total votes"
-
-# After verifying, drop Total rows:
-results = results[results['Candidate'] != 'TOTAL'].reset_index(drop=True)
-
-# Compare official and calculated vote shares
-results['vote_share_rounded'] = round(results['Vote Share (%)'], 2)
-results['vote_share_diff'] = results['vote_share_rounded'] - results['% of Votes']
-results['vote_share_diff'].value_counts(dropna=False)  # All 0. great. One NaN is Surat - no share - uncontested
-
-# remove unnecessary cols
-columns_to_drop = ['EVM Votes', 'Postal Votes', 'Constituency Code', 'Constituency', 
-                   'Reservation Status', 'S.N.', '% of Votes', 'State Code', 
-                   'Constituency Number', 'vote_share_rounded', 'vote_share_diff'] 
-results = results.drop(columns=[col for col in columns_to_drop if col in results.columns])
-results.rename(columns={'Constituency Name' : 'Constituency'}, inplace=True)
+# Load cleaned 2024 results from the results store (written by ingest election results.py, which also applies any
+# counting-day live deltas). Cleaning and checks of the scraped data - splitting the Constituency column, votes to
+# numeric, total votes cast from the TOTAL rows, calculated vs official vote shares - happen there, once.
+results = load_results(years=[2024], columns=["State", "Constituency ID", "Constituency", "Candidate", "Party",
+                                              "Total Votes", "Total Votes Cast", "Vote Share (%)"])
+results.describe()  # 8902 rows, 543 constituencies
 
 
 # Next, load map shapefile data
 # NB. Parliamentary constituency boundaries are unchanged between 2019 and 2024 - except for Assam
 # Still using 2019 boundary map as 2024 map is not publicly available yet
 
-districts = gpd.read_file(shapefile_path)
-
-# Replicate 2019 cleaning of columns
-districts = districts.drop(["ST_CODE", "PC_CODE"], axis=1)
-districts.rename(columns = {'ST_NAME' : "State", 
-                            'PC_NAME' : "Constituency", 
-                            'Res' : "Reserved status"}, inplace=True)
-
-districts = districts.sort_values(by = ["State", "Constituency"], ascending=True, ignore_index=True)
-
-# Correct Jalaun Reserved status (NB different seats might be reserved in 2024 compared to 2019. Need to confirm.)
-districts.loc[districts["Constituency"] == "JALAUN (SC)", "Reserved status"] = "SC"
+# One geometry table for all maps, indexed by Constituency ID, from the preprocessed geometry cache (written by
+# build geometry cache.py; see geometry_cache.py). The shapefile cleaning - dropping codes, Jalaun's reservation
+# status, removing (SC)/(ST) tags - name resolution and geometry validation happen there, once.
+# Spellings are resolved against the canonical constituency table and alias table (election-data/constituencies.csv,
+# election-data/name_aliases.csv) rather than per-script correction dicts; add new spellings to the alias table.
+# The resolver also handles J&K's split (Ladakh is its own UT since the 2019 election) and the Dadra - Daman merger.
+# Results in the store are already resolved.
+# Full detail for analysis and static maps; interactive maps swap in the simplified "web" level
+districts = load_geometry_cache(level="full")
 districts['Reserved status'] = districts['Reserved status'].replace({'GEN' : 'General'})
 
-# For simplicity and merge-friendliness, remove 'SC' and 'ST' tags from constituency names
-districts["Constituency"] = districts["Constituency"].str.replace(r"\(.*", "", regex=True).str.strip()
-
-# A bit of cleaning of string formatting
-for col in ['Constituency', 'State']:
-    districts[col] = districts[col].str.strip().str.upper()
-
-
-# Next, check and clean state and constituency names in the Results and Map datasets so that they merge
-# States
-districts["State"].unique()
-results["State"].unique()
-
-# Create mapping to align mis-matched state names
-results_corrected_state_names = {'ANDAMAN & NICOBAR ISLANDS' : 'ANDAMAN AND NICOBAR ISLANDS', 
-                                 'DADRA & NAGAR HAVELI AND DAMAN & DIU' : 'DADRA AND NAGAR HAVELI AND DAMAN AND DIU',
-                                 'NCT OF DELHI' : 'DELHI'}
-districts_corrected_state_names = {'ANDAMAN & NICOBAR' : 'ANDAMAN AND NICOBAR ISLANDS',
-                                   'ORISSA' : 'ODISHA',
-                                   'DADRA & NAGAR HAVELI' : 'DADRA AND NAGAR HAVELI AND DAMAN AND DIU', 
-                                   'DAMAN & DIU' : 'DADRA AND NAGAR HAVELI AND DAMAN AND DIU', 
-                                   'JAMMU & KASHMIR' : 'JAMMU AND KASHMIR'}
-
-
-
-results["State"] = results["State"].replace(results_corrected_state_names)
-districts["State"] = districts["State"].replace(districts_corrected_state_names)
-
-# J&K has been split since 2019 election. Remove Ladakh from J&K, make it a state.
-districts.loc[((districts['State'] == 'JAMMU AND KASHMIR') & (districts['Constituency'] == 'LADAKH')), 'State'] = 'LADAKH'
-
-# Constituencies
-results["Constituency"].sort_values().unique()
-
-results_corrected_constituency_names = {'ANANTHAPUR' :'ANANTAPUR', 
-                                        'ANDAMAN & NICOBAR ISLANDS' : 'ANDAMAN AND NICOBAR ISLANDS',
-                                        'BAHARAICH' : 'BAHRAICH', 
-                                        'BHANDARA GONDIYA' : 'BHANDARA-GONDIYA',
-                                        'DADAR & NAGAR HAVELI' : 'DADRA AND NAGAR HAVELI', 
-                                        'GADCHIROLI - CHIMUR' : 'GADCHIROLI-CHIMUR',
-                                        'HATKANANGALE' : 'HATKANANGLE', 
-                                        'JOYNAGAR' : 'JAYNAGAR', 
-                                        #'KALIABOR',  # Assam
-                                        'KURNOOLU' : 'KURNOOL', 
-                                        #'MANGALDOI',  # Assam
-                                        'MUMBAI NORTH CENTRAL' : 'MUMBAI NORTH-CENTRAL', 
-                                        'MUMBAI NORTH EAST' : 'MUMBAI NORTH-EAST', 
-                                        'MUMBAI NORTH WEST' : 'MUMBAI NORTH-WEST', 
-                                        'MUMBAI SOUTH CENTRAL' : 'MUMBAI SOUTH-CENTRAL',
-                                        'NARSARAOPET' : 'NARASARAOPET', 
-                                        'NORTH-EAST DELHI' : 'NORTH EAST DELHI', 
-                                        'NORTH-WEST DELHI' : 'NORTH WEST DELHI', 
-                                        #'NOWGONG',  # Assam
-                                        'PALAMAU' : 'PALAMU', 
-                                        'PATLIPUTRA' : 'PATALIPUTRA', 
-                                        'RATNAGIRI- SINDHUDURG' : 'RATNAGIRI-SINDHUDURG',
-                                        'SRERAMPUR' : 'SREERAMPUR', 
-                                        #'TEZPUR',  # Assam
-                                        'THIRUPATHI' : 'TIRUPATI',
-                                        'YAVATMAL- WASHIM' : 'YAVATMAL-WASHIM'}
-
-districts_corrected_constituency_names = {'ANANTNAG' : 'ANANTNAG-RAJOURI',
-                                          'ANDAMAN & NICOBAR' : 'ANDAMAN AND NICOBAR ISLANDS',
-                                          'ARAMBAG' : 'ARAMBAGH',
-                                          #'AUTONOMOUS DISTRICT' : ,  # Assam
-                                          'DADRA & NAGAR HAVELI' : 'DADRA AND NAGAR HAVELI',
-                                          'GAUHATI' : 'GUWAHATI', 
-                                          'HARDWAR' : 'HARIDWAR', 
-                                          'KARAULI -DHOLPUR' : 'KARAULI-DHOLPUR',
-                                          'MUMBAI SOUTH -CENTRAL' : 'MUMBAI SOUTH-CENTRAL',
-                                          'PONDICHERRY' : 'PUDUCHERRY',
-                                          'RATNAGIRI -SINDHUDURG' : 'RATNAGIRI-SINDHUDURG',
-                                          'TONK - SAWAI MADHOPUR' : 'TONK-SAWAI MADHOPUR'}
-
-results["Constituency"] = results["Constituency"].replace(results_corrected_constituency_names)
-districts["Constituency"] = districts["Constituency"].replace(districts_corrected_constituency_names)
-
 # Now, merge results with map and check
-merged_2024 = pd.merge(districts, results, how="left", on=["State", "Constituency"])
+merged_2024 = pd.merge(districts, results, how="left", on=["Constituency ID", "State", "Constituency"])
 merged_2024[merged_2024['Party'].isna()]['Constituency'].sort_values(ascending=True).unique()  # Only Assam, which has changed
 
 
 # Create NDA and I.N.D.I.A. alliance groupings
-# NDA:
-nda_parties_2024 = ['BHARATIYA JANATA PARTY', 'TELUGU DESAM', 
-                    'JANATA DAL (UNITED)', 'SHIV SENA', 
-                    'PATTALI MAKKAL KATCHI', 'LOK JANSHAKTI PARTY(RAM VILAS)', 
-                    'NATIONALIST CONGRESS PARTY', 'BHARATH DHARMA JANA SENA', 
-                    'JANATA DAL (SECULAR)', 'TAMIL MAANILA CONGRESS (MOOPANAR)', 
-                    'AMMA MAKKAL MUNNETTRA KAZAGAM', 'APNA DAL (SONEYLAL)', 
-                    'ASOM GANA PARISHAD', 'JANASENA PARTY', 
-                    "NATIONAL PEOPLE'S PARTY", 'RASHTRIYA LOK DAL', 
-                    'AJSU PARTY', 'HINDUSTANI AWAM MORCHA (SECULAR)', 
-                    'NAGA PEOPLES FRONT', 'NATIONALIST DEMOCRATIC PROGRESSIVE PARTY', 
-                    'SIKKIM KRANTIKARI MORCHA', 'RASHTRIYA LOK MORCHA', 
-                    'RASHTRIYA SAMAJ PAKSHA', 'SUHELDEV BHARATIYA SAMAJ PARTY', 
-                    "UNITED PEOPLE'S PARTY, LIBERAL"]  # Plus independent O. Paneerselvam in TN - Ramanathapuram
-
-
-# check
-india_alliance_parties_2024 = ['INDIAN NATIONAL CONGRESS', 'SAMAJWADI PARTY', 
-                               'ALL INDIA TRINAMOOL CONGRESS', 'DRAVIDA MUNNETRA KAZHAGAM', 
-                               'SHIV SENA (UDDHAV BALASAHEB THACKERAY)', 'NATIONALIST CONGRESS PARTY – SHARADCHANDRA PAWAR', 
-                               'RASHTRIYA JANATA DAL', 'AAM AADMI PARTY', 
-                               'JHARKHAND MUKTI MORCHA', 'COMMUNIST PARTY OF INDIA (MARXIST)', 
-                               'INDIAN UNION MUSLIM LEAGUE', 'JAMMU & KASHMIR NATIONAL CONFERENCE', 
-                               'COMMUNIST PARTY OF INDIA', 'KERALA CONGRESS (M)', 
-                               'VIDUTHALAI CHIRUTHAIGAL KATCHI', 'REVOLUTIONARY SOCIALIST PARTY', 
-                               'MARUMALARCHI DRAVIDA MUNNETRA KAZHAGAM', 'COMMUNIST PARTY OF INDIA (MARXIST–LENINIST) LIBERATION', 
-                               'KERALA CONGRESS', 'PEASANTS AND WORKERS PARTY OF INDIA', 
-                               'ALL INDIA FORWARD BLOC', 'JAMMU AND KASHMIR PEOPLES DEMOCRATIC PARTY', 
-                               'MANITHANEYA MAKKAL KATCHI', 'KONGUNADU MAKKAL DESIA KATCHI', 
-                               'RAIJOR DAL', 'ASSAM JATIYA PARISHAD', 
-                               'ALL PARTY HILL LEADERS CONFERENCE', 'ANCHALIK GANA MORCHA', 
-                               'MAKKAL NEEDHI MAIAM', 'GOA FORWARD PARTY', 
-                               'RASHTRIYA LOKTANTRIK PARTY', 'PURBANCHAL LOK PARISHAD', 
-                               'JATIYA DAL ASSAM', 'SAMAJWADI GANARAJYA PARTY', 
-                               'INDIAN NATIONAL LEAGUE', 'BHARAT ADIVASI PARTY']
+# Membership rules (party lists, parties only allied in some states, backed independents, friendly contests) are in
+# alliance_config.py; every candidate is tagged for every alliance in one pass
+alliance_rules = AllianceRules()
+alliance_codes_2024 = alliance_rules.tag(results, year=2024)
+alliance_rules.unmatched_parties(results, 2024)  # I.N.D.I.A. parties without candidates under their own name
 
+# Wide constituency x party/alliance matrix of vote shares (plus candidate, and member party for alliances). Maps join
+# one column of it to the geometry table when rendering, instead of saving a merged geometry file per party
+matrix_2024 = ResultsMatrix.from_results(results, alliance_rules, alliance_codes_2024)
+matrix_2024.save(base_path / "geo-datasets/results_matrix_2024.parquet")
 
-# Now, map results, starting with the BJP
-# Create BJP subset of results 
-results_2024_bjp = results[results["Party"] == "BHARATIYA JANATA PARTY"].copy()
-merged_2024_bjp = pd.merge(districts, results_2024_bjp, on=["State", "Constituency"], how="left")
-merged_2024_bjp['Party'].value_counts(dropna=False)  # 436 BJP seats. Should be 441, probably Assam
 
-# Save BJP results dataset
-geo_bjp_2024 = gpd.GeoDataFrame(merged_2024_bjp, geometry='geometry')
-geo_bjp_path = base_path / "geo-datasets/geo_bjp_2024.feather"
-geo_bjp_2024.to_feather(geo_bjp_path)
+# Now, map results, starting with the BJP
+geo_bjp_2024 = matrix_2024.view(districts, "BHARATIYA JANATA PARTY")
+geo_bjp_2024['Party'].value_counts(dropna=False)  # 436 BJP seats. Should be 441, probably Assam
 
 # Initial static plot
 # Separate the data based on vote share
@@ -257,6 +89,7 @@ plt.show()
 
 
 # Interactive 2024 map for BJP
+# (All party and alliance layers for 2019 and 2024 are also in one switchable map: build vote share map.py)
 # Define the colours and corresponding thresholds
 colors = ['#FFEB99', '#FFC266', '#FF9933', '#FF6600']  # Light to dark orange
 thresholds = [0, 10, 30, 50, 100]  # Ranges for Vote Share (%)
@@ -273,9 +106,9 @@ colormap = StepColormap(
 # Initialize the map
 m = folium.Map(location=[20.5937, 78.9629], zoom_start=5, tiles=None)
 
-# Add GeoJSON data
-geojson = folium.GeoJson(
-    geo_bjp_2024.to_json(),
+# Add constituency data
+geojson = topojson_layer(
+    at_level(geo_bjp_2024, "web"),  # Simplified boundaries for the web, sent as quantised TopoJSON
     style_function=lambda feature: {
         'fillColor': (
             '#D3D3D3' if feature['properties']['Vote Share (%)'] in [None, ''] 
@@ -318,15 +151,8 @@ m
 
 
 # Congress maps
-# Subset of results
-results_2024_congress = results[results["Party"] == "INDIAN NATIONAL CONGRESS"].copy()
-merged_2024_congress = districts.merge(results_2024_congress, on=["State", "Constituency"], how="left")
-merged_2024_congress['Party'].value_counts(dropna=False)  # 323 INC. Should be 326. Probably Assam
-
-# Save Congress results dataset
-geo_congress_2024 = gpd.GeoDataFrame(merged_2024_congress, geometry='geometry')
-geo_congress_path = base_path / "geo-datasets/geo_congress_2024.feather"
-geo_congress_2024.to_feather(geo_congress_path)
+geo_congress_2024 = matrix_2024.view(districts, "INDIAN NATIONAL CONGRESS")
+geo_congress_2024['Party'].value_counts(dropna=False)  # 323 INC. Should be 326. Probably Assam
 
 # Interactive 2024 Congress map
 
@@ -346,9 +172,9 @@ colormap = StepColormap(
 # Initialize the map
 m = folium.Map(location=[20.5937, 78.9629], zoom_start=5, tiles=None)
 
-# Add GeoJSON data
-geojson = folium.GeoJson(
-    geo_congress_2024.to_json(),
+# Add constituency data
+geojson = topojson_layer(
+    at_level(geo_congress_2024, "web"),  # Simplified boundaries for the web, sent as quantised TopoJSON
     style_function=lambda feature: {
         'fillColor': (
             '#D3D3D3' if feature['properties']['Vote Share (%)'] in [None, ''] 
@@ -391,47 +217,15 @@ m.save(congress_map_path)
 
 
 # NDA map
-# Subset of results
-nda_results_2024 = results.copy()
-nda_results_2024['nda_tag'] = ((nda_results_2024["Party"].isin(nda_parties_2024)) | 
-                              ((nda_results_2024["Constituency"] == "RAMANATHAPURAM") & (nda_results_2024["Candidate"] == "PANNEERSELVAM O S/O OTTAKARATHEVAR")))
-nda_results_2024 = nda_results_2024[nda_results_2024['nda_tag'] == True]
-
-# Check cases where NDA parties appear to be contesting against each other 
-nda_results_2024[nda_results_2024.duplicated(subset=["Constituency", "State"], keep=False)]  # Lots of Rashtriya Samaj Paksha; some National People's Party, some AJSU, one BJP 
-
-# The Rashtriya Samaj Paksha (RSP) contested 18 seats, of which only 1 (in Maharashtra) was part of the NDA
-# In the other 17 seats they must have had friendly contests and got <1% vote share
-# Drop the non-NDA RSP candidates
-nda_results_2024 = nda_results_2024[~((nda_results_2024["Party"] == "RASHTRIYA SAMAJ PAKSHA") & 
-                                      (nda_results_2024["State"] != "MAHARASHTRA"))]
-
-# The AJSU contested 3 seats, of which only 1 (Giridih in Jharkhand) was part of NDA. 
-# In the other 2 seats they must have had friendly contests and got <0.5% vote share
-# Drop the non-NDA AJSU candidates
-nda_results_2024 = nda_results_2024[~((nda_results_2024["Party"] == "AJSU PARTY") & 
-                                      (nda_results_2024["State"] != "JHARKHAND"))]
-
-
-# The National People's Party contested 3 seats, of which 2 (both in Meghalaya) were part of NDA
-# The other seat is in Mumbai so probably a totally different one-seat party
-# Drop NATIONAL PEOPLE'S PARTY from Mumbai North-East
-nda_results_2024 = nda_results_2024[~((nda_results_2024["Party"] == "NATIONAL PEOPLE'S PARTY") & 
-                                      (nda_results_2024["State"] != "MEGHALAYA"))]
-
-# In Sikkim's lone seat, SKM and BJP are both part of NDA and both contested
-# But SKM got ~8x BJP's votes and was the main NDA contestant
-# So I'm going to drop BJP Sikkim from NDA dataset
-nda_results_2024 = nda_results_2024[~((nda_results_2024["Party"] == "BHARATIYA JANATA PARTY") & 
-                                      (nda_results_2024["State"] == "SIKKIM"))]
+# Subset of results: NDA candidates. Friendly contests between NDA parties (RSP, AJSU and NPP outside their states,
+# BJP vs SKM in Sikkim) are resolved by the alliance rules
+nda_results_2024 = results[alliance_rules.is_member(alliance_codes_2024, "NDA")]
 
-# Merge results with map
-geo_nda_2024 = pd.merge(districts, nda_results_2024, on=["State", "Constituency"], how="left")
+# Check that no NDA parties are contesting against each other
+nda_results_2024[nda_results_2024.duplicated(subset=["Constituency ID"], keep=False)]  # None
 
-# Save NDA results + map dataset
-geo_nda_2024 = gpd.GeoDataFrame(geo_nda_2024, geometry='geometry')
-geo_nda_path = base_path / "geo-datasets/geo_nda_2024.feather"
-geo_nda_2024.to_feather(geo_nda_path)
+# NDA view of the results matrix, on the map geometry
+geo_nda_2024 = matrix_2024.view(districts, "NDA")
 
 
 # Basic static map, NDA
@@ -470,9 +264,9 @@ colormap = StepColormap(
 # Initialize the map
 m = folium.Map(location=[20.5937, 78.9629], zoom_start=5, tiles=None)
 
-# Add GeoJSON data
-geojson = folium.GeoJson(
-    geo_nda_2024.to_json(),
+# Add constituency data
+geojson = topojson_layer(
+    at_level(geo_nda_2024, "web"),  # Simplified boundaries for the web, sent as quantised TopoJSON
     style_function=lambda feature: {
         'fillColor': (
             '#D3D3D3' if feature['properties']['Vote Share (%)'] in [None, ''] 
@@ -514,3 +308,5 @@ m.save(nda_map_path)
 #m
 
 # INDIA alliance map
+# Subset of results: I.N.D.I.A. candidates; in friendly contests (e.g. INC vs Left in Kerala) the strongest partner
+india_results_2024 = results[alliance_rules.is_member(alliance_codes_2024, "INDIA")]
@@ -0,0 +1,112 @@
+# Benchmark the direct lxml page parser (eci_page_parser.py) against the old read_html path
+# Old path: find the results div, serialise it back to HTML, pd.read_html it, build one DataFrame per page, pd.concat
+# New path: parse rows and title from the raw HTML in one pass into a columnar buffer, build one DataFrame at the end
+# Uses the raw page archive if the scraper has filled it, otherwise pages rendered from election_results.csv
+
+# Load packages
+import io
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import lxml.html
+import pandas as pd
+
+from eci_page_parser import ResultsBuffer, header_xpath, parse_constituency_page, table_xpath
+from eci_simulator import load_pages as load_simulated_pages
+from eci_simulator import render_page
+from page_cache import PageCache
+
+# Set loc and define paths used to load data
+base_path = Path().resolve().parent
+election_data_path = base_path / "election-data"
+repeats = 5  # Timed runs per parser; the best run is reported
+
+
+def load_pages():
+    # Returns a list of (html, state_code, constituency_number)
+    valid_urls_df = pd.read_csv(election_data_path / "valid_urls.csv")
+    cache_dir = election_data_path / "raw-pages"
+    if cache_dir.exists():
+        cache = PageCache(cache_dir)
+        pages = [(cache.get(url), state_code, number) for url, state_code, number in
+                 valid_urls_df[['url', 'state_code', 'constituency_number']].itertuples(index=False, name=None)
+                 if url in cache]
+        if pages:
+            print(f"Benchmarking {len(pages)} archived pages")
+            return pages
+
+    simulated = load_simulated_pages(election_data_path / "election_results.csv", election_data_path / "valid_urls.csv")
+    pages = [(render_page(*simulated[urlsplit(url).path]), state_code, number) for url, state_code, number in
+             valid_urls_df[['url', 'state_code', 'constituency_number']].itertuples(index=False, name=None)]
+    print(f"Benchmarking {len(pages)} pages rendered from election_results.csv")
+    return pages
+
+
+def parse_results_page(html):
+    """Old parser: extract the results table and constituency name from a raw ECI page via pd.read_html.
+
+    Returns (table_df, constituency_name), or None if the page doesn't contain the table (e.g. it needs JS).
+    This was the Selenium scraper's parsing path, kept here as the benchmark baseline.
+    """
+    tree = lxml.html.fromstring(html)
+    table_elements = tree.xpath(table_xpath)
+    header_elements = tree.xpath(header_xpath)
+    if not table_elements or not header_elements:
+        return None
+    table_html = lxml.html.tostring(table_elements[0], encoding="unicode")
+    try:
+        table_df = pd.read_html(io.StringIO(table_html))[0]
+    except ValueError:  # No <table> inside the results div
+        return None
+    constituency_name = header_elements[0].text_content().strip()
+    return table_df, constituency_name
+
+
+def build_results_frame(table_df, constituency_name, state_code, constituency_number):
+    # Add the same context columns as the Selenium scraper
+    table_df['Constituency'] = constituency_name
+    table_df['State Code'] = state_code
+    table_df['Constituency Number'] = constituency_number
+    return table_df
+
+
+def read_html_path(pages):
+    frames = []
+    for page, state_code, number in pages:
+        table_df, constituency_name = parse_results_page(page)
+        frames.append(build_results_frame(table_df, constituency_name, state_code, number))
+    return pd.concat(frames, ignore_index=True)
+
+
+def lxml_path(pages):
+    buffer = ResultsBuffer()
+    for page, state_code, number in pages:
+        buffer.append(parse_constituency_page(page), state_code, number)
+    return buffer.to_frame()
+
+
+def best_time(function, pages):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        frame = function(pages)
+        timings.append(time.perf_counter() - started)
+    return min(timings), frame
+
+
+pages = load_pages()
+old_time, old_frame = best_time(read_html_path, pages)
+new_time, new_frame = best_time(lxml_path, pages)
+
+print(f"read_html path: {old_time:.3f}s ({old_time / len(pages) * 1000:.2f} ms/page)")
+print(f"lxml path:      {new_time:.3f}s ({new_time / len(pages) * 1000:.2f} ms/page)")
+print(f"Speed-up: {old_time / new_time:.1f}x")
+
+# Check both paths agree once "-" is treated as missing
+for col in ['EVM Votes', 'Postal Votes', 'Total Votes', '% of Votes']:
+    old_values = pd.to_numeric(old_frame[col].replace("-", None), errors='coerce')
+    assert old_values.equals(new_frame[col].astype(float)), f"Mismatch in {col}"
+assert (old_frame['Candidate'] == new_frame['Candidate']).all()
+assert (old_frame['Constituency'] == new_frame['Constituency']).all()
+print("Both parsers produce the same results")
@@ -0,0 +1,62 @@
+# Benchmark geometry encodings for the interactive (folium) maps (see web_geometry.py)
+# Old path: folium.GeoJson(frame.to_json()), full-precision coordinates, every shared border stored twice
+# New paths: fixed-precision GeoJSON, and quantised TopoJSON with shared arcs, at a few precisions each
+# Reports the geometry payload size, the size of a rendered map page, and the time to parse the payload (plus, for
+# TopoJSON, to decode it back to features, as topojson-client does in the browser), to pick a precision per map.
+# The decode here is Python (web_geometry.topology_to_geojson), so it overstates the browser's decode time.
+# Uses the geometry cache (build geometry cache.py) and the 2024 BJP vote shares, as in the BJP 2024 map
+
+# Load packages
+import json
+import time
+
+import folium
+import pandas as pd
+
+from constituency_tables import ResultsMatrix
+from geometry_cache import load_geometry_cache
+from results_store import load_results
+import web_geometry
+
+repeats = 5  # Timed runs per encoding; the best run is reported
+
+results = load_results(years=[2024], columns=["Constituency ID", "Candidate", "Party", "Vote Share (%)"])
+matrix_2024 = ResultsMatrix.from_results(results)
+
+
+def payloads(frame):
+    # (encoding, payload as a JSON string, folium layer)
+    yield "GeoJSON, full precision", frame.to_json(), folium.GeoJson(frame.to_json())
+    for precision in [5, 4, 3]:
+        geojson = web_geometry.to_geojson(frame, precision)
+        yield f"GeoJSON, {precision} decimal places", json.dumps(geojson), folium.GeoJson(geojson)
+    for quantization in [1e6, 1e5, 1e4]:
+        topology = web_geometry.to_topojson(frame, quantization)
+        yield (f"TopoJSON, {quantization:.0e} steps", json.dumps(topology),
+               folium.TopoJson(topology, "objects.constituencies"))
+
+
+def best_time(function):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+rows = []
+for level in ["full", "web"]:
+    frame = matrix_2024.view(load_geometry_cache(level=level), "BHARATIYA JANATA PARTY")
+    for encoding, payload, layer in payloads(frame):
+        m = folium.Map(location=[20.5937, 78.9629], zoom_start=5, tiles=None)
+        layer.add_to(m)
+        parse = best_time(lambda: json.loads(payload))
+        if encoding.startswith("TopoJSON"):
+            parse += best_time(lambda: web_geometry.topology_to_geojson(json.loads(payload)))
+        rows.append({"Level": level, "Encoding": encoding, "Payload (MB)": len(payload.encode()) / 1e6,
+                     "Page (MB)": len(m.get_root().render().encode()) / 1e6, "Parse (ms)": parse * 1000})
+
+report = pd.DataFrame(rows)
+report["vs old"] = report["Page (MB)"] / report["Page (MB)"].iloc[0]
+print(report.round(2).to_string(index=False))
@@ -0,0 +1,73 @@
+# Throughput/latency benchmark for the scraping pipeline, run against the local ECI simulator (eci_simulator.py)
+# Lets us measure concurrency, rate limit and retry settings instead of guessing them, without touching the real site.
+# For each setting: full scrape wall time, pages/s, share of pages scraped, and the simulator's response counts.
+# Also times URL discovery and a live-polling round against a simulated count in progress.
+# NB. The simulator runs in this process, so client and server share the GIL; absolute numbers are pessimistic.
+
+# Load packages
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import eci_scraper
+from eci_simulator import SimulatedECI, load_pages
+from live_poll import LivePoller
+from page_cache import PageCache
+
+# Set loc and define paths used to load data
+base_path = Path().resolve().parent
+election_data_path = base_path / "election-data"
+
+# Simulated site behaviour
+latency = 0.1  # Mean seconds per response
+error_rate = 0.02  # Share of 500 responses
+throttle_rps = 100  # Requests per second above which the simulator answers 429
+
+# Scraper settings to compare: (concurrency, requests per second, retries)
+settings = [(1, 1000, 4), (8, 1000, 4), (16, 1000, 4), (32, 1000, 4), (64, 1000, 4), (32, 90, 4), (32, 1000, 0)]
+
+pages = load_pages(election_data_path / "election_results.csv", election_data_path / "valid_urls.csv")
+valid_urls_df = pd.read_csv(election_data_path / "valid_urls.csv")
+expected_rows = sum(len(table) for _, table in pages.values())
+
+# Full scrapes
+benchmark = []
+for concurrency, rate, retries in settings:
+    with SimulatedECI(pages, latency=latency, error_rate=error_rate, throttle_rps=throttle_rps) as simulator:
+        urls_df = simulator.local_urls(valid_urls_df)
+        started = time.perf_counter()
+        results = eci_scraper.scrape_results(urls_df, concurrency=concurrency, rate=rate, retries=retries,
+                                             backoff=0.1, selenium_fallback=False)
+        elapsed = time.perf_counter() - started
+        benchmark.append({"concurrency": concurrency, "rate limit (req/s)": rate, "retries": retries,
+                          "seconds": round(elapsed, 2), "pages/s": round(len(urls_df) / elapsed, 1),
+                          "rows scraped (%)": round(len(results) / expected_rows * 100, 1),
+                          **simulator.stats})
+
+print(pd.DataFrame(benchmark).to_string(index=False))
+
+# URL discovery, cold and seeded from the cached valid_urls.csv
+for cached in [None, valid_urls_df]:
+    with SimulatedECI(pages, latency=latency) as simulator:
+        base = simulator.base_url + "/PcResultGenJune2024/Constituencywise"
+        started = time.perf_counter()
+        discovered = eci_scraper.discover_urls(cached_urls_df=cached, rate=1000, concurrency=48,
+                                               state_base=base + "S", ut_base=base + "U")
+        elapsed = time.perf_counter() - started
+        label = "seeded" if cached is not None else "cold"
+        print(f"Discovery ({label}): {len(discovered)} URLs, {simulator.stats['requests']} requests, {elapsed:.2f}s")
+
+# Live polling while a simulated count is in progress: how many pages change per round, and what a round costs
+with SimulatedECI(pages, latency=latency, count_duration=60) as simulator, tempfile.TemporaryDirectory() as tmp:
+    poller = LivePoller(simulator.local_urls(valid_urls_df), PageCache(Path(tmp) / "pages"),
+                        Path(tmp) / "deltas.csv", concurrency=32, rate=1000)
+    for round_number in range(3):
+        started = time.perf_counter()
+        deltas = poller.poll_once()
+        elapsed = time.perf_counter() - started
+        print(f"Poll round {round_number + 1}: {deltas['Constituency'].nunique()} pages changed, "
+              f"{len(deltas)} candidate updates, {elapsed:.2f}s")
+        time.sleep(5)
+    print(f"Simulator responses: {simulator.stats}")
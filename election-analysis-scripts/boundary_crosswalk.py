@@ -0,0 +1,161 @@
+# Crosswalk between two sets of constituency boundaries, for comparing elections across a redrawing
+# Assam's constituencies were redrawn for 2024 (delimitation), so its 2019 results don't line up with its 2024 seats:
+# KALIABOR, MANGALDOI, NOWGONG, TEZPUR and others dropped out of the comparisons and swing maps. A Crosswalk is a
+# sparse transfer matrix, new x old constituencies: the share of each old constituency's votes that fall in each new
+# one. It is built by overlaying the two boundary layers, with an STRtree spatial index so only constituencies whose
+# bounding boxes overlap are intersected (no all-pairs comparison, even for a national redrawing of all 543 seats).
+# Shares are by area of overlap, or, given population units (e.g. census villages or towns as points or polygons), by
+# the population living in each overlap. Prior-election votes are then reallocated onto the new boundaries as "notional
+# results" with one sparse matrix product for all parties and alliances, and compared with the new results as usual:
+#   crosswalk = Crosswalk.from_boundaries(assam_2019, assam_2024)
+#   comparison = compare_elections(2019, 2024, crosswalk=crosswalk)  # election_comparison.py
+# Both layers are indexed by Constituency ID (new seats have IDs in election-data/constituencies.csv); constituencies
+# outside the crosswalk are passed through unchanged.
+
+# Load packages
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+import shapely
+
+from constituency_lookup import containing
+from constituency_tables import ResultsMatrix
+from geometry_cache import projected_crs
+
+notional_candidate = "(NOTIONAL)"  # Candidate name in notional results: votes reallocated from old constituencies
+min_overlap = 1e-3  # Overlaps smaller than this share of an old constituency are digitising slivers, not transfers
+
+
+def overlaps(old, new):
+    """Positions (old, new) of every pair of intersecting geometries, from one STRtree query."""
+    tree = shapely.STRtree(new)
+    old_positions, new_positions = tree.query(old, predicate="intersects")
+    return old_positions, new_positions
+
+
+class Crosswalk:
+    """Sparse transfer matrix from old to new constituencies: matrix[new, old] is the share of old's votes in new.
+
+    Every column (old constituency) sums to 1.
+    """
+
+    def __init__(self, matrix, old_ids, new_ids):
+        self.matrix = sp.csr_matrix(matrix)
+        self.old_ids = pd.Index(old_ids, name="Constituency ID")
+        self.new_ids = pd.Index(new_ids, name="Constituency ID")
+
+    @classmethod
+    def from_boundaries(cls, old, new, population=None, population_column="Population", crs=projected_crs,
+                        min_overlap=min_overlap):
+        """Crosswalk between two boundary layers (GeoDataFrames or GeoSeries indexed by Constituency ID).
+
+        By default votes are shared out by area. With `population` (a GeoDataFrame of population units with a
+        population_column), each unit counts towards the old and new constituencies containing its representative
+        point; old constituencies without any population units fall back to area shares.
+        """
+        old_geometry = old.geometry.to_crs(crs).to_numpy()
+        new_geometry = new.geometry.to_crs(crs).to_numpy()
+
+        # Area of every overlap, as a share of the old constituency
+        old_positions, new_positions = overlaps(old_geometry, new_geometry)
+        areas = shapely.area(shapely.intersection(old_geometry[old_positions], new_geometry[new_positions]))
+        keep = areas >= min_overlap * shapely.area(old_geometry)[old_positions]
+        weights = sp.csc_matrix((areas[keep], (new_positions[keep], old_positions[keep])),
+                                shape=(len(new_geometry), len(old_geometry)))
+
+        if population is not None:
+            x, y = shapely.get_coordinates(shapely.point_on_surface(population.geometry.to_crs(crs).to_numpy())).T
+            shapely.prepare(old_geometry)
+            shapely.prepare(new_geometry)
+            old_owners, new_owners = containing(x, y, old_geometry), containing(x, y, new_geometry)
+            counted = (old_owners >= 0) & (new_owners >= 0)
+            people = sp.csc_matrix((population[population_column].to_numpy(dtype=float)[counted],
+                                    (new_owners[counted], old_owners[counted])), shape=weights.shape)
+            # Population shares where an old constituency has population units, area shares elsewhere
+            populated = np.asarray(people.sum(axis=0)).ravel() > 0
+            weights = people @ sp.diags(populated.astype(float)) + weights @ sp.diags((~populated).astype(float))
+
+        totals = np.asarray(weights.sum(axis=0)).ravel()
+        if (totals == 0).any():
+            uncovered = old.index[totals == 0].tolist()
+            raise ValueError(f"Old constituencies not covered by the new boundaries: {uncovered}")
+        return cls(weights @ sp.diags(1 / totals), old.index, new.index)
+
+    def table(self):
+        """Long table of transfers: old and new Constituency ID and the share of the old constituency's votes."""
+        transfers = self.matrix.tocoo()
+        return pd.DataFrame({"Old Constituency ID": self.old_ids[transfers.col],
+                             "New Constituency ID": self.new_ids[transfers.row],
+                             "Share": transfers.data}).sort_values(["Old Constituency ID", "New Constituency ID"],
+                                                                   ignore_index=True)
+
+    def reallocate(self, values):
+        """Counts (e.g. votes; constituency x anything, indexed by Constituency ID) moved onto the new boundaries.
+
+        Rows of old constituencies are replaced by rows of new ones, each a weighted sum of the old rows, computed for
+        all columns in one sparse matrix product; other rows are unchanged.
+        """
+        old = values.reindex(self.old_ids).fillna(0)
+        moved = pd.DataFrame(self.matrix @ old.to_numpy(dtype=float), index=self.new_ids, columns=values.columns)
+        return pd.concat([values[~values.index.isin(self.old_ids)], moved]).sort_index()
+
+    def notional_matrix(self, matrix, votes_cast):
+        """Notional results on the new boundaries, from a ResultsMatrix and total votes cast per constituency.
+
+        Every party and alliance's votes are reallocated and divided by the reallocated votes cast. A party/alliance
+        stands in a new constituency if it stood in any old constituency transferring votes to it; its candidate is
+        notional_candidate. An alliance fields one notional candidate, as in real results: its member party with the
+        most of the alliance's reallocated votes takes all of them, and the other members that stood for it in the
+        old constituencies don't stand. So the alliance's notional share is its member party's, and wins with it.
+        """
+        table = matrix.table
+        shares, candidates = table["Vote Share (%)"], table["Candidate"]
+        redrawn = table.index.isin(self.old_ids)
+        old = table.index[redrawn]
+        cast = votes_cast.reindex(old).to_numpy(dtype=float)
+        votes = pd.DataFrame(np.nan_to_num(shares[redrawn].to_numpy(dtype=float)) * cast[:, None] / 100,
+                             index=old, columns=shares.columns)
+        stood = pd.DataFrame(candidates[redrawn].notna().to_numpy(dtype=float), index=old, columns=shares.columns)
+
+        # Old constituencies are all in the crosswalk, so these are just the new rows
+        new_votes = self.reallocate(votes).loc[self.new_ids]
+        new_stood = self.reallocate(stood).loc[self.new_ids].to_numpy() > 0
+        new_cast = self.reallocate(pd.DataFrame({"votes": cast}, index=old))["votes"].loc[self.new_ids].to_numpy()
+        blocks = {"Vote Share (%)": pd.DataFrame(np.where(new_stood, new_votes.to_numpy() / new_cast[:, None] * 100,
+                                                          np.nan), index=self.new_ids, columns=shares.columns),
+                  "Candidate": pd.DataFrame(np.where(new_stood, notional_candidate, None), index=self.new_ids,
+                                            columns=shares.columns)}
+        if "Party" in table:
+            blocks["Party"] = self.alliance_members(table["Party"][redrawn], votes, blocks)
+        notional = pd.concat(blocks, axis=1, names=["field", "view"])
+        return ResultsMatrix(pd.concat([table[~redrawn], notional]).sort_index())
+
+    def alliance_members(self, members, votes, blocks):
+        """Each alliance's leading member party in every new constituency, given the member party that stood for it
+        in each old constituency; moves the alliance's notional share and candidate onto that party in `blocks`."""
+        shares, candidates = blocks["Vote Share (%)"], blocks["Candidate"]
+        leading, standing_members = {}, []
+        for alliance in members.columns:
+            # Alliance votes by member party, reallocated: new constituency x member party
+            codes, parties = pd.factorize(members[alliance])
+            stood = np.flatnonzero(codes >= 0)
+            member_votes = np.zeros((len(members), len(parties)))
+            member_votes[stood, codes[stood]] = votes[alliance].to_numpy()[stood]
+            moved = self.reallocate(pd.DataFrame(member_votes, index=members.index, columns=parties)).loc[self.new_ids]
+            fielded = moved.to_numpy().sum(axis=1) > 0
+            top = moved.to_numpy().argmax(axis=1) if len(parties) else np.zeros(len(moved), dtype=int)
+            leading[alliance] = pd.Series(np.where(fielded, np.append(parties, None)[top], None), index=self.new_ids)
+            standing_members.append(moved > 0)
+
+        # Members only stand through their alliance's candidate: clear them all, then add the leading parties
+        for standing in standing_members:
+            standing = standing.reindex(columns=shares.columns, fill_value=False).to_numpy()
+            shares[:] = np.where(standing, np.nan, shares.to_numpy())
+            candidates[:] = np.where(standing, None, candidates.to_numpy())
+        for alliance, parties in leading.items():
+            for new_id, party in parties.dropna().items():
+                # A party leading several alliances keeps the largest alliance share
+                share = shares.at[new_id, alliance]
+                if not shares.at[new_id, party] >= share:
+                    shares.at[new_id, party], candidates.at[new_id, party] = share, notional_candidate
+        return pd.DataFrame(leading, index=self.new_ids, columns=members.columns, dtype=object)
@@ -0,0 +1,25 @@
+# In this file: build the preprocessed constituency geometry cache once (see geometry_cache.py)
+# Reads the shapefile, cleans and resolves names, validates geometries, and stores several levels of detail plus
+# projected centroids, label points and bounding boxes in geo-datasets/constituency_geometry.parquet, and the state
+# and national outlines dissolved from them (with slivers and gaps removed) in geo-datasets/state_outlines.parquet.
+# Analysis scripts and the comparison notebook then load the level of detail they need from the cache instead of
+# re-reading and re-cleaning the shapefile. Re-run after changing the shapefile or election-data/name_aliases.csv
+
+# Load packages
+from pathlib import Path
+from name_resolution import NameIndex
+import geometry_cache
+
+# Set loc and define paths used to load data
+base_path = Path().resolve().parent
+shapefile_path = base_path / "raw-map-data/parliamentary-constituencies/india_pc_2019.shp"
+
+cache = geometry_cache.build_geometry_cache(shapefile_path, name_index=NameIndex.load())
+
+# Check what's in the cache: 543 constituencies, all valid at every level of detail, fewer vertices per level
+{level: (cache[f"geometry_{level}"].is_valid.all(), cache[f"geometry_{level}"].count_coordinates().sum())
+ for level in geometry_cache.levels}
+
+# State outlines: 36 states/UTs. Only enclaves (e.g. Yanam in Andhra Pradesh, Mahe in Kerala) are left as holes
+state_outlines = geometry_cache.load_state_outlines()
+state_outlines.geometry.explode().interiors.str.len().groupby(level=0).sum().loc[lambda holes: holes > 0]
@@ -0,0 +1,41 @@
+# In this file: one interactive vote share map with every party and alliance, 2019 and 2024, as switchable layers
+# (see layered_map.py). The geometry is embedded once and layers are switched in the browser, so this one file covers
+# the per-party maps of india 2019 election results.py and analyse india 2024 results.py
+# Uses the geometry cache (build geometry cache.py) and the results matrices saved by those two scripts
+
+# Load packages
+from pathlib import Path
+from constituency_tables import ResultsMatrix
+from geometry_cache import load_geometry_cache
+from layered_map import layered_map, vote_share_layer, orange, blue
+
+# Set loc and define paths used to load and save data
+base_path = Path().resolve().parent
+
+# Simplified boundaries for the web; State and Constituency in title case for the tooltips
+districts = load_geometry_cache(level="web", columns=["State", "Constituency"])
+districts = districts.assign(State=districts["State"].str.title(), Constituency=districts["Constituency"].str.title())
+
+# Only the views on the map are read from the results matrices
+matrix_2024 = ResultsMatrix.load(base_path / "geo-datasets/results_matrix_2024.parquet",
+                                 views=["BHARATIYA JANATA PARTY", "INDIAN NATIONAL CONGRESS", "NDA", "INDIA"])
+matrix_2019 = ResultsMatrix.load(base_path / "geo-datasets/results_matrix_2019.parquet",
+                                 views=["BJP", "INC", "NDA", "UPA"])
+
+# Layers, in drop-down order: same colours and thresholds ([0, 10, 30, 50, 100]) as the single-layer maps
+layers = {
+    "BJP 2024": vote_share_layer(matrix_2024, "BHARATIYA JANATA PARTY", orange, "BJP Vote Share in 2024"),
+    "Congress 2024": vote_share_layer(matrix_2024, "INDIAN NATIONAL CONGRESS", blue, "Congress Vote Share in 2024"),
+    "NDA 2024": vote_share_layer(matrix_2024, "NDA", orange, "NDA Vote Share in 2024"),
+    "I.N.D.I.A. 2024": vote_share_layer(matrix_2024, "INDIA", blue, "I.N.D.I.A. Vote Share in 2024"),
+    "BJP 2019": vote_share_layer(matrix_2019, "BJP", orange, "BJP Vote Share in 2019"),
+    "Congress 2019": vote_share_layer(matrix_2019, "INC", blue, "Congress Vote Share in 2019"),
+    "NDA 2019": vote_share_layer(matrix_2019, "NDA", orange, "NDA Vote Share in 2019"),
+    "UPA 2019": vote_share_layer(matrix_2019, "UPA", blue, "UPA Vote Share in 2019"),
+}
+
+# Build and save the map
+m = layered_map(districts, layers)
+vote_share_map_path = base_path / "interactive-map-outputs/vote_share_map.html"
+m.save(vote_share_map_path)
+m
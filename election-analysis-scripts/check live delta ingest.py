@@ -0,0 +1,70 @@
+# Check the counting-day ingest path: apply a non-empty live delta log to the scraped 2024 results and clean them
+# The deltas come from diff_results on a re-scraped page in which one candidate gained votes, as the live poller logs
+# them: only the changed candidate's row, not the page's Total row. apply_deltas has to recalculate the totals and
+# ECI-style '% of Votes', or clean_results_2024's check against ECI shares fails. It also updates one of two namesakes
+# standing in the same constituency, which only the candidates' serial numbers tell apart. Nothing is written to the
+# store.
+
+# Load packages
+from pathlib import Path
+
+import pandas as pd
+
+import results_store
+from live_poll import apply_deltas, diff_results, numeric_votes
+from name_resolution import NameIndex
+
+# Set loc and define paths used to load data
+base_path = Path().resolve().parent  # Run from election-analysis-scripts
+results_2024_path = base_path / "election-data/election_results.csv"
+added_votes = 25000
+
+name_index = NameIndex.load()
+results_2024 = pd.read_csv(results_2024_path)
+page_key = ['State Code', 'Constituency Number', 'Constituency']
+
+# Re-scrape of one page: its runner-up gains votes (EVM and total) and nothing else changes
+page = results_2024[results_2024[page_key].eq(results_2024.loc[0, page_key]).all(axis=1)]
+rescraped = numeric_votes(page)
+runner_up = rescraped.index[1]
+rescraped.loc[runner_up, ['EVM Votes', 'Total Votes']] += added_votes
+deltas = diff_results(page, rescraped, timestamp="2024-06-04T12:00:00+00:00")
+deltas = deltas[deltas['Vote Change'] != 0]
+assert len(deltas) == 1, "Expected one delta row, for the runner-up"
+
+# The ingest step, as in ingest election results.py with apply_live_deltas = True
+baseline = results_store.clean_results_2024(results_2024, name_index)
+updated = results_store.clean_results_2024(apply_deltas(results_2024, deltas), name_index)
+
+# Only the updated constituency changes: its runner-up's votes and its votes cast
+constituency_id = updated.loc[updated['Candidate'] == page.loc[runner_up, 'Candidate'].strip().upper(),
+                              'Constituency ID'].iloc[0]
+changed = updated['Constituency ID'] == constituency_id
+assert (updated.loc[changed, 'Total Votes Cast'] == baseline.loc[changed, 'Total Votes Cast'] + added_votes).all()
+assert (updated['Total Votes'] - baseline['Total Votes']).sum() == added_votes
+assert updated.loc[~changed].equals(baseline.loc[~changed]), "Constituencies without deltas changed"
+shares = updated.loc[changed].sort_values('Vote Share (%)', ascending=False)
+print(shares[['Constituency', 'Candidate', 'Total Votes', 'Total Votes Cast', 'Vote Share (%)']].head(3))
+
+# Namesakes in one constituency (e.g. two independents called S.SATHISH KUMAR in Tamil Nadu PC 4): only the one
+# whose votes changed gets a delta, and only that one is updated
+namesakes = results_2024[results_2024.duplicated(page_key + ['Candidate', 'Party'], keep=False)]
+updated_namesake, other_namesake = namesakes.index[:2]
+same_name = page_key + ['Candidate']
+assert namesakes.loc[other_namesake, same_name].equals(namesakes.loc[updated_namesake, same_name])
+page = results_2024[results_2024[page_key].eq(results_2024.loc[updated_namesake, page_key]).all(axis=1)]
+rescraped = numeric_votes(page)
+rescraped.loc[updated_namesake, ['EVM Votes', 'Total Votes']] += 100
+deltas = diff_results(page, rescraped, timestamp="2024-06-04T12:00:00+00:00")
+deltas = deltas[deltas['Vote Change'] != 0]
+assert deltas['Vote Change'].tolist() == [100], f"Expected one +100 delta, got {deltas['Vote Change'].tolist()}"
+previous_votes = numeric_votes(results_2024)['Total Votes']
+namesake_votes = apply_deltas(results_2024, deltas)['Total Votes']
+assert namesake_votes[updated_namesake] == previous_votes[updated_namesake] + 100
+assert namesake_votes[other_namesake] == previous_votes[other_namesake]
+print(f"Namesake {page.loc[updated_namesake, 'Candidate']}: {previous_votes[updated_namesake]} -> "
+      f"{namesake_votes[updated_namesake]} votes, the other unchanged at {namesake_votes[other_namesake]}")
+
+# An empty delta log leaves the results as scraped
+assert results_store.clean_results_2024(apply_deltas(results_2024, deltas.iloc[:0]), name_index).equals(baseline)
+print("Live delta ingest OK")
@@ -0,0 +1,95 @@
+# Batch point-in-constituency lookup: which parliamentary constituency is each point in?
+# For geocoded points - rally locations, polling stations, survey respondents - given as arrays of latitude and
+# longitude. The constituency boundaries (india_pc_2019, from the geometry cache) go into an STRtree once and are
+# prepared, so a lookup is two vectorised steps over all points: one tree query for the constituencies whose bounding
+# boxes contain each point, then one point-in-polygon test of those candidates against the prepared geometries.
+# lookup() joins any per-constituency attributes (e.g. names from the geometry cache, a results matrix or an election
+# comparison's contests) by Constituency ID; lookup_ids_parallel() splits very large batches across processes.
+
+# Load packages
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from geometry_cache import load_geometry_cache
+
+missing_id = -1  # Constituency ID of points outside every constituency
+default_chunk_size = 250000
+
+# Per-process lookup, set once by init_worker
+_worker = {}
+
+
+def containing(x, y, polygons, tree=None):
+    """Position of the polygon containing each point (x, y arrays), missing_id if none; the first, on a shared border.
+
+    polygons should be prepared (shapely.prepare) for fast repeated tests.
+    """
+    tree = tree or shapely.STRtree(polygons)
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    # Candidates: polygons whose bounding box contains the point
+    point_positions, polygon_positions = tree.query(shapely.points(x, y))
+    inside = shapely.contains_xy(polygons[polygon_positions], x[point_positions], y[point_positions])
+    point_positions, polygon_positions = point_positions[inside], polygon_positions[inside]
+    owners = np.full(len(x), missing_id)
+    owners[point_positions[::-1]] = polygon_positions[::-1]  # Reversed, so the first match wins
+    return owners
+
+
+class ConstituencyLookup:
+    """Constituency of each of a batch of points, from constituency boundaries in longitude/latitude."""
+
+    def __init__(self, geometries):
+        # geometries: GeoSeries (or GeoDataFrame) of constituency boundaries indexed by Constituency ID, in EPSG:4326
+        self.ids = geometries.index.to_numpy()
+        self.polygons = geometries.geometry.to_crs("EPSG:4326").to_numpy()
+        shapely.prepare(self.polygons)
+        self.tree = shapely.STRtree(self.polygons)
+
+    @classmethod
+    def from_cache(cls, level="full"):
+        """Lookup on the geometry cache's boundaries (geometry_cache.py); "full" is the source shapefile's detail."""
+        return cls(load_geometry_cache(level, columns=[]).geometry)
+
+    def constituency_ids(self, lat, lon):
+        """Constituency ID of each point (missing_id outside every constituency)."""
+        owners = containing(lon, lat, self.polygons, self.tree)
+        return np.where(owners >= 0, self.ids[owners], missing_id)
+
+    def lookup(self, lat, lon, attributes=None):
+        """Points with their Constituency ID, plus attributes (a frame indexed by Constituency ID) joined by it."""
+        ids = self.constituency_ids(lat, lon)
+        points = pd.DataFrame({"lat": lat, "lon": lon, "Constituency ID": ids})
+        if attributes is None:
+            return points
+        joined = attributes.reindex(ids)
+        joined.index = points.index
+        return pd.concat([points, joined], axis=1)
+
+
+def init_worker(level="full"):
+    _worker["lookup"] = ConstituencyLookup.from_cache(level)
+
+
+def worker_ids(chunk):
+    lat, lon = chunk
+    return _worker["lookup"].constituency_ids(lat, lon)
+
+
+def lookup_ids_parallel(lat, lon, workers=None, chunk_size=default_chunk_size, level="full"):
+    """ConstituencyLookup.constituency_ids for a very large batch, in chunks across worker processes.
+
+    Each worker builds its own lookup once (one per CPU by default); results are in input order.
+    """
+    lat, lon = np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+    chunks = [(lat[start:start + chunk_size], lon[start:start + chunk_size])
+              for start in range(0, len(lat), chunk_size)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks)) or 1
+    if workers == 1:
+        init_worker(level)
+        return np.concatenate([worker_ids(chunk) for chunk in chunks] or [np.array([], dtype=int)])
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(level,)) as executor:
+        return np.concatenate(list(executor.map(worker_ids, chunks)))
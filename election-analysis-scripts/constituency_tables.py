@@ -0,0 +1,110 @@
+# One constituency geometry table plus wide constituency x party/alliance results matrices, joined only to render maps
+# Replaces per-party/alliance pd.merge(districts, subset) calls, each of which copied the full geometry column and
+# was saved as its own geo-datasets/geo_<party>_<year>.feather file.
+# - Geometry: one row per constituency, indexed by Constituency ID (name_resolution.py), with State, Constituency and
+#   Reserved status. Cached once, with its levels of detail, in geo-datasets/constituency_geometry.parquet by
+#   geometry_cache.py (build geometry cache.py); scripts load it from there
+# - ResultsMatrix: per election, vote share and candidate for every party and alliance in every constituency, plus
+#   the member party for alliances. Saved as geo-datasets/results_matrix_<year>.parquet
+# A party or alliance view is a column lookup; view() attaches it to the geometry at render time.
+
+# Load packages
+import geopandas as gpd
+import pandas as pd
+import pyarrow.parquet as pq
+
+from name_resolution import NameIndex
+
+geometry_columns = ["State", "Constituency", "Reserved status", "geometry"]
+
+
+def load_geometry(shapefile_path, name_index=None):
+    """Constituency boundaries from the 2019 PC shapefile, indexed by Constituency ID, with canonical names."""
+    name_index = name_index or NameIndex.load()
+    districts = gpd.read_file(shapefile_path)
+    districts = districts.drop(["ST_CODE", "PC_CODE"], axis=1)  # Don't need state and constituency 'codes'
+    districts = districts.rename(columns={'ST_NAME': "State", 'PC_NAME': "Constituency", 'Res': "Reserved status"})
+
+    # Reservation status matches the (SC)/(ST) tags in the constituency names, except for Jalaun in UP, which is
+    # labelled General. It is reserved: https://jalaun.nic.in/parliamentary-constituency/
+    districts.loc[districts["Constituency"] == "JALAUN (SC)", "Reserved status"] = "SC"
+
+    # Canonical names (without the (SC)/(ST) tags) and IDs, so results from any source join by Constituency ID
+    ids = name_index.resolve_constituencies(districts["State"], districts["Constituency"])
+    assert ids.notna().all(), "Add the unresolved names to name_aliases.csv"
+    districts = districts.assign(State=name_index.state_names(ids).to_numpy(),
+                                 Constituency=name_index.constituency_names(ids).to_numpy())
+    districts.index = pd.Index(ids.to_numpy(), name="Constituency ID")
+    return districts[geometry_columns].sort_index()
+
+
+class ResultsMatrix:
+    """Wide constituency x party/alliance results for one election, indexed by Constituency ID.
+
+    Columns are (field, view): fields are "Vote Share (%)" and "Candidate" for every party and alliance view, and
+    "Party" for alliance views (which member party stood). Missing where the party/alliance had no candidate.
+    """
+
+    fields = ["Vote Share (%)", "Candidate", "Party"]
+
+    def __init__(self, table):
+        self.table = table
+
+    @classmethod
+    def from_results(cls, results, alliance_rules=None, alliance_codes=None):
+        """Build from candidate-level results (with Constituency ID, Party, Candidate and Vote Share (%) columns)."""
+        # Candidate names as objects: pivoted, they make one 2-D block rather than a string column per party
+        results = results.assign(Party=results["Party"].astype(str), Candidate=results["Candidate"].astype(object))
+        # Independents etc. can field several candidates in one seat: keep the strongest, as for alliances
+        strongest = results.sort_values("Vote Share (%)", ascending=False, kind="stable").drop_duplicates(
+            ["Constituency ID", "Party"])
+        party_views = strongest.pivot(index="Constituency ID", columns="Party")
+        blocks = {field: party_views[field] for field in ["Vote Share (%)", "Candidate"]}
+
+        if alliance_rules is not None:
+            # One tagged candidate per alliance and constituency (friendly contests already resolved by the tagging)
+            members = {alliance: results[alliance_rules.is_member(alliance_codes, alliance)]
+                       .set_index("Constituency ID") for alliance in alliance_rules.names}
+            for field in cls.fields:
+                alliance_block = pd.DataFrame({alliance: rows[field] for alliance, rows in members.items()})
+                blocks[field] = (pd.concat([blocks[field], alliance_block], axis=1) if field in blocks
+                                 else alliance_block)
+        table = pd.concat(blocks, axis=1, names=["field", "view"])
+        table.index.name = "Constituency ID"
+        return cls(table.sort_index())
+
+    @property
+    def views(self):
+        return list(self.table["Vote Share (%)"].columns)
+
+    def __getitem__(self, view):
+        """Vote shares of one party or alliance, by Constituency ID."""
+        return self.table[("Vote Share (%)", view)]
+
+    def view(self, geometry, view):
+        """GeoDataFrame for one party or alliance: geometry with State, Constituency, Candidate, Party, Vote Share (%).
+
+        Only the view's columns are looked up; the geometry table itself is shared, not merged and copied per view.
+        """
+        values = self.table.xs(view, axis=1, level="view").reindex(geometry.index)
+        party = values["Party"] if "Party" in values else values["Candidate"].notna().map({True: view, False: None})
+        return geometry.assign(**{"Candidate": values["Candidate"].to_numpy(),
+                                  "Party": party.to_numpy(),
+                                  "Vote Share (%)": values["Vote Share (%)"].astype(float).to_numpy()})
+
+    def save(self, path):
+        table = self.table.copy()
+        table.columns = [f"{field}|{view}" for field, view in table.columns]
+        table.to_parquet(path)
+
+    @classmethod
+    def load(cls, path, views=None):
+        """Load a saved matrix; with `views`, only those parties/alliances are read from disk."""
+        columns = None
+        if views is not None:
+            saved = set(pq.read_schema(path).names)
+            columns = [column for field in cls.fields for view in views if (column := f"{field}|{view}") in saved]
+        table = pd.read_parquet(path, columns=columns)
+        table.columns = pd.MultiIndex.from_tuples([tuple(column.split("|", 1)) for column in table.columns],
+                                                  names=["field", "view"])
+        return cls(table)
@@ -0,0 +1,99 @@
+# Direct lxml parser for ECI constituency result pages
+# Replaces the outerHTML -> pd.read_html round trip: the results rows and the constituency title are pulled out of
+# the raw HTML in one pass, converted to typed values ("-" becomes null), and appended to a columnar buffer.
+# One DataFrame is built at the end instead of one per page followed by pd.concat.
+
+# Load packages
+import re
+
+import lxml.html
+import pandas as pd
+
+# Same XPaths as the Selenium scraper
+table_xpath = '/html/body/main/div/div[3]'  # XPath for the overall results table
+header_xpath = '/html/body/main/div/div[1]/h2/span'  # XPath for the constituency name
+
+# Columns of the results table on the ECI page, and their types
+result_columns = ['S.N.', 'Candidate', 'Party', 'EVM Votes', 'Postal Votes', 'Total Votes', '% of Votes']
+int_columns = ['S.N.', 'EVM Votes', 'Postal Votes', 'Total Votes']
+float_columns = ['% of Votes']
+context_columns = ['Constituency', 'State Code', 'Constituency Number']
+
+# Whitespace clean-up applied to cell text, same as pd.read_html
+whitespace = re.compile(r"[\r\n]+|\s{2,}")
+
+
+def cell_text(cell):
+    return whitespace.sub(" ", cell.text_content().strip())
+
+
+def to_int(text):
+    text = text.replace(",", "")
+    if text in ("", "-"):
+        return None
+    return int(float(text))  # S.N. can be rendered as "1.0"
+
+
+def to_float(text):
+    text = text.replace(",", "")
+    return None if text in ("", "-") else float(text)
+
+
+def parse_constituency_page(html):
+    """Parse an ECI constituency page into (constituency_name, {column: list of typed values}).
+
+    Returns None if the page has no results table or constituency title (e.g. it needs JS to render).
+    """
+    tree = lxml.html.fromstring(html)
+    header_elements = tree.xpath(header_xpath)
+    tables = tree.xpath(table_xpath + '//table')
+    if not header_elements or not tables:
+        return None
+
+    table = tables[0]
+    header = [cell_text(th) for th in table.xpath('.//tr[th][1]/th')] or result_columns
+    converters = [to_int if col in int_columns else to_float if col in float_columns else (lambda text: text or None)
+                  for col in header]
+    columns = {col: [] for col in header}
+    for tr in table.xpath('.//tr[td]'):
+        cells = tr.xpath('./td')
+        if len(cells) != len(header):
+            continue
+        for col, convert, cell in zip(header, converters, cells):
+            columns[col].append(convert(cell_text(cell)))
+    return cell_text(header_elements[0]), columns
+
+
+class ResultsBuffer:
+    """Columnar buffer of parsed pages; to_frame() builds the combined results frame in one go."""
+
+    def __init__(self):
+        self.columns = {col: [] for col in result_columns + context_columns}
+
+    def __len__(self):
+        return len(self.columns['Candidate'])
+
+    def append(self, parsed, state_code, constituency_number):
+        constituency_name, page_columns = parsed
+        n_rows = len(next(iter(page_columns.values()), []))
+        for col in result_columns:
+            self.columns[col].extend(page_columns.get(col, [None] * n_rows))
+        self.columns['Constituency'].extend([constituency_name] * n_rows)
+        self.columns['State Code'].extend([state_code] * n_rows)
+        self.columns['Constituency Number'].extend([constituency_number] * n_rows)
+
+    def to_frame(self):
+        """Results with the same columns as election_results.csv: votes as nullable ints, % of Votes as float."""
+        frame = pd.DataFrame(self.columns)
+        for col in int_columns:
+            frame[col] = pd.array(self.columns[col], dtype="Int64")
+        for col in float_columns:
+            frame[col] = pd.array(self.columns[col], dtype="Float64")
+        return frame
+
+
+def page_frame(parsed, state_code, constituency_number):
+    """Typed results frame for a single page."""
+    buffer = ResultsBuffer()
+    buffer.append(parsed, state_code, constituency_number)
+    return buffer.to_frame()
@@ -0,0 +1,297 @@
+# Concurrent HTTP scraper for the ECI 2024 constituency results pages
+# Replaces the one-page-at-a-time Selenium loop: pages are fetched over a pooled requests session by a bounded
+# pool of worker threads, with per-host rate limiting and retry with exponential backoff.
+# Selenium is only used as a fallback for pages that don't contain the results table in their raw HTML.
+# Pages are parsed straight from the HTML by eci_page_parser into one columnar buffer.
+
+# Load packages
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from eci_page_parser import ResultsBuffer, parse_constituency_page
+
+# Base ECI URLs for 2024 election results in states and union territories
+state_base_url = "https://results.eci.gov.in/PcResultGenJune2024/ConstituencywiseS"
+ut_base_url = "https://results.eci.gov.in/PcResultGenJune2024/ConstituencywiseU"
+
+# Every valid ECI page contains this string; error pages don't
+valid_page_marker = "Election Commission of India"
+
+# The ECI website rejects requests that don't look like they come from a browser
+default_headers = {
+    "User-Agent": ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "en-GB,en;q=0.9",
+}
+
+# Status codes worth retrying: throttling and transient server errors
+retry_statuses = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Token bucket per host: at most `rate` requests per second, with bursts of up to `burst`."""
+
+    def __init__(self, rate=10.0, burst=None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._buckets = {}  # host -> [tokens, last refill time]
+        self._lock = threading.Lock()
+
+    def acquire(self, host):
+        # Block until a token is available for this host
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, last = self._buckets.get(host, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - last) * self.rate)
+                if tokens >= 1:
+                    self._buckets[host] = [tokens - 1, now]
+                    return
+                self._buckets[host] = [tokens, now]
+                wait = (1 - tokens) / self.rate
+            time.sleep(wait)
+
+
+def make_session(concurrency=16, headers=None):
+    """requests session whose connection pool is sized to the number of workers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(default_headers if headers is None else headers)
+    return session
+
+
+def fetch_page(session, url, limiter=None, retries=4, backoff=0.5, timeout=20, headers=None):
+    """GET a page, retrying throttled/failed requests with exponential backoff and jitter.
+
+    Returns the final response (which may still be an error status once retries are exhausted).
+    """
+    host = urlsplit(url).netloc
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire(host)
+        try:
+            response = session.get(url, timeout=timeout, headers=headers)
+        except requests.RequestException:
+            if attempt == retries:
+                raise
+        else:
+            if response.status_code not in retry_statuses or attempt == retries:
+                return response
+            # Respect the server's Retry-After when it throttles us
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                time.sleep(int(retry_after))
+                continue
+        time.sleep(backoff * (2 ** attempt) * (1 + random.random()))
+
+
+def fetch_cached(session, url, cache, limiter=None, **fetch_kwargs):
+    """Fetch a page through a PageCache with a conditional request.
+
+    Returns (html, changed): on 304 Not Modified the cached copy is returned with changed=False; otherwise the new
+    page is stored and changed says whether its content hash differs from the cached one. html is None on failure.
+    """
+    response = fetch_page(session, url, limiter, headers=cache.conditional_headers(url), **fetch_kwargs)
+    if response.status_code == 304 and url in cache:
+        cache.touch(url)
+        return cache.get(url), False
+    if not response.ok or not is_valid_page(response.text):
+        return None, False
+    changed = cache.store(url, response.text, etag=response.headers.get("ETag"),
+                          last_modified=response.headers.get("Last-Modified"))
+    return response.text, changed
+
+
+def is_valid_page(html):
+    """Same validity check the Selenium scraper applies to driver.page_source."""
+    return html is not None and valid_page_marker in html
+
+
+def probe_url(session, url, limiter=None, retries=2, timeout=10):
+    """Lightweight validity probe for URL discovery: True if the URL serves a real constituency page."""
+    try:
+        response = fetch_page(session, url, limiter, retries=retries, timeout=timeout)
+    except requests.RequestException:
+        return False
+    return response.ok and is_valid_page(response.text)
+
+
+def find_last_constituency(is_valid, max_number=80, hint=None):
+    """Find the last valid constituency number n, assuming numbers 1..n are valid and n+1.. are not.
+
+    Gallops 1, 2, 4, 8, ... until a probe fails, then binary searches the gap, so a state with 80 seats takes
+    ~13 probes instead of 81. If `hint` (e.g. the count from the cached valid_urls.csv) is given, probes hint and
+    hint + 1 first, which confirms an unchanged state in 2 probes. Returns 0 if the code has no pages.
+    """
+    lo, hi = 1, None  # lo: known valid (once checked); hi: known invalid
+    if hint:
+        if is_valid(hint):
+            if hint >= max_number or not is_valid(hint + 1):
+                return hint
+            lo = hint + 1
+        else:
+            hi = hint
+    if lo == 1 and not is_valid(1):
+        return 0
+
+    # Gallop to bracket the boundary, doubling the step each time
+    step = 1
+    while hi is None:
+        if lo >= max_number:
+            return max_number
+        candidate = min(lo + step, max_number)
+        if is_valid(candidate):
+            lo, step = candidate, step * 2
+        else:
+            hi = candidate
+
+    # Binary search between the last valid and first invalid numbers
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if is_valid(mid):
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def discover_urls(max_state_code=29, max_ut_code=19, max_number=80, concurrency=16, rate=10.0,
+                  cached_urls_df=None, session=None, state_base=state_base_url, ut_base=ut_base_url):
+    """Rebuild the valid_urls.csv frame by probing all state and UT codes in parallel.
+
+    Within each code the last valid constituency is found with find_last_constituency, seeded from
+    cached_urls_df when given. Columns and row order match the brute-force Selenium discovery.
+    """
+    session = session or make_session(concurrency)
+    limiter = RateLimiter(rate)
+    codes = ([(state_base, code) for code in range(1, max_state_code + 1)] +
+             [(ut_base, code) for code in range(1, max_ut_code + 1)])
+
+    # Number of constituencies per code in the cache, used as a starting guess
+    # (keyed by S/U and code, so a cache of ECI URLs can also seed discovery against another host)
+    hints = {}
+    if cached_urls_df is not None:
+        url_code = cached_urls_df['url'].str.extract(r"Constituencywise([SU]\d{2})\d+\.htm$")[0]
+        hints = url_code.value_counts().to_dict()
+
+    def discover_code(args):
+        base_url, code = args
+        last = find_last_constituency(
+            lambda number: probe_url(session, f"{base_url}{code:02}{number}.htm", limiter),
+            max_number=max_number, hint=hints.get(f"{base_url[-1]}{code:02}"))
+        return [{"state_code": code, "constituency_number": number, "url": f"{base_url}{code:02}{number}.htm"}
+                for number in range(1, last + 1)]
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        found = [row for rows in executor.map(discover_code, codes) for row in rows]
+    return pd.DataFrame(found, columns=["state_code", "constituency_number", "url"])
+
+
+def compare_with_cache(discovered_df, cached_urls_df):
+    """URLs found by discovery but not in the cached CSV, and vice versa."""
+    discovered, cached = set(discovered_df['url']), set(cached_urls_df['url'])
+    return sorted(discovered - cached), sorted(cached - discovered)
+
+
+def scrape_with_selenium(rows, chromedriver_path='/usr/local/bin/chromedriver', page_wait=5):
+    """Selenium scraper, kept as a fallback for pages that need JS to render.
+
+    `rows` is an iterable of (url, state_code, constituency_number). The rendered page source is parsed with
+    eci_page_parser. Returns ({url: parsed page}, failed_urls).
+    """
+    from selenium import webdriver
+
+    cService = webdriver.ChromeService(executable_path=chromedriver_path)
+    driver = webdriver.Chrome(service=cService)
+    pages, failed = {}, []
+    try:
+        for url, state_code, constituency_number in rows:
+            print(f"Scraping URL with Selenium: {url}")
+            try:
+                driver.get(url)
+                time.sleep(page_wait)  # Allow time for the page to load
+                parsed = parse_constituency_page(driver.page_source)
+                if parsed is None:
+                    raise ValueError("no results table in page")
+                pages[url] = parsed
+            except Exception as e:
+                print(f"Error scraping {url}: {e}")
+                failed.append(url)
+    finally:
+        driver.quit()
+    return pages, failed
+
+
+def scrape_results(valid_urls_df, concurrency=16, rate=10.0, retries=4, backoff=0.5, timeout=20,
+                   selenium_fallback=True, session=None, cache=None, resume=False):
+    """Scrape all URLs in valid_urls_df concurrently and return the combined results frame.
+
+    The frame has the same columns and row order as the one the Selenium loop builds for election_results.csv,
+    with vote columns typed by eci_page_parser.
+    Pages whose raw HTML has no results table are re-scraped with Selenium if selenium_fallback is True.
+    With a PageCache, pages are revalidated with conditional requests and archived; with resume=True, pages that
+    are already cached aren't requested at all, so a crashed scrape picks up where it left off.
+    """
+    session = session or make_session(concurrency)
+    limiter = RateLimiter(rate)
+    rows = list(valid_urls_df[['url', 'state_code', 'constituency_number']].itertuples(index=False, name=None))
+
+    def scrape_one(row):
+        url = row[0]
+        try:
+            if cache is not None and resume and url in cache:
+                html = cache.get(url)
+            elif cache is not None:
+                html, _ = fetch_cached(session, url, cache, limiter, retries=retries, backoff=backoff,
+                                       timeout=timeout)
+            else:
+                response = fetch_page(session, url, limiter, retries=retries, backoff=backoff, timeout=timeout)
+                html = response.text if response.ok else None
+            return parse_constituency_page(html) if html is not None else None
+        except Exception as e:
+            print(f"Error scraping {url}: {e}")
+            return None
+
+    # Bounded worker pool; map() keeps the results in URL order
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pages = list(executor.map(scrape_one, rows))
+
+    needs_browser = [row for row, parsed in zip(rows, pages) if parsed is None]
+    if needs_browser and selenium_fallback:
+        print(f"{len(needs_browser)} pages need a browser, falling back to Selenium")
+        fallback_pages, _ = scrape_with_selenium(needs_browser)
+        # Slot fallback results back in URL order (pages that still fail stay missing, as in the Selenium loop)
+        pages = [parsed if parsed is not None else fallback_pages.get(row[0]) for row, parsed in zip(rows, pages)]
+    elif needs_browser:
+        for url, _, _ in needs_browser:
+            print(f"Error scraping {url}: no results table in page")
+
+    buffer = ResultsBuffer()
+    for (_, state_code, constituency_number), parsed in zip(rows, pages):
+        if parsed is not None:
+            buffer.append(parsed, state_code, constituency_number)
+    return buffer.to_frame()
+
+
+def parse_cached_pages(valid_urls_df, cache):
+    """Rebuild the results frame offline from archived pages, e.g. after a parser fix. Uncached URLs are skipped."""
+    buffer = ResultsBuffer()
+    for url, state_code, constituency_number in valid_urls_df[
+            ['url', 'state_code', 'constituency_number']].itertuples(index=False, name=None):
+        html = cache.get(url)
+        parsed = parse_constituency_page(html) if html is not None else None
+        if parsed is None:
+            print(f"No cached results page for {url}")
+            continue
+        buffer.append(parsed, state_code, constituency_number)
+    return buffer.to_frame()
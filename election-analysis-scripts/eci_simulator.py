@@ -0,0 +1,196 @@
+# Local stand-in for the ECI results website, for load and failure testing of the scraper offline
+# Serves constituency pages in the DOM shape the scraper's XPaths expect, generated from election_results.csv and
+# valid_urls.csv. Latency, error rates, throttling (429 + Retry-After) and mid-count result changes are configurable.
+
+# Load packages
+import hashlib
+import html
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+from eci_page_parser import result_columns
+from poll_scheduler import declared_marker
+
+
+def render_page(constituency_name, table, status=""):
+    """Constituency page in the ECI DOM shape: title at div[1]/h2/span, results table inside div[3].
+
+    `table` is a DataFrame with the result_columns, or a list of rows of cell strings.
+    """
+    if isinstance(table, pd.DataFrame):
+        table = table.fillna("").astype(str).values.tolist()
+    header = "".join(f"<th>{col}</th>" for col in result_columns)
+    body = "".join("<tr>" + "".join(f"<td>{html.escape(value)}</td>" for value in row) + "</tr>" for row in table)
+    return (f"<html><head><title>Election Commission of India</title></head><body><main><div>"
+            f"<div><h2><span>{html.escape(constituency_name)}</span></h2></div><div>{status}</div>"
+            f"<div><table><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table></div>"
+            f"</div></main></body></html>")
+
+
+def render_error_page():
+    # What an invalid constituency URL returns: no results, no ECI title
+    return "<html><head><title>Error</title></head><body><h1>The page you requested was not found</h1></body></html>"
+
+
+def load_pages(election_results_path, valid_urls_path):
+    """Final results per URL path, as {path: (constituency_name, results table as strings)}."""
+    results = pd.read_csv(election_results_path, dtype=str, keep_default_na=False)
+    results['S.N.'] = results['S.N.'].str.replace(r"\.0$", "", regex=True)
+    valid_urls_df = pd.read_csv(valid_urls_path)
+    # State and UT pages share numeric codes (S01 and U01 are both state code 1), but the scraper wrote the results
+    # in valid_urls.csv order, so the constituencies line up with the URLs row by row
+    groups = results.groupby(['State Code', 'Constituency Number', 'Constituency'], sort=False)
+    pages = {}
+    for url, ((_, _, constituency), group) in zip(valid_urls_df['url'], groups):
+        pages[urlsplit(url).path] = (constituency, group[result_columns].reset_index(drop=True))
+    return pages
+
+
+class SimulatedECI:
+    """Threaded HTTP server imitating results.eci.gov.in.
+
+    latency: mean seconds per response (exponentially distributed); error_rate: share of 500 responses;
+    throttle_rps: requests per second above which clients get 429s; count_duration: seconds over which votes are
+    counted from 0 to the final result (None serves final results straight away).
+    """
+
+    def __init__(self, pages, latency=0.05, error_rate=0.0, throttle_rps=None, count_duration=None, seed=0,
+                 host="127.0.0.1", port=0):
+        self.pages = pages
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rps = throttle_rps
+        self.count_duration = count_duration
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "ok": 0, "not_modified": 0, "errors": 0, "throttled": 0, "not_found": 0}
+
+        # Each constituency starts counting at a different time, so pages change at different moments
+        rng = np.random.default_rng(seed)
+        self.count_offsets = dict(zip(pages, rng.uniform(0, 0.3, len(pages))))
+        self.started = time.monotonic()
+        self._tokens = throttle_rps or 0
+        self._last_refill = self.started
+
+        # Pre-split each page into cell strings and a numeric vote array, so partial counts are cheap to render
+        self.vote_positions = [result_columns.index(col) for col in ['EVM Votes', 'Postal Votes', 'Total Votes']]
+        self.rows = {path: table.astype(str).values.tolist() for path, (_, table) in pages.items()}
+        self.votes = {path: table.iloc[:, self.vote_positions].apply(pd.to_numeric, errors='coerce').to_numpy()
+                      for path, (_, table) in pages.items()}
+
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                simulator.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def local_urls(self, valid_urls_df):
+        """valid_urls_df with URLs pointing at the simulator instead of the ECI website."""
+        return valid_urls_df.assign(url=self.base_url + valid_urls_df['url'].map(lambda url: urlsplit(url).path))
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def progress(self, path):
+        # Share of votes counted so far for a constituency (1 once counting is over)
+        if self.count_duration is None:
+            return 1.0
+        elapsed = (time.monotonic() - self.started) / self.count_duration
+        offset = self.count_offsets[path]
+        return float(np.clip((elapsed - offset) / (1 - offset), 0, 1))
+
+    def page_html(self, path):
+        constituency, _ = self.pages[path]
+        progress = self.progress(path)
+        if progress == 1:
+            return render_page(constituency, self.rows[path], status=declared_marker)
+
+        # Scale votes down to the share counted so far; rounding to 1% steps makes pages change in jumps
+        counted = np.round(self.votes[path] * np.floor(progress * 100) / 100)
+        rows = [list(row) for row in self.rows[path]]
+        for row, row_votes in zip(rows, counted):
+            for position, value in zip(self.vote_positions, row_votes):
+                row[position] = "-" if np.isnan(value) else str(int(value))
+        return render_page(constituency, rows, status="Counting in progress")
+
+    def throttled(self):
+        if not self.throttle_rps:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            self._tokens = min(self.throttle_rps, self._tokens + (now - self._last_refill) * self.throttle_rps)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return False
+            return True
+
+    def count(self, outcome):
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats[outcome] += 1
+
+    def handle(self, request):
+        if self.latency:
+            time.sleep(self.random.expovariate(1 / self.latency))
+        path = urlsplit(request.path).path
+
+        if self.throttled():
+            self.count("throttled")
+            return self.respond(request, 429, "Too Many Requests", {"Retry-After": "1"})
+        if self.random.random() < self.error_rate:
+            self.count("errors")
+            return self.respond(request, 500, "Internal Server Error")
+        if path not in self.pages:
+            self.count("not_found")
+            return self.respond(request, 404, render_error_page())
+
+        body = self.page_html(path)
+        etag = '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:16] + '"'
+        if request.headers.get("If-None-Match") == etag:
+            self.count("not_modified")
+            return self.respond(request, 304, "", {"ETag": etag})
+        self.count("ok")
+        return self.respond(request, 200, body, {"ETag": etag})
+
+    def respond(self, request, status, body, headers=None):
+        payload = body.encode("utf-8")
+        request.send_response(status)
+        request.send_header("Content-Type", "text/html; charset=utf-8")
+        for key, value in (headers or {}).items():
+            request.send_header(key, value)
+        if status != 304:
+            request.send_header("Content-Length", str(len(payload)))
+        request.end_headers()
+        if status != 304:
+            request.wfile.write(payload)
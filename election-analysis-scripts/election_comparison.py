@@ -0,0 +1,192 @@
+# Comparison of two elections for every party and alliance at once
+# Replaces the notebook's per-party comparisons, which tagged each year's columns with (2019)/(2024) suffixes,
+# outer-merged the two years on State, Constituency and geometry, re-applied name fixes and subtracted vote shares.
+# Here both elections' results matrices (constituency_tables.ResultsMatrix) are aligned once - rows by Constituency ID,
+# columns by party/alliance name - into constituency x view arrays, and swings, seat winners and runners-up for all
+# views come from array arithmetic over them. Geometry is never involved: join a result to it by Constituency ID.
+# Party names differ between elections (the 2019 ECI report uses abbreviations, e.g. BJP and INC): each year's names
+# are translated to the 2024 names with election-data/party_names.csv. Where a party split (Shiv Sena, NCP), the 2019
+# party is compared with the faction that kept its name and symbol. Alliances are compared by name (NDA with NDA);
+# pass view_names to compare differently named ones, e.g. {"UPA": "INDIA"}.
+# Where boundaries were redrawn (Assam in 2024), a boundary_crosswalk.Crosswalk reallocates the earlier election's
+# votes onto the later boundaries first, so every seat has a swing.
+
+# Load packages
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from alliance_rules import AllianceRules
+from constituency_tables import ResultsMatrix
+from results_store import load_results
+
+party_names_path = Path(__file__).resolve().parent.parent / "election-data/party_names.csv"
+not_candidates = ["NONE OF THE ABOVE"]  # Views with shares and swings, but never winners or runners-up
+
+
+def load_party_names(path=party_names_path):
+    """{year: {party name in that year's results: common (2024) name}}."""
+    table = pd.read_csv(path)
+    return {year: dict(zip(rows["party"], rows["name"])) for year, rows in table.groupby("year")}
+
+
+def votes_cast(year):
+    """Total votes cast per constituency in one election in the results store."""
+    results = load_results(years=[year], columns=["Constituency ID", "Total Votes Cast"])
+    return results.groupby("Constituency ID")["Total Votes Cast"].first()
+
+
+def election_matrix(year, alliance_rules=None):
+    """Results matrix of one election in the results store, with alliance views from the alliance config."""
+    results = load_results(years=[year], columns=["State", "Constituency ID", "Constituency", "Candidate", "Party",
+                                                  "Total Votes", "Vote Share (%)"])
+    alliance_rules = alliance_rules or AllianceRules()
+    return ResultsMatrix.from_results(results, alliance_rules, alliance_rules.tag(results, year=year))
+
+
+class ElectionComparison:
+    """Swings, seat changes and winner/runner-up changes between two elections, for every party and alliance.
+
+    All tables are indexed by Constituency ID (constituencies in either election) and/or view (parties and alliances
+    in either election, by common name):
+    - shares: {year: constituency x view vote shares}, NaN where the party/alliance had no candidate
+    - swing: constituency x view, after - before; NaN unless the party/alliance stood in both elections
+    - won, second: {year: constituency x view}, True where the party/alliance came first/second
+    - gained, lost: constituency x view, seats won in the later/earlier election only (of seats contested in both)
+    - seats: view x (seats, runner-up places per year, gained, lost, net change, mean swing)
+    - contests: constituency x (winner, runner-up, their vote shares and margin per year, and whether they changed)
+    Winners and runners-up are candidates (party views, not NOTA); an alliance wins a seat where its candidate does.
+    """
+
+    def __init__(self, before, after, years=(2019, 2024), party_names=None, view_names=None):
+        # before, after: ResultsMatrix of each election; party_names: {year: {name: common name}} (default
+        # party_names.csv); view_names: {earlier election's view: later election's view}, e.g. alliances
+        party_names = load_party_names() if party_names is None else party_names
+        self.years = before_year, after_year = tuple(years)
+        elections = [self.election_arrays(before.table, {**party_names.get(before_year, {}), **(view_names or {})}),
+                     self.election_arrays(after.table, party_names.get(after_year, {}))]
+
+        # Union of constituencies and of views (parties, then alliances)
+        alliances = list(dict.fromkeys(view for _, _, _, _, names in elections for view in names))
+        parties = sorted({view for _, views, _, _, _ in elections for view in views} - set(alliances))
+        self.views = pd.Index(parties + alliances, name="view")
+        candidates = [party for party in parties if party not in not_candidates]
+        ranked = ~self.views.isin(not_candidates)
+        self.constituencies = pd.Index(elections[0][0].union(elections[1][0]), name="Constituency ID")
+
+        self.shares, self.won, self.second, rankings = {}, {}, {}, {}
+        for year, (constituencies, views, election_share, election_stood, _) in zip(self.years, elections):
+            # Scatter each election's columns into the aligned constituency x view arrays
+            cells = np.ix_(self.constituencies.get_indexer(constituencies), self.views.get_indexer(views))
+            share = np.full((len(self.constituencies), len(self.views)), np.nan)
+            share[cells] = election_share
+            stood = np.zeros(share.shape, dtype=bool)
+            stood[cells] = election_stood
+            rankings[year] = self.rank(share, stood & ranked, self.views.get_indexer(candidates))
+            self.shares[year] = self.frame(share)
+            self.won[year] = self.frame(rankings[year][0])
+            self.second[year] = self.frame(rankings[year][1])
+
+        self.swing = self.frame(self.shares[after_year].to_numpy() - self.shares[before_year].to_numpy())
+        # Seat changes only where both elections have a result (e.g. not redrawn Assam seats, without a crosswalk)
+        won_before, won_after = self.won[before_year].to_numpy(), self.won[after_year].to_numpy()
+        both = (won_before.any(axis=1) & won_after.any(axis=1))[:, None]
+        self.gained = self.frame(won_after & ~won_before & both)
+        self.lost = self.frame(won_before & ~won_after & both)
+        self.seats = pd.DataFrame({
+            **{f"Seats ({year})": self.won[year].sum() for year in self.years},
+            **{f"Runner-up ({year})": self.second[year].sum() for year in self.years},
+            "Gained": self.gained.sum(), "Lost": self.lost.sum(),
+            "Net change": self.won[after_year].sum() - self.won[before_year].sum(),
+            "Mean swing": self.swing.mean(),
+        })
+        self.contests = self.contest_table(rankings, candidates)
+
+    @staticmethod
+    def election_arrays(table, names):
+        """Constituencies, views (renamed by `names`), vote shares and candidate presence arrays, and alliance views.
+
+        Views without candidates (e.g. alliances of other elections) are dropped, so they can't clash with new names.
+        """
+        shares, candidates = table["Vote Share (%)"], table["Candidate"]
+        if not candidates.columns.equals(shares.columns):
+            candidates = candidates[shares.columns]
+        share, stood = shares.to_numpy(dtype=float), candidates.notna().to_numpy()
+        keep = stood.any(axis=0)
+        views = pd.Index([names.get(view, view) for view in shares.columns[keep]])
+        if views.has_duplicates:
+            raise ValueError(f"Several parties/alliances renamed to the same name: {sorted(views[views.duplicated()])}")
+        alliances = [names.get(view, view) for view in table["Party"].columns] if "Party" in table else []
+        return table.index, views, share[:, keep], stood[:, keep], [view for view in alliances if view in views]
+
+    def frame(self, values):
+        return pd.DataFrame(values, index=self.constituencies, columns=self.views)
+
+    @staticmethod
+    def rank(share, stood, candidates):
+        """First and second places of every view in every constituency, and the positions and shares of the top two.
+
+        Candidates (the views at positions `candidates`; not NOTA or alliances) are ranked by vote share; a candidate
+        with no vote share (Surat 2024, uncontested) ranks first. Top two positions are among the candidates.
+        """
+        key = np.where(stood, np.where(np.isnan(share), np.inf, share), -np.inf)
+        rows = np.arange(len(key))
+        share = share[:, candidates]
+        party_key = key[:, candidates]
+        top = np.argmax(party_key, axis=1)
+        top_key = party_key[rows, top]
+        party_key[rows, top] = -np.inf
+        runner_up = np.argmax(party_key, axis=1)
+        runner_up_key = party_key[rows, runner_up]
+        first = (key == top_key[:, None]) & (top_key > -np.inf)[:, None]
+        second = (key == runner_up_key[:, None]) & (runner_up_key > -np.inf)[:, None] & ~first
+        return (first, second, np.where(top_key > -np.inf, top, -1), np.where(runner_up_key > -np.inf, runner_up, -1),
+                share[rows, top], share[rows, runner_up])
+
+    def contest_table(self, rankings, candidates):
+        names = np.array(candidates + [None], dtype=object)  # Position -1: no candidate
+        columns = {}
+        for year, (_, _, top, runner_up, top_share, runner_up_share) in rankings.items():
+            has_top, has_runner_up = top >= 0, runner_up >= 0
+            columns[f"Winner ({year})"] = names[top]
+            columns[f"Winner Vote Share (%) ({year})"] = np.where(has_top, top_share, np.nan)
+            columns[f"Runner-up ({year})"] = names[runner_up]
+            columns[f"Runner-up Vote Share (%) ({year})"] = np.where(has_runner_up, runner_up_share, np.nan)
+            columns[f"Margin ({year})"] = np.where(has_top & has_runner_up, top_share - runner_up_share, np.nan)
+        contests = pd.DataFrame(columns, index=self.constituencies)
+        before_year, after_year = self.years
+        for role in ["Winner", "Runner-up"]:
+            before, after = contests[f"{role} ({before_year})"], contests[f"{role} ({after_year})"]
+            contests[f"{role} changed"] = before.notna() & after.notna() & (before != after)
+        return contests
+
+    def view(self, geometry, view):
+        """GeoDataFrame for one party or alliance: geometry with its vote share in each election and Vote Swing.
+
+        Joined by Constituency ID, as ResultsMatrix.view; missing where the party/alliance had no candidate.
+        """
+        columns = {f"Vote Share (%) ({year})": self.shares[year][view] for year in self.years}
+        columns["Vote Swing"] = self.swing[view]
+        return geometry.assign(**{name: values.reindex(geometry.index).to_numpy() for name, values in columns.items()})
+
+    def flips(self, view=None):
+        """Seats that changed hands, with their winners and runners-up; with a view, only seats it gained or lost."""
+        changed = self.contests["Winner changed"]
+        if view is not None:
+            changed = self.gained[view] | self.lost[view]
+        return self.contests[changed]
+
+
+def compare_elections(before_year=2019, after_year=2024, view_names=None, alliance_rules=None, crosswalk=None):
+    """ElectionComparison of two elections in the results store.
+
+    With a crosswalk (boundary_crosswalk.Crosswalk), the earlier election is compared as notional results on the later
+    election's boundaries.
+    """
+    alliance_rules = alliance_rules or AllianceRules()
+    before = election_matrix(before_year, alliance_rules)
+    if crosswalk is not None:
+        before = crosswalk.notional_matrix(before, votes_cast(before_year))
+    return ElectionComparison(before, election_matrix(after_year, alliance_rules), years=(before_year, after_year),
+                              view_names=view_names)
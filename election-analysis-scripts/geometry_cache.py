@@ -0,0 +1,175 @@
+# Preprocessed constituency geometry cache: one GeoParquet file, built once from the shapefile by
+# build geometry cache.py, holding everything the maps need per constituency (indexed by Constituency ID):
+# - State, Constituency, Reserved status (cleaned and resolved by constituency_tables.load_geometry)
+# - validated geometry at several levels of detail: "full" (source boundaries) plus coverage simplifications that
+#   keep shared borders between neighbouring constituencies identical, so simplified maps have no gaps or overlaps
+# - centroids and label points (inside the constituency, for arrows and labels) projected to EPSG:7755 (India), and in
+#   longitude/latitude for folium; bounding boxes in longitude/latitude
+# Loaders read only the columns (and geometry level) they use, so scripts choose the level of detail per output,
+# e.g. "full" for analysis and static plots, "web" for interactive maps.
+# State outlines (and the national outline) are dissolved from the constituencies at every level of detail and cached
+# next to them, in geo-datasets/state_outlines.parquet, so maps don't recompute the union each session.
+
+# Load packages
+from functools import lru_cache
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from constituency_tables import load_geometry
+
+# Define paths to the caches
+cache_path = Path(__file__).resolve().parent.parent / "geo-datasets/constituency_geometry.parquet"
+state_outlines_path = cache_path.with_name("state_outlines.parquet")
+
+# Simplification tolerance per level of detail, in degrees (0.001 degrees is ~100m)
+levels = {"full": 0, "detailed": 0.001, "web": 0.005, "overview": 0.02}
+
+projected_crs = "EPSG:7755"  # WGS 84 / India NSF LCC, as used for the arrow maps
+attribute_columns = ["State", "Constituency", "Reserved status"]
+point_columns = ["centroid_x", "centroid_y", "centroid_lon", "centroid_lat",
+                 "label_x", "label_y", "label_lon", "label_lat"]
+bbox_columns = ["minx", "miny", "maxx", "maxy"]
+india = "INDIA"  # State outlines index value of the national outline
+
+# Coverage cleaning and sliver removal. Gaps between neighbouring constituencies narrower than gap_width (in degrees)
+# are merged into a neighbour; in the dissolved outlines, parts smaller than min_part_fraction of their outline's area
+# are dropped, and holes smaller than max_hole_fraction are filled unless another state covers them (an enclave, e.g.
+# Yanam inside Andhra Pradesh)
+gap_width = 0.001
+min_part_fraction = 1e-5
+max_hole_fraction = 1e-2
+
+
+def validate(geometries):
+    """Repair invalid polygons in one vectorised pass, keeping only polygonal parts (no collapsed lines/points)."""
+    return shapely.make_valid(geometries, method="structure", keep_collapsed=False)
+
+
+def build_geometry_cache(shapefile_path, path=cache_path, name_index=None):
+    """Clean, validate, simplify and measure the constituency geometry once, and write it to the cache."""
+    districts = load_geometry(shapefile_path, name_index).to_crs("EPSG:4326")
+    # Validate, then make the constituencies an exact coverage (no overlaps, identical shared edges), which the
+    # coverage simplification and the state dissolve rely on
+    full = shapely.coverage_clean(validate(districts.geometry.to_numpy()), gap_width=gap_width)
+
+    cache = gpd.GeoDataFrame(districts[attribute_columns])
+    for level, tolerance in levels.items():
+        geometries = full if tolerance == 0 else validate(shapely.coverage_simplify(full, tolerance))
+        cache[f"geometry_{level}"] = gpd.GeoSeries(geometries, index=districts.index, crs="EPSG:4326")
+    cache = cache.set_geometry("geometry_full")
+
+    # Centroids and label points are computed in the projected CRS, where they are true to area
+    projected = cache.geometry.to_crs(projected_crs)
+    for name, points in [("centroid", projected.centroid), ("label", projected.representative_point())]:
+        cache[f"{name}_x"], cache[f"{name}_y"] = points.x, points.y
+        points = points.to_crs("EPSG:4326")
+        cache[f"{name}_lon"], cache[f"{name}_lat"] = points.x, points.y
+    cache[bbox_columns] = cache.geometry.bounds
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cache.to_parquet(path)
+    build_state_outlines(cache).to_parquet(path.with_name(state_outlines_path.name))
+    level_geometry.cache_clear()
+    return cache
+
+
+def union(geometries):
+    try:
+        return shapely.coverage_union_all(geometries)  # Fast: only dissolves shared edges
+    except shapely.errors.GEOSException:  # Not an exact coverage
+        return shapely.union_all(geometries)
+
+
+def remove_slivers(outlines):
+    """Drop parts and fill holes that are small relative to each outline's area, in one vectorised pass."""
+    parts, owners = shapely.get_parts(outlines, return_index=True)
+    part_areas = shapely.area(parts)
+    outline_areas = np.bincount(owners, weights=part_areas, minlength=len(outlines))
+    keep = part_areas >= min_part_fraction * outline_areas[owners]
+    parts, owners = parts[keep], owners[keep]
+
+    # The first ring of each part is its exterior, the rest are holes
+    rings, ring_parts = shapely.get_rings(parts, return_index=True)
+    is_hole = np.r_[False, ring_parts[1:] == ring_parts[:-1]] if len(rings) else np.zeros(0, dtype=bool)
+    ring_owners = owners[ring_parts]
+    holes = np.flatnonzero(is_hole)
+    hole_polygons = shapely.polygons(rings[holes])
+    hole_areas = shapely.area(hole_polygons)
+    small = hole_areas < max_hole_fraction * outline_areas[ring_owners[holes]]
+
+    # Enclaves: holes mostly covered by other outlines
+    hole_index, other = shapely.STRtree(outlines).query(hole_polygons, predicate="intersects")
+    other_state = other != ring_owners[holes[hole_index]]
+    hole_index, other = hole_index[other_state], other[other_state]
+    covered = np.bincount(hole_index, minlength=len(holes),
+                          weights=shapely.area(shapely.intersection(hole_polygons[hole_index], outlines[other])))
+    fill = small & (covered < 0.5 * hole_areas)
+
+    keep_ring = np.ones(len(rings), dtype=bool)
+    keep_ring[holes[fill]] = False
+    parts = shapely.polygons(rings[keep_ring], indices=ring_parts[keep_ring])
+    return validate(shapely.multipolygons(parts, indices=owners))
+
+
+def dissolve(geometries, groups):
+    """Outline per group (e.g. state) of constituency geometries, with slivers removed, indexed by group."""
+    codes, names = pd.factorize(pd.Series(groups), sort=True)
+    outlines = validate(np.array([union(geometries[codes == code]) for code in range(len(names))], dtype=object))
+    return pd.Series(remove_slivers(outlines), index=pd.Index(names, name="State"))
+
+
+def build_state_outlines(cache):
+    """State outlines, plus the national outline (indexed "INDIA"), at every level of detail in the cache."""
+    outlines = {}
+    for level in levels:
+        geometries = cache[f"geometry_{level}"].to_numpy()
+        states = dissolve(geometries, cache["State"].to_numpy())
+        # The national outline is dissolved from the state outlines, where enclaves are already filled
+        national = dissolve(states.to_numpy(), np.full(len(states), india))
+        outlines[f"geometry_{level}"] = gpd.GeoSeries(pd.concat([states, national]), crs=cache.crs)
+    return gpd.GeoDataFrame(outlines, geometry="geometry_full")
+
+
+def load_geometry_cache(level="full", columns=attribute_columns, path=cache_path):
+    """Constituency geometry at one level of detail, with the requested attribute/point/bbox columns.
+
+    Returns a GeoDataFrame indexed by Constituency ID, with the level's geometry as its "geometry" column.
+    """
+    if level not in levels:
+        raise ValueError(f"Unknown level of detail {level!r}; choose from {list(levels)}")
+    frame = gpd.read_parquet(path, columns=[*columns, f"geometry_{level}"])
+    return frame.rename_geometry("geometry")
+
+
+def load_points(columns=point_columns, path=cache_path):
+    """Centroid/label point (or bbox) coordinates by Constituency ID, without reading any geometry."""
+    return pd.read_parquet(path, columns=list(columns))
+
+
+def load_state_outlines(level="full", path=state_outlines_path):
+    """State outlines (indexed by State) at one level of detail, as a GeoDataFrame with a "geometry" column."""
+    if level not in levels:
+        raise ValueError(f"Unknown level of detail {level!r}; choose from {list(levels)}")
+    outlines = gpd.read_parquet(path, columns=[f"geometry_{level}"]).rename_geometry("geometry")
+    return outlines.drop(index=india)
+
+
+def load_india_outline(level="full", path=state_outlines_path):
+    """National outline at one level of detail, as a one-row GeoDataFrame."""
+    outlines = gpd.read_parquet(path, columns=[f"geometry_{level}"]).rename_geometry("geometry")
+    return outlines.loc[[india]]
+
+
+@lru_cache(maxsize=None)
+def level_geometry(level, path=cache_path):
+    return load_geometry_cache(level, columns=[], path=path).geometry
+
+
+def at_level(frame, level, path=cache_path):
+    """Swap a frame's constituency geometry (frame indexed by Constituency ID) for another level of detail."""
+    geometry = level_geometry(level, path)
+    return frame.set_geometry(geometry.reindex(frame.index).to_numpy(), crs=geometry.crs)
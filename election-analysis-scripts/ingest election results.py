@@ -0,0 +1,39 @@
+# In this file: clean the 2019 and 2024 election results once and write them to the columnar results store
+# Analysis scripts then load cleaned, typed results from election-data/results-store (see results_store.py)
+# instead of re-reading and re-cleaning election_results.csv and the 2019 statistical report on every run.
+# Re-run after re-scraping, or after adding spellings to election-data/name_aliases.csv
+
+# Load packages
+import pandas as pd
+from pathlib import Path
+from live_poll import apply_deltas
+from name_resolution import NameIndex
+import results_store
+
+# Set loc and define paths used to load data
+base_path = Path().resolve().parent
+results_2024_path = base_path / "election-data/election_results.csv"
+results_2019_path = base_path / "election-data/eci-data/33. Constituency Wise Detailed Result.xlsx"
+live_deltas_path = base_path / "election-data/live_deltas.csv"
+
+name_index = NameIndex.load()
+
+# 2024: scraped results
+results_2024 = pd.read_csv(results_2024_path)
+
+# On counting day, bring the last full scrape up to date with the live poller's delta log instead of re-scraping
+# (check live delta ingest.py runs this path on a sample delta)
+apply_live_deltas = False
+if apply_live_deltas and live_deltas_path.exists():
+    results_2024 = apply_deltas(results_2024, pd.read_csv(live_deltas_path))
+
+results_store.write_results(results_store.clean_results_2024(results_2024, name_index), 2024)
+
+# 2019: ECI statistical report
+election_2019 = results_store.read_results_2019(results_2019_path)
+results_store.write_results(results_store.clean_results_2019(election_2019, name_index), 2019)
+
+# Check what's in the store
+stored = results_store.load_results(columns=["Year", "Constituency ID"])
+stored.groupby("Year")["Constituency ID"].agg(["size", "nunique"])
+# 2019: 8598 candidates, 543 constituencies; 2024: 8902 candidates, 543 constituencies
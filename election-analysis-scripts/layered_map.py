@@ -0,0 +1,156 @@
+# One interactive map for every party/alliance/year vote share layer, switched in the browser
+# Replaces one HTML file per party and year (bjp_vote_share_map_2024.html, nda_vote_share_map_step_colour_2019.html,
+# ...), each embedding the whole geometry and colouring it with a Python style_function per feature. Here:
+# - the constituency geometry is embedded once, as quantised TopoJSON (web_geometry.py)
+# - every layer is a compact array per constituency: vote share, colour bin, and optionally a detail (e.g. the
+#   alliance's member party). Colour bins are computed for all constituencies at once at build time, with the same
+#   thresholds as the StepColormaps of the single-layer maps
+# - a drop-down restyles the constituencies, legend and tooltips in the browser, without loading another page
+# Build time grows with the number of constituencies, not with the number of layers.
+
+# Load packages
+import html
+
+import folium
+import numpy as np
+from branca.element import MacroElement
+from jinja2 import Template
+
+from web_geometry import default_quantization, topojson_layer
+
+vote_share_thresholds = [0, 10, 30, 50, 100]  # Ranges for Vote Share (%)
+orange = ['#FFEB99', '#FFC266', '#FF9933', '#FF6600']  # Light to dark orange
+blue = ['#cff0fc', '#9cd6f5', '#65b9eb', '#0384fc']  # Light to dark blue
+missing_colour = '#D3D3D3'  # No candidate
+constituency_style = {'color': 'black', 'weight': 0.5, 'fillOpacity': 0.7}
+
+
+def colour_bins(values, thresholds=vote_share_thresholds):
+    """Colour bin of every value, as StepColormap(colors, index=thresholds) bins it; -1 where missing."""
+    values = np.asarray(values, dtype=float)
+    bins = np.clip(np.searchsorted(thresholds, values, side="right") - 1, 0, len(thresholds) - 2)
+    return np.where(np.isnan(values), -1, bins)
+
+
+def legend_html(caption, colors, thresholds):
+    swatches = "".join(
+        f'<div><span style="display: inline-block; width: 12px; height: 12px; margin-right: 4px; '
+        f'background: {colour};"></span>{low:g}-{high:g}</div>'
+        for colour, low, high in zip(colors, thresholds[:-1], thresholds[1:]))
+    missing = (f'<div><span style="display: inline-block; width: 12px; height: 12px; margin-right: 4px; '
+               f'background: {missing_colour};"></span>No candidate</div>')
+    return f"<b>{html.escape(caption)}</b>{swatches}{missing}"
+
+
+def vote_share_layer(matrix, view, colors, caption, thresholds=vote_share_thresholds, detail="Party"):
+    """Layer spec for one party/alliance view of a ResultsMatrix (see layered_map).
+
+    For alliance views, `detail` (the member party by default) is shown in the tooltip; party views have none.
+    """
+    values = matrix.table.xs(view, axis=1, level="view")
+    return {"values": values["Vote Share (%)"].astype(float),
+            "details": values[detail] if detail in values else None,
+            "detail_label": detail,
+            "colors": colors,
+            "thresholds": thresholds,
+            "caption": caption}
+
+
+class LayerSwitch(MacroElement):
+    """Drop-down, legend and tooltips that restyle a constituency layer with one of several value layers."""
+
+    _template = Template("""
+        {% macro html(this, kwargs) %}
+        <div style="position: fixed; top: 10px; right: 10px; z-index: 9999; background: white; padding: 8px;
+                    border: 1px solid grey; border-radius: 8px; font-family: Arial, sans-serif; font-size: 12px;">
+            <select id="{{ this.get_name() }}_select" style="margin-bottom: 6px;">
+            {%- for name in this.layers %}
+                <option>{{ name }}</option>
+            {%- endfor %}
+            </select>
+            <div id="{{ this.get_name() }}_legend"></div>
+        </div>
+        {% endmacro %}
+
+        {% macro script(this, kwargs) %}
+        (function () {
+            var shapes = {{ this.shapes.get_name() }};
+            var layers = {{ this.layers|tojson }};
+            var style = {{ this.style|tojson }};
+            var select = document.getElementById("{{ this.get_name() }}_select");
+            var legend = document.getElementById("{{ this.get_name() }}_legend");
+            var current = layers[select.value];
+
+            function show(name) {
+                current = layers[name];
+                shapes.eachLayer(function (shape) {
+                    var bin = current.bins[shape.feature.properties.i];
+                    style.fillColor = bin < 0 ? {{ this.missing_colour|tojson }} : current.colors[bin];
+                    shape.setStyle(style);
+                });
+                legend.innerHTML = current.legend;
+            }
+
+            shapes.eachLayer(function (shape) {
+                shape.bindTooltip(function () {
+                    var properties = shape.feature.properties;
+                    var value = current.values[properties.i];
+                    var rows = {{ this.fields|tojson }}.map(function (field) {
+                        return field + ": <b>" + properties[field] + "</b>";
+                    });
+                    value = value === null ? "No candidate" : value.toFixed(2);
+                    rows.push(current.caption + ": <b>" + value + "</b>");
+                    if (current.details && current.details[properties.i] !== null) {
+                        rows.push(current.detail_label + ": <b>" + current.details[properties.i] + "</b>");
+                    }
+                    return rows.join("<br>");
+                }, {sticky: true});
+            });
+
+            select.addEventListener("change", function () { show(this.value); });
+            show(select.value);
+        })();
+        {% endmacro %}
+        """)
+
+    def __init__(self, shapes, layers, fields, style=constituency_style):
+        super().__init__()
+        self._name = "LayerSwitch"
+        self.shapes, self.layers, self.fields, self.style = shapes, layers, fields, style
+        self.missing_colour = missing_colour
+
+
+def layered_map(geometry, layers, quantization=default_quantization):
+    """Interactive map of the geometry's rows, with a drop-down to switch between value layers.
+
+    geometry: GeoDataFrame indexed by Constituency ID; its other columns are shown in every tooltip.
+    layers: {name: layer spec} (see vote_share_layer): values (and optional details) by Constituency ID, colors,
+        thresholds, caption. The first layer is shown when the page opens.
+    """
+    fields = [column for column in geometry.columns if column != geometry.geometry.name]
+    encoded = {}
+    for name, layer in layers.items():
+        values = layer["values"].reindex(geometry.index).to_numpy(dtype=float)
+        details = layer.get("details")
+        if details is not None:
+            details = details.reindex(geometry.index).astype(object)
+            details = details.where(details.notna(), None).tolist()
+        encoded[name] = {"caption": layer["caption"],
+                         "colors": list(layer["colors"]),
+                         "bins": colour_bins(values, layer["thresholds"]).tolist(),
+                         "values": [None if np.isnan(value) else value for value in values.round(2).tolist()],
+                         "details": details,
+                         "detail_label": layer.get("detail_label"),
+                         "legend": legend_html(layer["caption"], layer["colors"], layer["thresholds"])}
+
+    m = folium.Map(location=[20.5937, 78.9629], zoom_start=5, tiles=None)
+    # Features carry their row position, "i", to look up their value in every layer
+    shapes = topojson_layer(geometry.assign(i=np.arange(len(geometry))), quantization).add_to(m)
+    LayerSwitch(shapes, encoded, fields).add_to(m)
+
+    minx, miny, maxx, maxy = geometry.total_bounds
+    m.fit_bounds([[miny, minx], [maxy, maxx]])
+    # White background
+    m.get_root().header.add_child(folium.Element(
+        "<style>.leaflet-container { background: #FFFFFF !important; }</style>"))
+    return m
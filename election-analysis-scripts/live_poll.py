@@ -0,0 +1,220 @@
+# Counting-day live polling of the ECI results pages
+# Instead of rebuilding election_results.csv from scratch every time, each polling round revalidates all pages
+# through the page cache, re-parses only the pages whose content changed, and appends per-candidate vote changes
+# (with timestamps) to a delta log. Downstream steps can apply the deltas to results they already hold.
+
+# Load packages
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import eci_scraper
+import poll_scheduler
+from eci_page_parser import page_frame, parse_constituency_page
+
+# Columns identifying one candidate row in the scraped results (state and UT pages share state codes, so the
+# constituency title is needed to tell e.g. S01 and U01 apart; namesakes can stand in the same constituency, e.g. two
+# independents called S.SATHISH KUMAR in Tamil Nadu PC 4, so the candidate's serial number on the page is too)
+candidate_key = ['State Code', 'Constituency Number', 'Constituency', 'S.N.', 'Candidate', 'Party']
+vote_columns = ['EVM Votes', 'Postal Votes', 'Total Votes']
+page_key = ['State Code', 'Constituency Number', 'Constituency']
+delta_columns = ['Timestamp', 'State Code', 'Constituency Number', 'Constituency', 'S.N.', 'Candidate', 'Party',
+                 'EVM Votes', 'Postal Votes', 'Total Votes', 'Vote Change']
+
+
+def numeric_votes(frame):
+    # Scraped vote columns contain "-" for missing values; treat those as 0 votes
+    frame = frame.copy()
+    for col in vote_columns:
+        frame[col] = pd.to_numeric(frame[col], errors='coerce').fillna(0).astype(int)
+    return frame
+
+
+def candidate_index(frame, unique=True):
+    """Candidate keys of a scraped results or delta frame, typed alike whichever way the frame was read.
+
+    Missing parties become '' and the Total row, which has no serial number, gets S.N. 0. With unique=True, raises
+    ValueError if two rows share a key, as their votes would be mixed up.
+    """
+    keys = frame[candidate_key].fillna({'Party': ''})
+    keys['S.N.'] = pd.to_numeric(keys['S.N.']).fillna(0).astype(int)
+    index = pd.MultiIndex.from_frame(keys)
+    if unique and index.has_duplicates:
+        raise ValueError(f"Duplicate candidate rows in the results: {list(index[index.duplicated()][:5])}")
+    return index
+
+
+def diff_results(old_frame, new_frame, timestamp):
+    """Per-candidate vote changes between two scrapes of the same constituency pages.
+
+    Candidates that appear for the first time are reported with their full vote count as the change.
+    """
+    new_frame = numeric_votes(new_frame)
+    new_frame['Party'] = new_frame['Party'].fillna('')
+    if old_frame is None or old_frame.empty:
+        merged = new_frame.assign(**{'Vote Change': new_frame['Total Votes']})
+    else:
+        old_votes = numeric_votes(old_frame)['Total Votes'].set_axis(candidate_index(old_frame))
+        previous = old_votes.reindex(candidate_index(new_frame)).to_numpy(dtype=float)
+        merged = new_frame.assign(**{'Vote Change': new_frame['Total Votes'] - np.nan_to_num(previous).astype(int)})
+        merged = merged[np.isnan(previous) | (merged['Vote Change'] != 0).to_numpy()]
+    return merged.assign(Timestamp=timestamp)[delta_columns]
+
+
+def apply_deltas(results, deltas):
+    """Bring a scraped results frame up to date with rows from the delta log, without re-reading all pages.
+
+    Only the latest delta per candidate matters, as each delta row carries the candidate's new vote totals. In the
+    constituencies with updates, the Total rows and '% of Votes' are recalculated from the new votes, as on the pages.
+    """
+    latest = deltas.sort_values('Timestamp', kind='stable')
+    latest = latest[~candidate_index(latest, unique=False).duplicated(keep='last')]
+    latest_votes = latest[vote_columns].set_axis(candidate_index(latest))
+
+    results = numeric_votes(results)
+    key = candidate_index(results)
+    updated = latest_votes.reindex(key)
+    has_update = updated['Total Votes'].notna().to_numpy()
+    for col in vote_columns:
+        results.loc[has_update, col] = updated[col].to_numpy()[has_update].astype(int)
+
+    # Candidates that weren't in the results yet (e.g. a page that only just started reporting)
+    is_new = ~latest_votes.index.isin(key)
+    new_rows = latest.loc[is_new, [col for col in latest.columns if col in results.columns]]
+    results = pd.concat([results, new_rows], ignore_index=True) if len(new_rows) else results
+    return recalculate_totals(results, latest[page_key].drop_duplicates())
+
+
+def recalculate_totals(results, pages):
+    """Total rows (sums of the candidate rows) and '% of Votes' of the given pages, from the candidates' votes."""
+    on_page = pd.MultiIndex.from_frame(results[page_key]).isin(pd.MultiIndex.from_frame(pages))
+    is_total = results['Candidate'].str.strip().str.upper() == 'TOTAL'
+    sums = results[on_page & ~is_total].groupby(page_key)[vote_columns].sum()
+    page_rows = pd.MultiIndex.from_frame(results[page_key])
+    totals = sums.reindex(page_rows)
+    recalculated = on_page & is_total & totals['Total Votes'].notna().to_numpy()
+    for col in vote_columns:
+        results.loc[recalculated, col] = totals[col].to_numpy()[recalculated].astype(int)
+
+    # Shares to 2 d.p., as ECI shows them (none where no votes were cast, e.g. uncontested Surat)
+    votes_cast = results[is_total].set_index(page_key)['Total Votes'].reindex(page_rows).to_numpy(dtype=float)
+    shares = results['Total Votes'].to_numpy(dtype=float) / np.where(votes_cast > 0, votes_cast, np.nan) * 100
+    has_share = on_page & ~is_total
+    results['% of Votes'] = results['% of Votes'].astype(object)
+    results.loc[has_share, '% of Votes'] = np.round(shares[has_share], 2)
+    return results
+
+
+class LivePoller:
+    """Keeps the latest parsed frame per constituency page and polls for changes."""
+
+    def __init__(self, valid_urls_df, cache, delta_log_path, concurrency=16, rate=10.0, session=None):
+        self.rows = list(valid_urls_df[['url', 'state_code', 'constituency_number']]
+                         .itertuples(index=False, name=None))
+        self.cache = cache
+        self.delta_log_path = delta_log_path
+        self.concurrency = concurrency
+        self.session = session or eci_scraper.make_session(concurrency)
+        self.limiter = eci_scraper.RateLimiter(rate)
+        self.frames = {}  # url -> latest parsed frame
+
+    def poll_page(self, row):
+        """Revalidate one page; returns (row, html, changed). Only changed pages need re-parsing."""
+        url = row[0]
+        try:
+            html, changed = eci_scraper.fetch_cached(self.session, url, self.cache, self.limiter)
+        except Exception as e:
+            print(f"Error polling {url}: {e}")
+            return row, None, False
+        return row, html, changed or url not in self.frames
+
+    def update_pages(self, changed, timestamp):
+        """Re-parse changed pages, given as (row, html) pairs, and return their delta rows.
+
+        The diff against the previous version is done for all changed pages in one go rather than page by page.
+        """
+        old_frames, new_frames = [], []
+        for (url, state_code, constituency_number), html in changed:
+            parsed = parse_constituency_page(html)
+            if parsed is None:
+                print(f"No results table in {url}")
+                continue
+            frame = page_frame(parsed, state_code, constituency_number)
+            if url in self.frames:
+                old_frames.append(self.frames[url])
+            new_frames.append(frame)
+            self.frames[url] = frame
+        if not new_frames:
+            return pd.DataFrame(columns=delta_columns)
+        old_frame = pd.concat(old_frames, ignore_index=True) if old_frames else None
+        return diff_results(old_frame, pd.concat(new_frames, ignore_index=True), timestamp)
+
+    def poll_rows(self, rows):
+        """One polling round over the given pages; returns the delta rows and appends them to the log."""
+        deltas, _ = self._poll_round(rows)
+        return deltas
+
+    def _poll_round(self, rows):
+        # Returns the delta rows plus (row, html, changed) for every page polled
+        timestamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            polled = list(executor.map(self.poll_page, rows))
+
+        deltas = self.update_pages([(row, html) for row, html, changed in polled if changed and html], timestamp)
+        self.append_deltas(deltas)
+        return deltas, polled
+
+    def poll_once(self):
+        return self.poll_rows(self.rows)
+
+    def append_deltas(self, deltas):
+        # Append-only log: write the header only when the file is first created
+        if deltas.empty:
+            return
+        write_header = not self.delta_log_path.exists()
+        deltas.to_csv(self.delta_log_path, mode='a', header=write_header, index=False)
+
+    def results(self):
+        """Current full results frame, in the same shape and order as election_results.csv."""
+        frames = [self.frames[url] for url, _, _ in self.rows if url in self.frames]
+        return pd.concat(frames, ignore_index=True)
+
+    def run(self, interval=60, rounds=None, snapshot_path=None):
+        """Poll every `interval` seconds, for `rounds` rounds (forever if None)."""
+        round_number = 0
+        while rounds is None or round_number < rounds:
+            started = time.monotonic()
+            deltas = self.poll_once()
+            changed_pages = deltas['Constituency'].nunique()
+            print(f"Round {round_number + 1}: {changed_pages} pages changed, {len(deltas)} candidate updates")
+            if snapshot_path is not None and changed_pages:
+                self.results().to_csv(snapshot_path, index=False)
+            round_number += 1
+            if rounds is None or round_number < rounds:
+                time.sleep(max(0, interval - (time.monotonic() - started)))
+
+    def run_adaptive(self, scheduler, snapshot_path=None, report_every=60):
+        """Poll under a PollScheduler until every seat is declared, instead of flat rounds over all pages."""
+        rows_by_url = {row[0]: row for row in self.rows}
+        last_report = time.monotonic()
+        while not scheduler.all_finished():
+            urls = scheduler.due()
+            if not urls:
+                time.sleep(min(1.0, max(0.1, scheduler.seconds_until_next())))
+                continue
+
+            deltas, polled = self._poll_round([rows_by_url[url] for url in urls])
+            for (url, _, _), html, changed in polled:
+                finished = html is not None and poll_scheduler.declared_marker in html
+                scheduler.record(url, self.frames.get(url), changed=changed, finished=finished)
+            if snapshot_path is not None and not deltas.empty:
+                self.results().to_csv(snapshot_path, index=False)
+
+            if time.monotonic() - last_report >= report_every:
+                stats = scheduler.stats()
+                print(f"{stats['queue_depth']} pages overdue, mean staleness {stats['mean_staleness']:.0f}s "
+                      f"(max {stats['max_staleness']:.0f}s), {stats['finished']} seats declared")
+                last_report = time.monotonic()
@@ -0,0 +1,95 @@
+# Batch rendering of static maps across a process pool
+# A map spec is a dict naming one figure, e.g.
+#   {"name": "bjp_vote_share_2024", "title": "...", "year": 2024, "view": "BHARATIYA JANATA PARTY", "colors": [...]}
+#   {"name": "nda_swing_2019_2024", "title": "...", "swing": [(2019, "NDA"), (2024, "NDA")], "scale": 300000}
+# with optional "state" (crop to one state), "formats" (default ["png"]), "dpi" and "figsize". Vote share maps take
+# one party/alliance view of a year's results matrix (constituency_tables.py); swing maps take the difference between
+# two (year, view) pairs, so any party/alliance and pair of years.
+# Each worker process loads the geometry cache, basemap and results matrices once (init_worker) and renders its share
+# of the specs with the static_maps renderers. Files are named after the spec and written without timestamps, so
+# re-rendering the same specs gives the same files whichever worker draws them.
+
+# Load packages
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+import matplotlib.pyplot as plt
+
+from constituency_tables import ResultsMatrix
+from geometry_cache import load_points
+from static_maps import Basemap, swing_arrow_map, vote_share_map
+
+default_formats = ["png"]
+default_dpi = 300
+
+# Per-process state, set once by init_worker
+_worker = {}
+
+
+def init_worker(matrix_paths, level="full"):
+    """Load everything the renderers share: basemap, centroids and results matrices ({year: path})."""
+    matplotlib.rcParams["svg.hashsalt"] = "election-maps"  # Fixed SVG element ids
+    _worker["basemap"] = Basemap.from_cache(level)
+    _worker["points"] = load_points()
+    _worker["matrices"] = {year: ResultsMatrix.load(path) for year, path in matrix_paths.items()}
+
+
+def init_pool_worker(matrix_paths, level="full"):
+    matplotlib.use("Agg")  # Worker processes only write files
+    init_worker(matrix_paths, level)
+
+
+def spec_values(spec):
+    """Vote shares (or swings) by Constituency ID for a spec."""
+    matrices = _worker["matrices"]
+    if "swing" in spec:
+        (before_year, before_view), (after_year, after_view) = spec["swing"]
+        return matrices[after_year][after_view] - matrices[before_year][before_view]
+    return matrices[spec["year"]][spec["view"]]
+
+
+def render_map(spec, output_dir):
+    """Render one spec to output_dir/<name>.<format> for each format; returns the paths written."""
+    fig, ax = plt.subplots(1, 1, figsize=spec.get("figsize", (12, 12) if "swing" in spec else (8, 8)))
+    values = spec_values(spec)
+    if "swing" in spec:
+        swing_arrow_map(values, _worker["basemap"], _worker["points"], title=spec.get("title"), ax=ax,
+                        scale=spec.get("scale", 300000))
+    else:
+        vote_share_map(values, _worker["basemap"], colors=spec.get("colors", ('#FFEB99', '#FF6600')),
+                       title=spec.get("title"), ax=ax)
+    if spec.get("state"):
+        _worker["basemap"].crop(ax, spec["state"])
+
+    paths = []
+    for file_format in spec.get("formats", default_formats):
+        path = Path(output_dir) / f"{spec['name']}.{file_format}"
+        # No creation date or software version in the files
+        metadata = {"Date": None} if file_format in ("svg", "pdf") else {"Software": None}
+        fig.savefig(path, dpi=spec.get("dpi", default_dpi), bbox_inches="tight", metadata=metadata)
+        paths.append(path)
+    plt.close(fig)
+    return paths
+
+
+def render_maps(specs, output_dir, matrix_paths, workers=None, level="full"):
+    """Render all specs across a pool of worker processes (one per CPU by default); returns paths in spec order.
+
+    With workers=1 the specs are rendered in this process, without a pool.
+    """
+    names = [spec["name"] for spec in specs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Map specs need unique names: {duplicates}")
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    workers = min(workers or os.cpu_count() or 1, len(specs)) or 1
+    if workers == 1:
+        init_worker(matrix_paths, level)
+        return [render_map(spec, output_dir) for spec in specs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_pool_worker,
+                             initargs=(matrix_paths, level)) as executor:
+        # map() keeps the results in spec order
+        return list(executor.map(render_map, specs, [output_dir] * len(specs)))
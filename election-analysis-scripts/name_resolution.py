@@ -0,0 +1,172 @@
+# Canonical names and stable integer IDs for states and parliamentary constituencies
+# Replaces the hand-maintained *_corrected_state_names / *_corrected_constituency_names dicts in the analysis scripts.
+# - election-data/constituencies.csv: one row per constituency (ID, canonical state, canonical constituency name)
+# - election-data/name_aliases.csv: known alternative spellings (e.g. GAUHATI -> GUWAHATI, ORISSA -> ODISHA)
+# Names are normalised (case, spacing around hyphens, & vs AND, (SC)/(ST) tags) before lookup; names that still
+# don't match are tried against a trigram index with an edit-distance check. Whole columns are resolved at once by
+# resolving each distinct (state, constituency) pair only once.
+
+# Load packages
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Define paths to the canonical name tables
+election_data_path = Path(__file__).resolve().parent.parent / "election-data"
+constituencies_path = election_data_path / "constituencies.csv"
+aliases_path = election_data_path / "name_aliases.csv"
+
+
+def normalise_name(name):
+    """Canonical formatting: upper case, '&' as AND, no (SC)/(ST) tags, no spaces around hyphens."""
+    if not isinstance(name, str):
+        return None
+    name = name.upper().replace("&", " AND ")
+    name = re.sub(r"\((SC|ST|GEN)\)", " ", name)
+    name = re.sub(r"\s*-\s*", "-", name)
+    name = re.sub(r"\s+", " ", name).strip(" -")
+    return name or None
+
+
+def match_key(name):
+    """Looser key used for lookups: hyphens and punctuation count as spaces (MUMBAI NORTH CENTRAL = NORTH-CENTRAL)."""
+    name = normalise_name(name)
+    if name is None:
+        return None
+    return re.sub(r"\s+", " ", re.sub(r"[^A-Z0-9 ]", " ", name)).strip()
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Approximate string lookup: candidates share trigrams with the query, then are ranked by edit similarity."""
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.postings = defaultdict(set)
+        for position, key in enumerate(self.keys):
+            for gram in trigrams(key):
+                self.postings[gram].add(position)
+
+    def best_match(self, key, min_similarity=0.8, min_lead=0.05, restrict_to=None):
+        """Closest key with similarity >= min_similarity that beats the runner-up by min_lead, else None."""
+        counts = defaultdict(int)
+        for gram in trigrams(key):
+            for position in self.postings.get(gram, ()):
+                if restrict_to is None or position in restrict_to:
+                    counts[position] += 1
+        # Only compute edit similarity for the candidates sharing the most trigrams
+        candidates = sorted(counts, key=counts.get, reverse=True)[:10]
+        scored = sorted(((SequenceMatcher(None, key, self.keys[position]).ratio(), position)
+                         for position in candidates), reverse=True)
+        if not scored or scored[0][0] < min_similarity:
+            return None
+        if len(scored) > 1 and scored[0][0] - scored[1][0] < min_lead:
+            return None
+        return scored[0][1]
+
+
+class NameIndex:
+    """Resolves state and constituency names from any source to canonical names and constituency IDs."""
+
+    def __init__(self, constituencies, aliases, min_similarity=0.8):
+        self.constituencies = constituencies.set_index('constituency_id').sort_index()
+        self.min_similarity = min_similarity
+
+        # Canonical states, plus aliases, keyed by match key
+        self.states = {match_key(state): state for state in self.constituencies['state'].unique()}
+        state_aliases = aliases[aliases['kind'] == 'state']
+        for alias, canonical in zip(state_aliases['alias'], state_aliases['canonical']):
+            self.states[match_key(alias)] = canonical
+        self.state_index = TrigramIndex(self.states)
+        self.state_values = list(self.states.values())
+
+        # Constituency aliases, optionally scoped to a (canonical) state
+        self.constituency_aliases = {}
+        constituency_aliases = aliases[aliases['kind'] == 'constituency']
+        for state, alias, canonical in zip(constituency_aliases['state'].fillna(''), constituency_aliases['alias'],
+                                           constituency_aliases['canonical']):
+            self.constituency_aliases[(state, match_key(alias))] = match_key(canonical)
+
+        # Exact lookups by (state, name) and by name alone (for seats that moved state, e.g. Ladakh)
+        keys = [match_key(name) for name in self.constituencies['constituency']]
+        self.by_state_and_name = dict(zip(zip(self.constituencies['state'], keys), self.constituencies.index))
+        self.by_name = defaultdict(list)
+        for key, constituency_id in zip(keys, self.constituencies.index):
+            self.by_name[key].append(constituency_id)
+
+        # Fuzzy lookups, restricted to the right state where we know it
+        self.trigram_index = TrigramIndex(keys)
+        self.ids_by_position = np.asarray(self.constituencies.index)
+        self.positions_by_state = defaultdict(set)
+        for position, state in enumerate(self.constituencies['state']):
+            self.positions_by_state[state].add(position)
+
+    @classmethod
+    def load(cls, constituencies_path=constituencies_path, aliases_path=aliases_path, **kwargs):
+        return cls(pd.read_csv(constituencies_path), pd.read_csv(aliases_path), **kwargs)
+
+    def resolve_state(self, name):
+        """Canonical state name, or None."""
+        key = match_key(name)
+        if key is None:
+            return None
+        if key in self.states:
+            return self.states[key]
+        position = self.state_index.best_match(key, self.min_similarity)
+        return None if position is None else self.state_values[position]
+
+    def resolve_constituency(self, state, name):
+        """Constituency ID for a (state, constituency) pair from any source, or None."""
+        key = match_key(name)
+        if key is None:
+            return None
+        state = self.resolve_state(state) if state is not None else None
+        key = self.constituency_aliases.get((state or '', key), self.constituency_aliases.get(('', key), key))
+
+        if (state, key) in self.by_state_and_name:
+            return self.by_state_and_name[(state, key)]
+        if len(self.by_name.get(key, [])) == 1:  # Unique name nationally: the seat is listed under another state
+            return self.by_name[key][0]
+        position = self.trigram_index.best_match(key, self.min_similarity,
+                                                 restrict_to=self.positions_by_state.get(state))
+        return None if position is None else self.ids_by_position[position]
+
+    def resolve_states(self, states):
+        """Canonical state names for a whole column (each distinct name is resolved once)."""
+        codes, uniques = pd.factorize(pd.Series(states), use_na_sentinel=True)
+        resolved = np.array([self.resolve_state(name) for name in uniques] + [None], dtype=object)
+        return pd.Series(resolved[codes], index=getattr(states, 'index', None))
+
+    def resolve_constituencies(self, states, constituencies):
+        """Constituency IDs (nullable ints) for whole state and constituency columns.
+
+        Each distinct (state, constituency) pair is resolved once and the IDs are broadcast back to all rows.
+        """
+        pairs = pd.MultiIndex.from_arrays([pd.Series(states).to_numpy(), pd.Series(constituencies).to_numpy()])
+        codes, uniques = pd.factorize(pairs)
+        resolved = [self.resolve_constituency(state, name) for state, name in uniques]
+        ids = pd.array(resolved + [None], dtype="Int64")
+        return pd.Series(ids[codes], index=getattr(constituencies, 'index', None), name='Constituency ID')
+
+    def state_names(self, constituency_ids):
+        """Canonical state names for a column of constituency IDs."""
+        return pd.Series(constituency_ids).map(self.constituencies['state'])
+
+    def constituency_names(self, constituency_ids):
+        """Canonical constituency names for a column of constituency IDs."""
+        return pd.Series(constituency_ids).map(self.constituencies['constituency'])
+
+    def unresolved(self, states, constituencies):
+        """Distinct (state, constituency) pairs that don't resolve, to add to the alias table."""
+        pairs = pd.DataFrame({'State': pd.Series(states).to_numpy(),
+                              'Constituency': pd.Series(constituencies).to_numpy()}).drop_duplicates()
+        ids = self.resolve_constituencies(pairs['State'], pairs['Constituency'])
+        return pairs[ids.isna().to_numpy()].reset_index(drop=True)
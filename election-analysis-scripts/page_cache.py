@@ -0,0 +1,97 @@
+# On-disk cache of raw ECI result pages
+# Pages are stored gzip-compressed and content-addressed (file name = SHA-256 of the HTML), with an index mapping each
+# URL to its current content hash plus the ETag/Last-Modified headers the server sent. This lets the scraper:
+# - send conditional requests and skip pages that haven't changed,
+# - resume after a crash without re-downloading pages it already has,
+# - re-parse everything offline from the archive after a parser fix.
+
+# Load packages
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+def content_hash(html):
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    """Content-addressed store of raw HTML pages, keyed by URL."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.pages_dir = self.cache_dir / "pages"
+        self.index_path = self.cache_dir / "index.json"
+        self.pages_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.index = json.loads(self.index_path.read_text()) if self.index_path.exists() else {}
+
+    def __contains__(self, url):
+        return url in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def urls(self):
+        return list(self.index)
+
+    def entry(self, url):
+        """Index entry for a URL: content_hash, etag, last_modified, fetched_at. None if not cached."""
+        return self.index.get(url)
+
+    def _page_path(self, digest):
+        return self.pages_dir / digest[:2] / f"{digest}.html.gz"
+
+    def get(self, url):
+        """Cached HTML for a URL, or None."""
+        entry = self.index.get(url)
+        if entry is None:
+            return None
+        with gzip.open(self._page_path(entry["content_hash"]), "rt", encoding="utf-8") as f:
+            return f.read()
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since headers for revalidating a cached page."""
+        entry = self.index.get(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, html, etag=None, last_modified=None):
+        """Save a page and return True if its content differs from the previously cached version."""
+        digest = content_hash(html)
+        path = self._page_path(digest)
+        # Identical pages (from any URL) share one file; only write content we haven't seen before
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                f.write(html)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            previous = self.index.get(url)
+            self.index[url] = {"content_hash": digest, "etag": etag, "last_modified": last_modified,
+                               "fetched_at": time.time()}
+            self._save_index()
+        return previous is None or previous["content_hash"] != digest
+
+    def touch(self, url):
+        """Record that a cached page was revalidated (e.g. a 304 response)."""
+        with self._lock:
+            if url in self.index:
+                self.index[url]["fetched_at"] = time.time()
+                self._save_index()
+
+    def _save_index(self):
+        # Write-then-rename so a crash mid-write never leaves a corrupt index
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(self.index))
+        os.replace(tmp_path, self.index_path)
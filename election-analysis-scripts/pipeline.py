@@ -0,0 +1,300 @@
+# Incremental build pipeline: one entry point that runs the scripts producing datasets and maps, in dependency order
+# Each stage is a script or notebook with declared data inputs and outputs (paths relative to the repository root;
+# notebooks are executed top to bottom with jupyter nbconvert, without saving their outputs). Stages are
+# linked by their files: a stage depends on the stages whose outputs it reads. A stage is skipped when its outputs
+# exist and are unchanged since its last run, and the content hash of its code - the script plus every local module it
+# imports, directly or indirectly - and of its inputs matches that run. So editing alliance_config.py re-runs only the
+# stages that import it (the 2019 and 2024 analyses); later stages re-run only if the results matrices they read
+# actually changed. Stages whose dependencies are done run in parallel, each in its own Python process.
+# Hashes of the last successful runs are kept in .pipeline-state.json at the repository root.
+#
+# Usage, from election-analysis-scripts:
+#   python pipeline.py                       # Bring all default stages up to date
+#   python pipeline.py static-maps           # One stage, plus whatever it depends on
+#   python pipeline.py --dry-run             # Show what would run
+#   python pipeline.py --force ingest        # Re-run a stage even if up to date
+#   python pipeline.py scrape                # The scraper only runs when asked for
+
+# Load packages
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+scripts_path = Path(__file__).resolve().parent
+base_path = scripts_path.parent
+state_path = base_path / ".pipeline-state.json"
+
+# Stages: script, data inputs, outputs. "default": False stages only run when named (or forced)
+stages = {
+    "scrape": {
+        "script": "scrape india 2024 election results.py",
+        "inputs": [],
+        "outputs": ["election-data/valid_urls.csv", "election-data/election_results.csv"],
+        "default": False,
+    },
+    "ingest": {
+        "script": "ingest election results.py",
+        "inputs": ["election-data/election_results.csv",
+                   "election-data/eci-data/33. Constituency Wise Detailed Result.xlsx",
+                   "election-data/live_deltas.csv", "election-data/constituencies.csv",
+                   "election-data/name_aliases.csv"],
+        "outputs": ["election-data/results-store"],
+    },
+    "geometry": {
+        "script": "build geometry cache.py",
+        "inputs": ["raw-map-data/parliamentary-constituencies",
+                   "election-data/constituencies.csv", "election-data/name_aliases.csv"],
+        "outputs": ["geo-datasets/constituency_geometry.parquet", "geo-datasets/state_outlines.parquet"],
+    },
+    "analyse-2019": {
+        "script": "india 2019 election results.py",
+        "inputs": ["election-data/results-store", "election-data/cleaning_overrides.csv",
+                   "election-data/constituencies.csv", "election-data/name_aliases.csv",
+                   "geo-datasets/constituency_geometry.parquet"],
+        "outputs": ["geo-datasets/results_matrix_2019.parquet",
+                    "interactive-map-outputs/bjp_vote_share_map_step_colour_2019.html",
+                    "interactive-map-outputs/congress_vote_share_map_step_colour_2019.html",
+                    "interactive-map-outputs/nda_vote_share_map_step_colour_2019.html"],
+    },
+    "analyse-2024": {
+        "script": "analyse india 2024 results.py",
+        "inputs": ["election-data/results-store", "election-data/constituencies.csv",
+                   "election-data/name_aliases.csv", "geo-datasets/constituency_geometry.parquet"],
+        "outputs": ["geo-datasets/results_matrix_2024.parquet",
+                    "interactive-map-outputs/bjp_vote_share_map_2024.html",
+                    "interactive-map-outputs/congress_vote_share_map_2024.html",
+                    "interactive-map-outputs/nda_vote_share_map_2024.html"],
+    },
+    "vote-share-map": {
+        "script": "build vote share map.py",
+        "inputs": ["geo-datasets/constituency_geometry.parquet", "geo-datasets/results_matrix_2019.parquet",
+                   "geo-datasets/results_matrix_2024.parquet"],
+        "outputs": ["interactive-map-outputs/vote_share_map.html"],
+    },
+    "static-maps": {
+        "script": "render static maps.py",
+        "inputs": ["geo-datasets/constituency_geometry.parquet", "geo-datasets/state_outlines.parquet",
+                   "geo-datasets/results_matrix_2019.parquet", "geo-datasets/results_matrix_2024.parquet"],
+        "outputs": ["static-map-outputs"],
+    },
+    "compare": {
+        "script": "compare 2019 and 2024 election results.ipynb",
+        "inputs": ["election-data/results-store", "election-data/party_names.csv",
+                   "geo-datasets/constituency_geometry.parquet", "geo-datasets/state_outlines.parquet",
+                   "geo-datasets/results_matrix_2019.parquet", "geo-datasets/results_matrix_2024.parquet"],
+        "outputs": ["geo-datasets/geo_nda_compare.geojson", "geo-datasets/geo_nda_compare_nomiss.geojson",
+                    "interactive-map-outputs/nda_vote_swing_map.html",
+                    "interactive-map-outputs/nda_vote_swing_arrows_tooltip_map.html",
+                    "interactive-map-outputs/nda_vote_swing_arrows_map_v2.html",
+                    "interactive-map-outputs/nda_vote_swing_arrows_map_rotation_2.html",
+                    "election-analysis-scripts/bjp_vote_swing_arrows_map.png"],
+    },
+}
+
+
+def script_source(path):
+    """Python source of a script, or of a notebook's code cells (without IPython magics and shell commands)."""
+    if path.suffix != ".ipynb":
+        return path.read_text(encoding="utf-8")
+    cells = json.loads(path.read_text(encoding="utf-8"))["cells"]
+    return "\n".join(line for cell in cells if cell["cell_type"] == "code"
+                     for line in "".join(cell["source"]).splitlines() if not line.lstrip().startswith(("%", "!")))
+
+
+def local_imports(script, seen=None):
+    """The script plus every module in election-analysis-scripts it imports, directly or indirectly."""
+    seen = set() if seen is None else seen
+    path = scripts_path / script
+    if path in seen:
+        return seen
+    seen.add(path)
+    for node in ast.walk(ast.parse(script_source(path))):
+        names = [alias.name for alias in node.names] if isinstance(node, ast.Import) else (
+            [node.module] if isinstance(node, ast.ImportFrom) and node.module and not node.level else [])
+        for name in names:
+            module = scripts_path / f"{name.split('.')[0]}.py"
+            if module.exists():
+                local_imports(module.name, seen)
+    return seen
+
+
+def files_under(path):
+    """The file itself, or every file under a directory (sorted, so hashes don't depend on listing order)."""
+    if path.is_dir():
+        return sorted(child for child in path.rglob("*") if child.is_file())
+    return [path] if path.exists() else []
+
+
+class FileHashes:
+    """Content hashes of files, re-hashed only when a file's size or modification time changes."""
+
+    def __init__(self, known=None):
+        self.known = known or {}
+
+    def file(self, path):
+        stat = path.stat()
+        key = str(path.relative_to(base_path))
+        entry = self.known.get(key)
+        if entry is None or entry[:2] != [stat.st_size, stat.st_mtime_ns]:
+            digest = hashlib.sha256()
+            with open(path, "rb") as file:
+                for block in iter(lambda: file.read(1 << 20), b""):
+                    digest.update(block)
+            entry = self.known[key] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return entry[2]
+
+    def tree(self, relative_path):
+        """Hash of a file or directory (paths and contents); None if it doesn't exist."""
+        path = base_path / relative_path
+        files = files_under(path)
+        if not files:
+            return None
+        digest = hashlib.sha256()
+        for file in files:
+            digest.update(f"{file.relative_to(base_path)}\0{self.file(file)}\0".encode())
+        return digest.hexdigest()
+
+
+def dependencies(stages=stages):
+    """Stages each stage depends on: those with an output that is, or contains, one of its inputs."""
+    def produces(output, input_path):
+        return input_path == output or input_path.startswith(output.rstrip("/") + "/")
+    return {name: sorted(other for other, upstream in stages.items() if other != name
+                         and any(produces(output, input_path)
+                                 for output in upstream["outputs"] for input_path in stage["inputs"]))
+            for name, stage in stages.items()}
+
+
+def selected_stages(targets, stages=stages):
+    """Targets (default: all default stages) plus everything they depend on, in dependency order."""
+    needs = dependencies(stages)
+    targets = targets or [name for name, stage in stages.items() if stage.get("default", True)]
+    unknown = sorted(set(targets) - set(stages))
+    if unknown:
+        raise ValueError(f"Unknown stages {unknown}; choose from {list(stages)}")
+    order, visiting = [], set()
+
+    def visit(name):
+        if name in order:
+            return
+        if name in visiting:
+            raise ValueError(f"Stage {name!r} depends on itself")
+        visiting.add(name)
+        for upstream in needs[name]:
+            # Opt-in stages (the scraper) are only run when named; otherwise their outputs are treated as inputs
+            if stages[upstream].get("default", True) or upstream in targets:
+                visit(upstream)
+        order.append(name)
+
+    for name in targets:
+        visit(name)
+    return order, {name: [upstream for upstream in needs[name] if upstream in order] for name in order}
+
+
+def stage_stamp(name, hashes, stages=stages):
+    """Hash of a stage's definition, code and inputs."""
+    stage = stages[name]
+    digest = hashlib.sha256(json.dumps(stage, sort_keys=True).encode())
+    for path in sorted(local_imports(stage["script"])):
+        digest.update(f"{path.name}\0{hashes.file(path)}\0".encode())
+    for input_path in stage["inputs"]:
+        digest.update(f"{input_path}\0{hashes.tree(input_path)}\0".encode())
+    return digest.hexdigest()
+
+
+def up_to_date(name, stamp, state, hashes, stages=stages):
+    last = state.get("stages", {}).get(name)
+    return (last is not None and last["stamp"] == stamp
+            and all(hashes.tree(output) is not None and hashes.tree(output) == last["outputs"].get(output)
+                    for output in stages[name]["outputs"]))
+
+
+def run_script(name, stages=stages):
+    """Run a stage's script in its own Python process, from election-analysis-scripts; returns (exit code, log)."""
+    env = {**os.environ, "MPLBACKEND": "Agg", "PYTHONPATH": str(scripts_path)}
+    script = stages[name]["script"]
+    if script.endswith(".ipynb"):
+        # The executed notebook goes to stdout and is dropped, so the notebook file (part of the stamp) is unchanged
+        completed = subprocess.run([sys.executable, "-m", "jupyter", "nbconvert", "--to", "notebook", "--execute",
+                                    "--stdout", script], cwd=scripts_path, env=env, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE, text=True)
+        return completed.returncode, completed.stderr
+    completed = subprocess.run([sys.executable, script], cwd=scripts_path, env=env, capture_output=True, text=True)
+    return completed.returncode, completed.stdout + completed.stderr
+
+
+def run_pipeline(targets=None, force=(), dry_run=False, workers=None, stages=stages):
+    """Bring the target stages up to date; returns {stage: "skipped" | "ran" | "failed" | "blocked" | "would run"}.
+
+    Stages in `force` run even if up to date; stages downstream of them re-run only if their outputs change.
+    """
+    order, needs = selected_stages(targets, stages)
+    state = json.loads(state_path.read_text()) if state_path.exists() else {}
+    hashes = FileHashes(state.get("files"))
+    status, running = {}, {}
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        while len(status) < len(order):
+            for name in order:
+                if name in status or name in running:
+                    continue
+                if any(status.get(upstream) in ("failed", "blocked", "would run") for upstream in needs[name]):
+                    status[name] = "blocked" if not dry_run else "would run"
+                    print(f"{name}: {status[name]}")
+                    continue
+                if not all(status.get(upstream) in ("skipped", "ran") for upstream in needs[name]):
+                    continue
+                # Stamps are taken once upstream stages have finished, so they hash the new upstream outputs
+                stamp = stage_stamp(name, hashes, stages)
+                if name not in force and up_to_date(name, stamp, state, hashes, stages):
+                    status[name] = "skipped"
+                    print(f"{name}: up to date")
+                elif dry_run:
+                    status[name] = "would run"
+                    print(f"{name}: would run")
+                else:
+                    print(f"{name}: running {stages[name]['script']}")
+                    running[name] = (executor.submit(run_script, name, stages), stamp, time.perf_counter())
+            if not running:
+                continue
+            done, _ = wait([future for future, _, _ in running.values()], return_when=FIRST_COMPLETED)
+            for name in [name for name, (future, _, _) in running.items() if future in done]:
+                future, stamp, started = running.pop(name)
+                returncode, log = future.result()
+                if returncode == 0:
+                    status[name] = "ran"
+                    # The stamp is re-taken: a stage's inputs may have been changed by a stage running alongside it
+                    state.setdefault("stages", {})[name] = {
+                        "stamp": stage_stamp(name, hashes, stages),
+                        "outputs": {output: hashes.tree(output) for output in stages[name]["outputs"]}}
+                    print(f"{name}: done in {time.perf_counter() - started:.1f}s")
+                else:
+                    status[name] = "failed"
+                    state.get("stages", {}).pop(name, None)
+                    print(f"{name}: failed (exit code {returncode})\n{log[-3000:]}")
+
+    if not dry_run:
+        state["files"] = hashes.known
+        state_path.write_text(json.dumps(state, indent=1, sort_keys=True))
+    return status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bring election datasets and maps up to date.")
+    parser.add_argument("targets", nargs="*", help=f"stages to build (default: all but scrape): {', '.join(stages)}")
+    parser.add_argument("--force", nargs="*", default=[], help="stages to re-run even if up to date")
+    parser.add_argument("--dry-run", action="store_true", help="show what would run, without running it")
+    parser.add_argument("--workers", type=int, help="stages to run at once (default: one per CPU)")
+    arguments = parser.parse_args()
+    unknown = sorted(set(arguments.targets + arguments.force) - set(stages))
+    if unknown:
+        parser.error(f"unknown stages {unknown}")
+    results = run_pipeline(arguments.targets, set(arguments.force), arguments.dry_run, arguments.workers)
+    sys.exit(1 if any(result in ("failed", "blocked") for result in results.values()) else 0)
@@ -0,0 +1,114 @@
+# Adaptive polling scheduler for counting day
+# Gives each constituency URL its own refresh interval from live signals:
+# - the current winning margin (from the Total Votes column): close races are polled often, runaway leads rarely,
+# - how recently the page changed: pages that are still moving are polled sooner,
+# - whether counting is finished: declared seats are only checked occasionally.
+# All polling shares one global request budget; when more pages are due than the budget allows, the most urgent
+# (closest race, most overdue) go first. Queue depth and staleness are exposed so we can see how fresh our numbers are.
+
+# Load packages
+import heapq
+import time
+
+import pandas as pd
+
+# Text shown on a constituency page once its result has been declared
+declared_marker = "Result Declared"
+
+
+def winning_margin(frame):
+    """Lead of the first-placed over the second-placed candidate, as % of votes cast. None if not computable."""
+    votes = pd.to_numeric(frame['Total Votes'], errors='coerce')
+    is_total = frame['Candidate'].astype(str).str.strip().str.upper() == 'TOTAL'
+    candidate_votes = votes[~is_total].dropna()
+    total = votes[is_total].sum() if is_total.any() else candidate_votes.sum()
+    if len(candidate_votes) < 2 or not total:
+        return None
+    top_two = candidate_votes.nlargest(2).to_numpy()
+    return (top_two[0] - top_two[1]) / total * 100
+
+
+class PollScheduler:
+    """Decides which URLs to poll next, under a global budget of requests per minute."""
+
+    def __init__(self, urls, budget_per_minute=300, min_interval=15, max_interval=600, finished_interval=1800,
+                 safe_margin=10.0, recent_change_window=120, now=None):
+        now = time.monotonic() if now is None else now
+        self.budget_per_minute = budget_per_minute
+        self.min_interval = min_interval  # Seconds between polls of a tied race
+        self.max_interval = max_interval  # Seconds between polls of a seat led by safe_margin or more
+        self.finished_interval = finished_interval  # Seconds between polls of a declared seat
+        self.safe_margin = safe_margin  # Margin (% points) beyond which a seat is polled at max_interval
+        self.recent_change_window = recent_change_window  # A change within this many seconds halves the interval
+
+        self.state = {url: {"margin": None, "last_polled": None, "last_changed": None, "finished": False,
+                            "next_due": now} for url in urls}
+        self.queue = [(now, 0.0, url) for url in urls]  # (due time, margin tie-break, url)
+        heapq.heapify(self.queue)
+        self.tokens = budget_per_minute / 60.0  # Start with one second's worth of budget
+        self.last_refill = now
+        self.created = now
+
+    def interval(self, url, now):
+        """Seconds until the next poll of url, from its current margin, recent changes and finished status."""
+        state = self.state[url]
+        if state["finished"]:
+            return self.finished_interval
+        if state["margin"] is None:  # Counting hasn't started, or page not parsed yet: poll eagerly
+            return self.min_interval
+        closeness = min(state["margin"] / self.safe_margin, 1.0)
+        interval = self.min_interval + (self.max_interval - self.min_interval) * closeness
+        if state["last_changed"] is not None and now - state["last_changed"] < self.recent_change_window:
+            interval /= 2
+        return max(self.min_interval, interval)
+
+    def _refill(self, now):
+        # Token bucket over the whole scheduler; never bank more than one minute of budget
+        self.tokens = min(self.budget_per_minute,
+                          self.tokens + (now - self.last_refill) * self.budget_per_minute / 60.0)
+        self.last_refill = now
+
+    def due(self, now=None):
+        """URLs to poll now: those past their due time, most overdue first, capped by the remaining budget."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        urls = []
+        while self.queue and self.queue[0][0] <= now and self.tokens >= 1:
+            due_at, _, url = heapq.heappop(self.queue)
+            if due_at != self.state[url]["next_due"]:
+                continue  # Stale heap entry from an earlier reschedule
+            urls.append(url)
+            self.tokens -= 1
+        return urls
+
+    def record(self, url, frame=None, changed=False, finished=False, now=None):
+        """Update a URL's signals after polling it, and schedule its next poll."""
+        now = time.monotonic() if now is None else now
+        state = self.state[url]
+        state["last_polled"] = now
+        if changed:
+            state["last_changed"] = now
+        if frame is not None:
+            state["margin"] = winning_margin(frame)
+        state["finished"] = state["finished"] or finished
+        state["next_due"] = now + self.interval(url, now)
+        heapq.heappush(self.queue, (state["next_due"], state["margin"] or 0.0, url))
+
+    def all_finished(self):
+        return all(state["finished"] for state in self.state.values())
+
+    def seconds_until_next(self, now=None):
+        """How long until the next URL falls due (0 if some already are)."""
+        now = time.monotonic() if now is None else now
+        live_due = [state["next_due"] for state in self.state.values()]
+        return max(0.0, min(live_due) - now) if live_due else 0.0
+
+    def stats(self, now=None):
+        """Queue depth (URLs overdue right now) and staleness (seconds since each URL was last polled)."""
+        now = time.monotonic() if now is None else now
+        staleness = [now - (state["last_polled"] if state["last_polled"] is not None else self.created)
+                     for state in self.state.values()]
+        return {"queue_depth": sum(state["next_due"] <= now for state in self.state.values()),
+                "mean_staleness": sum(staleness) / len(staleness) if staleness else 0.0,
+                "max_staleness": max(staleness, default=0.0),
+                "finished": sum(state["finished"] for state in self.state.values())}
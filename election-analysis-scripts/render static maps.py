@@ -0,0 +1,41 @@
+# In this file: render the full set of static maps - vote shares for every party and alliance in 2019 and 2024, vote
+# swings between them, and state close-ups of the swings - across a process pool (see map_batch.py)
+# Uses the geometry cache (build geometry cache.py) and the results matrices saved by india 2019 election results.py
+# and analyse india 2024 results.py. Outputs go to static-map-outputs/, one file per map, named after the spec
+
+# Load packages
+from pathlib import Path
+from map_batch import render_maps
+
+# Set loc and define paths used to load and save data
+base_path = Path().resolve().parent
+matrix_paths = {year: base_path / f"geo-datasets/results_matrix_{year}.parquet" for year in [2019, 2024]}
+output_dir = base_path / "static-map-outputs"
+
+orange = ['#FFEB99', '#FF6600']  # Light to dark orange
+blue = ['#cff0fc', '#0384fc']  # Light to dark blue
+
+# Vote share maps: (name, title, year, results matrix view, colours)
+vote_shares = [
+    ("bjp", "BJP", {2019: "BJP", 2024: "BHARATIYA JANATA PARTY"}, orange),
+    ("congress", "Congress", {2019: "INC", 2024: "INDIAN NATIONAL CONGRESS"}, blue),
+    ("nda", "NDA", {2019: "NDA", 2024: "NDA"}, orange),
+    ("opposition", "UPA / I.N.D.I.A.", {2019: "UPA", 2024: "INDIA"}, blue),
+]
+specs = [{"name": f"{name}_vote_share_{year}", "title": f"Constituency-wise {label} Vote Share in {year} (%)",
+          "year": year, "view": view, "colors": colors}
+         for name, label, views, colors in vote_shares for year, view in views.items()]
+
+# Swing maps, 2019 to 2024, for India and close-ups of the largest states (shorter arrows)
+for name, label, views, _ in vote_shares:
+    swing = [(2019, views[2019]), (2024, views[2024])]
+    specs.append({"name": f"{name}_vote_swing_arrows_map", "title": f"{label} Vote Share Swing, 2024 vs 2019",
+                  "swing": swing})
+    for state in ["UTTAR PRADESH", "MAHARASHTRA", "WEST BENGAL", "BIHAR", "TAMIL NADU"]:
+        specs.append({"name": f"{name}_vote_swing_arrows_map_{state.lower().replace(' ', '_')}",
+                      "title": f"{label} Vote Share Swing in {state.title()}, 2024 vs 2019",
+                      "swing": swing, "state": state, "scale": 100000})
+
+# Render everything (one worker per CPU)
+paths = render_maps(specs, output_dir, matrix_paths)
+len(paths)  # 32 maps
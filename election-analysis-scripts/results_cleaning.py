@@ -0,0 +1,69 @@
+# Grouped cleaning steps for candidate-level results, vectorised over integer group codes
+# Replaces per-constituency Python callbacks (groupby().apply / transform(lambda ...)) in the 2019 pipeline, so the
+# same steps scale to assembly-constituency or booth-level data with many thousands of groups.
+# Hand fixes for individual constituencies/candidates live in election-data/cleaning_overrides.csv, not in code.
+
+# Load packages
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Define path to the override table
+overrides_path = Path(__file__).resolve().parent.parent / "election-data/cleaning_overrides.csv"
+
+
+def group_codes(frame, keys):
+    """Integer code per row for each distinct combination of the key columns (e.g. one per constituency)."""
+    return frame.groupby(keys, sort=False, observed=True, dropna=False).ngroup().to_numpy()
+
+
+def fill_forward_within_groups(values, codes):
+    """Forward-fill missing values using the previous row of the same group (in row order); never across groups."""
+    values = pd.Series(values).reset_index(drop=True)
+    return values.groupby(codes, sort=False).ffill().to_numpy()
+
+
+def infer_reservation_status(candidate_categories, codes):
+    """Constituency reservation status per row, from the categories of all its candidates.
+
+    GENERAL if any candidate is GENERAL, SC or ST if every candidate is, otherwise missing.
+    """
+    categories = np.asarray(candidate_categories, dtype=object)
+    n_groups = codes.max() + 1 if len(codes) else 0
+    group_size = np.bincount(codes, minlength=n_groups)
+    n_general, n_sc, n_st = (np.bincount(codes, weights=categories == category, minlength=n_groups)
+                             for category in ("GENERAL", "SC", "ST"))
+    status = np.select([n_general > 0, n_sc == group_size, n_st == group_size], ["GENERAL", "SC", "ST"], default="")
+    status = np.where(status == "", None, status.astype(object))
+    return status[codes]
+
+
+def load_overrides(year, path=overrides_path):
+    overrides = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return overrides[overrides['year'] == str(year)].reset_index(drop=True)
+
+
+def apply_overrides(frame, overrides, column):
+    """Set `column` for the rows each override matches (state and constituency, plus candidate if given)."""
+    frame = frame.copy()
+    for override in overrides[overrides['column'] == column].itertuples(index=False):
+        rows = (frame['State'] == override.state) & (frame['Constituency'] == override.constituency)
+        if override.candidate:
+            rows &= frame['Candidate'] == override.candidate
+        frame.loc[rows.to_numpy(), column] = override.value
+    return frame
+
+
+def clean_candidate_categories(frame, overrides, keys=("State", "Constituency")):
+    """Fill missing candidate categories (NOTA rows) from the previous candidate in the constituency, then overrides."""
+    codes = group_codes(frame, list(keys))
+    frame = frame.assign(**{"Candidate Category": fill_forward_within_groups(frame["Candidate Category"], codes)})
+    return apply_overrides(frame, overrides, "Candidate Category")
+
+
+def add_reservation_status(frame, overrides, keys=("State", "Constituency")):
+    """Add each constituency's "Reservation status" (inferred from candidate categories), then overrides."""
+    codes = group_codes(frame, list(keys))
+    frame = frame.assign(**{"Reservation status": infer_reservation_status(frame["Candidate Category"], codes)})
+    return apply_overrides(frame, overrides, "Reservation status")
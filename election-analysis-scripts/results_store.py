@@ -0,0 +1,156 @@
+# Columnar store of cleaned election results, so analysis runs don't re-parse the raw CSV/XLSX every time
+# The ingest step (ingest election results.py) cleans each election once and writes it here; analysis scripts read
+# back only the years, states and columns they need.
+# Layout: election-data/results-store/Year=<year>/State=<state>/*.parquet (hive partitioning, one row per candidate)
+# State, Constituency and Party are categorical; names are canonical and keyed by Constituency ID (name_resolution.py)
+
+# Load packages
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from name_resolution import NameIndex
+
+# Define path to the store
+store_path = Path(__file__).resolve().parent.parent / "election-data/results-store"
+
+# Columns of the store, and their types
+store_columns = ['Year', 'State', 'Constituency ID', 'Constituency', 'Candidate', 'Candidate Category', 'Party',
+                 'EVM Votes', 'Postal Votes', 'Total Votes', 'Total Votes Cast', 'Vote Share (%)']
+categorical_columns = ['State', 'Constituency', 'Party']
+int_columns = ['EVM Votes', 'Postal Votes', 'Total Votes', 'Total Votes Cast']
+partitioning = ds.partitioning(pa.schema([('Year', pa.int16()), ('State', pa.string())]), flavor="hive")
+store_schema = pa.schema([('Year', pa.int16()), ('State', pa.string()), ('Constituency ID', pa.int32()),
+                          ('Constituency', pa.dictionary(pa.int32(), pa.string())), ('Candidate', pa.string()),
+                          ('Candidate Category', pa.string()), ('Party', pa.dictionary(pa.int32(), pa.string())),
+                          *[(col, pa.int64()) for col in int_columns], ('Vote Share (%)', pa.float64())])
+
+# Scraped 2024 Constituency column, e.g. "12 - Kokrajhar(ST) (Assam)"
+constituency_pattern_2024 = (r"(?P<constituency_code>\d+) - (?P<constituency_name>[^(]+)"
+                             r"(?:\((?P<reservation_status>ST|SC)\))? \((?P<state>.+)\)")
+
+
+def clean_results_2024(results, name_index=None):
+    """Cleaned 2024 results from the scraped election_results.csv frame, with one row per candidate."""
+    name_index = name_index or NameIndex.load()
+    results = results.copy()
+
+    # Basic cleaning of strings
+    for col in ['Candidate', 'Constituency', 'Party']:
+        results[col] = results[col].str.strip().str.upper()
+
+    # Separate the Constituency column into code, name, reservation status and state. The code is shown on a
+    # different part of the page to the Constituency Number, so verify that they match
+    parts = results['Constituency'].str.extract(constituency_pattern_2024)
+    assert (parts['constituency_code'].astype(int) == results['Constituency Number']).all()
+    results['Constituency ID'] = name_index.resolve_constituencies(parts['state'].str.strip(),
+                                                                   parts['constituency_name'].str.strip()).to_numpy()
+    assert results['Constituency ID'].notna().all(), "Add the unresolved names to name_aliases.csv"
+
+    # Votes are "-" where missing: treat as 0 votes
+    for col in ['EVM Votes', 'Postal Votes', 'Total Votes']:
+        results[col] = pd.to_numeric(results[col].replace("-", np.nan)).fillna(0).astype(int)
+    results['% of Votes'] = pd.to_numeric(results['% of Votes'].replace("-", np.nan))
+    assert (results['EVM Votes'] + results['Postal Votes'] == results['Total Votes']).all()
+
+    # Total votes cast per constituency come from the TOTAL rows, which are then dropped
+    is_total = results['Candidate'] == 'TOTAL'
+    total_votes_cast = results[is_total].set_index('Constituency ID')['Total Votes']
+    results = results[~is_total].reset_index(drop=True)
+    results['Total Votes Cast'] = results['Constituency ID'].map(total_votes_cast)
+    results['Vote Share (%)'] = results['Total Votes'] / results['Total Votes Cast'] * 100
+
+    # Official and calculated vote shares agree to 2 d.p. (Surat has no share - it was uncontested)
+    share_diff = (results['Vote Share (%)'].round(2) - results['% of Votes']).abs()
+    assert (share_diff.isna() | (share_diff < 1e-9)).all(), "Calculated vote shares differ from ECI shares"
+
+    results['Candidate Category'] = None
+    return to_store_frame(results, 2024, name_index)
+
+
+def read_results_2019(xlsx_path):
+    """2019 results from the ECI statistical report (33. Constituency Wise Detailed Result.xlsx)."""
+    return pd.read_excel(xlsx_path, sheet_name="mySheet", usecols="A:N", skiprows=2, nrows=8598)
+
+
+def clean_results_2019(election_2019, name_index=None):
+    """Cleaned 2019 results from the statistical report frame, with one row per candidate."""
+    name_index = name_index or NameIndex.load()
+    election_2019 = election_2019.copy()
+    election_2019.columns = election_2019.columns.str.strip().str.title()
+    election_2019 = election_2019.rename(columns={"Pc Name": "Constituency",
+                                                  "State Name": "State",
+                                                  "Candidates Name": "Candidate",
+                                                  "Category": "Candidate Category",
+                                                  "Party Name": "Party",
+                                                  "General": "EVM Votes",
+                                                  "Postal": "Postal Votes",
+                                                  "Total": "Total Votes",
+                                                  "Over Total Votes Polled In Constituency": "Actual share"})
+
+    # In Rajampet, Andhra Pradesh, the BJP candidate doesn't exist in the ECI data (!), though the BJP contested
+    # 437 seats. Pappireddi Maheswara Reddy supposedly contested: add him with 0 votes
+    rajampet = {"State": "ANDHRA PRADESH", "Constituency": "RAJAMPET",
+                "Candidate": "PAPPIREDDI MAHESWARA REDDY", "Candidate Category": "GENERAL", "Party": "BJP",
+                "EVM Votes": 0, "Postal Votes": 0, "Total Votes": 0}
+    election_2019 = pd.concat([election_2019, pd.DataFrame([rajampet])], ignore_index=True)
+    assert (election_2019["EVM Votes"] + election_2019["Postal Votes"] == election_2019["Total Votes"]).all()
+
+    election_2019[["State", "Constituency"]] = election_2019[["State", "Constituency"]].apply(
+        lambda x: x.str.strip().str.upper())
+    election_2019['Constituency ID'] = name_index.resolve_constituencies(election_2019['State'],
+                                                                         election_2019['Constituency']).to_numpy()
+    assert election_2019['Constituency ID'].notna().all(), "Add the unresolved names to name_aliases.csv"
+
+    # Calculate total votes polled in each constituency (across all candidates) and vote shares.
+    # ECI's own shares are always slightly lower (by > 0.05pp in 253 rows); not sure why, so use calculated shares
+    election_2019["Total Votes Cast"] = election_2019.groupby("Constituency ID")["Total Votes"].transform("sum")
+    election_2019["Vote Share (%)"] = election_2019["Total Votes"] / election_2019["Total Votes Cast"] * 100
+    assert (election_2019["Vote Share (%)"] - election_2019["Actual share"]).fillna(0).ge(0).all()
+
+    return to_store_frame(election_2019, 2019, name_index)
+
+
+def to_store_frame(frame, year, name_index):
+    # Canonical names from the Constituency IDs, store columns and types
+    frame = frame.assign(Year=year,
+                         State=name_index.state_names(frame['Constituency ID']).to_numpy(),
+                         Constituency=name_index.constituency_names(frame['Constituency ID']).to_numpy())
+    # Rows keep their source order within each constituency (the 2019 NOTA category fill depends on it)
+    frame = frame[store_columns].sort_values('Constituency ID', kind='stable', ignore_index=True)
+    frame['Constituency ID'] = frame['Constituency ID'].astype("Int64")
+    for col in int_columns:
+        frame[col] = frame[col].astype("Int64")
+    for col in categorical_columns:
+        frame[col] = frame[col].astype("category")
+    return frame
+
+
+def write_results(frame, year, path=store_path):
+    """Replace one election year in the store with a cleaned results frame."""
+    shutil.rmtree(Path(path) / f"Year={year}", ignore_errors=True)
+    table = pa.Table.from_pandas(frame.assign(Year=year)[store_columns], schema=store_schema, preserve_index=False)
+    ds.write_dataset(table, path, format="parquet", partitioning=partitioning, preserve_order=True,
+                     existing_data_behavior="overwrite_or_ignore")
+
+
+def load_results(years=None, states=None, columns=None, path=store_path):
+    """Results from the store; only the requested years, states and columns are read from disk."""
+    dataset = ds.dataset(path, format="parquet", partitioning=partitioning, schema=store_schema)
+    conditions = []
+    if years is not None:
+        conditions.append(ds.field('Year').isin(list(years)))
+    if states is not None:
+        conditions.append(ds.field('State').isin(list(states)))
+    row_filter = None
+    for condition in conditions:
+        row_filter = condition if row_filter is None else row_filter & condition
+    frame = dataset.to_table(columns=columns, filter=row_filter).to_pandas()
+    for col in categorical_columns:
+        if col in frame.columns:
+            frame[col] = frame[col].astype("category").cat.remove_unused_categories()
+    return frame
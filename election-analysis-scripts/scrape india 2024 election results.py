@@ -7,93 +7,122 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 import time
 import pandas as pd
-import os
+from pathlib import Path
 import io
+import eci_scraper
+from page_cache import PageCache
+from live_poll import LivePoller
+from poll_scheduler import PollScheduler
 
 # Set loc and define paths used to load and save data
-os.getwd()
-base_path = Path().resolve().parent 
+base_path = Path().resolve().parent  # Run from election-analysis-scripts
 election_data_output_path = base_path / "election-data"
 
-# First task: listing all valid URLs. Need Selenium due to ECI website's settings. Doesn't seem to be work in headless mode.
-
-# Path to your ChromeDriver
-cService = webdriver.ChromeService(executable_path = '/usr/local/bin/chromedriver')
-
-# Initialize Selenium WebDriver
-driver = webdriver.Chrome(service = cService)
-
-# List to store valid URLs
-valid_urls = []
-
-# Base ECI URL for 2024 election results in states
-base_url = "https://results.eci.gov.in/PcResultGenJune2024/ConstituencywiseS"
-
-# Loop through state codes and constituency numbers
-for state_code in range(1, 30):  # 28 states -> assuming up to 30 state codes
-    for constituency_number in range(1, 81):  # up to 80 constituencies per state
-        # Construct the URL
-        url = f"{base_url}{state_code:02}{constituency_number}.htm"
-
-        try:
-           # Open the URL in the browser
-            driver.get(url)
-            time.sleep(2)  # Allow time for the page to load
-
-            # Check if the page is valid or throws up an error
-            if "Election Commission of India" in driver.page_source:
-                print(f"URL exists: {url}")
-                valid_urls.append({"state_code": state_code, "constituency_number": constituency_number, "url": url})
-            else:
-                print(f"Invalid URL found, stopping search for state {state_code}: {url}")
-                break  # Exit inner loop if invalid URL is found
-        except Exception as e:
-            print(f"Error accessing {url}: {e}")
-            break  # Exit inner loop on error
-
-# Base URL for 2024 election results in union territories
-base_url = "https://results.eci.gov.in/PcResultGenJune2024/ConstituencywiseU"
-
-# Loop through union territory codes and constituency numbers
-for ut_code in range(1, 20):  # 9 UTs; assuming up to 20 UT codes
-    for constituency_number in range(1, 81):  # Assuming up to 80 constituencies
-        # Construct the URL
-        url = f"{base_url}{ut_code:02}{constituency_number}.htm"
-
-        try:
-            # Open the URL in the browser
-            driver.get(url)
-            time.sleep(2)  # Allow time for the page to load
-
-            # Check if the page contains valid content
-            if "Election Commission of India" in driver.page_source:
-                print(f"URL exists: {url}")
-                valid_urls.append({"state_code": ut_code, "constituency_number": constituency_number, "url": url})
-            else:
-                print(f"Invalid URL found, stopping search for UT {ut_code}: {url}")
-                break  # Exit inner loop if invalid URL is found
-        except Exception as e:
-            print(f"Error accessing {url}: {e}")
-            break  # Exit inner loop on error
+# First task: listing all valid URLs. The browser loop needs Selenium due to ECI website's settings. Doesn't seem to
+# be work in headless mode.
 
+# Discovery mode: "fast" probes all state and UT codes in parallel over plain HTTP, finding the last constituency
+# number in each by galloping/binary search seeded from the cached valid_urls.csv (see eci_scraper.py);
+# "selenium" is the original brute-force browser loop below
+discovery_mode = "fast"
+urls_output_path = election_data_output_path / "valid_urls.csv"
 
-# Close the browser
-driver.quit()
+if discovery_mode == "fast":
+    cached_urls_df = pd.read_csv(urls_output_path) if urls_output_path.exists() else None
+    valid_urls_df = eci_scraper.discover_urls(cached_urls_df=cached_urls_df)
+
+    # Check the result against the cached URL list
+    if cached_urls_df is not None:
+        new_urls, missing_urls = eci_scraper.compare_with_cache(valid_urls_df, cached_urls_df)
+        print(f"{len(valid_urls_df)} valid URLs; {len(new_urls)} not in cache, "
+              f"{len(missing_urls)} cached URLs no longer valid")
+
+else:
+    # Path to your ChromeDriver
+    cService = webdriver.ChromeService(executable_path = '/usr/local/bin/chromedriver')
+
+    # Initialize Selenium WebDriver
+    driver = webdriver.Chrome(service = cService)
+
+    # List to store valid URLs
+    valid_urls = []
+
+    # Base ECI URL for 2024 election results in states
+    base_url = "https://results.eci.gov.in/PcResultGenJune2024/ConstituencywiseS"
+
+    # Loop through state codes and constituency numbers
+    for state_code in range(1, 30):  # 28 states -> assuming up to 30 state codes
+        for constituency_number in range(1, 81):  # up to 80 constituencies per state
+            # Construct the URL
+            url = f"{base_url}{state_code:02}{constituency_number}.htm"
+
+            try:
+               # Open the URL in the browser
+                driver.get(url)
+                time.sleep(2)  # Allow time for the page to load
+
+                # Check if the page is valid or throws up an error
+                if "Election Commission of India" in driver.page_source:
+                    print(f"URL exists: {url}")
+                    valid_urls.append({"state_code": state_code, "constituency_number": constituency_number,
+                                       "url": url})
+                else:
+                    print(f"Invalid URL found, stopping search for state {state_code}: {url}")
+                    break  # Exit inner loop if invalid URL is found
+            except Exception as e:
+                print(f"Error accessing {url}: {e}")
+                break  # Exit inner loop on error
+
+    # Base URL for 2024 election results in union territories
+    base_url = "https://results.eci.gov.in/PcResultGenJune2024/ConstituencywiseU"
+
+    # Loop through union territory codes and constituency numbers
+    for ut_code in range(1, 20):  # 9 UTs; assuming up to 20 UT codes
+        for constituency_number in range(1, 81):  # Assuming up to 80 constituencies
+            # Construct the URL
+            url = f"{base_url}{ut_code:02}{constituency_number}.htm"
+
+            try:
+                # Open the URL in the browser
+                driver.get(url)
+                time.sleep(2)  # Allow time for the page to load
+
+                # Check if the page contains valid content
+                if "Election Commission of India" in driver.page_source:
+                    print(f"URL exists: {url}")
+                    valid_urls.append({"state_code": ut_code, "constituency_number": constituency_number, "url": url})
+                else:
+                    print(f"Invalid URL found, stopping search for UT {ut_code}: {url}")
+                    break  # Exit inner loop if invalid URL is found
+            except Exception as e:
+                print(f"Error accessing {url}: {e}")
+                break  # Exit inner loop on error
+
+
+    # Close the browser
+    driver.quit()
+
+    valid_urls_df = pd.DataFrame(valid_urls)
 
 # Save valid URLs to a CSV file
-valid_urls_df = pd.DataFrame(valid_urls)
-urls_output_path = election_data_output_path / "valid_urls.csv"
 valid_urls_df.to_csv(urls_output_path, index=False)
 print(f"Valid URLs saved to {urls_output_path}.")
 
 
 # Second task: actually scrape data from all valid URLs. Loop over all valid URLs.
 
-# Path to your ChromeDriver
-cService = webdriver.ChromeService(executable_path = '/usr/local/bin/chromedriver')
+# Scraping mode: "http" fetches all pages concurrently over plain HTTP (see eci_scraper.py) and only falls back to
+# Selenium for pages whose raw HTML has no results table; "selenium" is the original one-page-at-a-time browser loop
+scrape_mode = "http"
+concurrency = 16  # Number of pages fetched at once
+requests_per_second = 10  # Per-host rate limit, to stay polite to the ECI servers
 
-# Initialize Selenium WebDriver
-driver = webdriver.Chrome(service = cService)
+# Raw pages are archived in a compressed, content-addressed cache (see page_cache.py). Unchanged pages are skipped
+# with conditional requests; resume_scrape skips already-cached pages entirely (e.g. after a crash);
+# reparse_offline rebuilds the results from the archive without touching the network (e.g. after a parser fix)
+page_cache = PageCache(election_data_output_path / "raw-pages")
+resume_scrape = False
+reparse_offline = False
 
 # Load the valid URLs from the CSV
 valid_urls_df = pd.read_csv(urls_output_path)
@@ -105,40 +134,55 @@ header_xpath = '/html/body/main/div/div[1]/h2/span'  # XPath for the constituenc
 # Define a list to store all constituency data
 all_data = []
 
-# Loop through all valid URLs
-for _, row in valid_urls_df.iterrows():
-    url = row['url']
-    print(f"Scraping URL: {url}")
+if reparse_offline:
+    all_data = [eci_scraper.parse_cached_pages(valid_urls_df, page_cache)]
+
+elif scrape_mode == "http":
+    # Same frames as the Selenium loop below, in the same order
+    all_data = [eci_scraper.scrape_results(valid_urls_df, concurrency=concurrency, rate=requests_per_second,
+                                           cache=page_cache, resume=resume_scrape)]
+
+else:
+    # Path to your ChromeDriver
+    cService = webdriver.ChromeService(executable_path = '/usr/local/bin/chromedriver')
+
+    # Initialize Selenium WebDriver
+    driver = webdriver.Chrome(service = cService)
 
-    try:
-        # Open the URL in the browser
-        driver.get(url)
-        time.sleep(5)  # Allow time for the page to load
+    # Loop through all valid URLs
+    for _, row in valid_urls_df.iterrows():
+        url = row['url']
+        print(f"Scraping URL: {url}")
 
-        # Scrape the table
-        table_element = driver.find_element(By.XPATH, table_xpath)
-        table_html = table_element.get_attribute('outerHTML')
-        table_df = pd.read_html(io.StringIO(table_html))[0]
+        try:
+            # Open the URL in the browser
+            driver.get(url)
+            time.sleep(5)  # Allow time for the page to load
 
-        # Scrape the constituency name
-        header_element = driver.find_element(By.XPATH, header_xpath)
-        constituency_name = header_element.text  # Extract the text content
+            # Scrape the table
+            table_element = driver.find_element(By.XPATH, table_xpath)
+            table_html = table_element.get_attribute('outerHTML')
+            table_df = pd.read_html(io.StringIO(table_html))[0]
 
-        # Add the constituency name to the DataFrame
-        table_df['Constituency'] = constituency_name
+            # Scrape the constituency name
+            header_element = driver.find_element(By.XPATH, header_xpath)
+            constituency_name = header_element.text  # Extract the text content
 
-        # Add additional context from the URL (state and constituency numbers)
-        table_df['State Code'] = row['state_code']
-        table_df['Constituency Number'] = row['constituency_number']
+            # Add the constituency name to the DataFrame
+            table_df['Constituency'] = constituency_name
 
-        # Append the data to the list
-        all_data.append(table_df)
+            # Add additional context from the URL (state and constituency numbers)
+            table_df['State Code'] = row['state_code']
+            table_df['Constituency Number'] = row['constituency_number']
 
-    except Exception as e:
-        print(f"Error scraping {url}: {e}")
+            # Append the data to the list
+            all_data.append(table_df)
 
-# Close the browser
-driver.quit()
+        except Exception as e:
+            print(f"Error scraping {url}: {e}")
+
+    # Close the browser
+    driver.quit()
 
 # Combine all data into a single DataFrame
 full_results_df = pd.concat(all_data, ignore_index=True)
@@ -148,3 +192,25 @@ full_results_path = election_data_output_path / "election_results.csv"
 full_results_df.to_csv(full_results_path, index=False)
 
 print(f"Scraping complete. Results saved to {full_results_path}.")
+
+
+# Third task (counting day only): keep polling the same URLs while votes are counted.
+# Each round revalidates every page through the page cache, re-parses only pages that changed, and appends
+# per-candidate vote changes to an append-only delta log (see live_poll.py); election_results.csv is refreshed
+# whenever something changed
+live_polling = False
+poll_interval = 60  # Seconds between polling rounds
+
+# Adaptive polling: instead of flat rounds, each page gets its own refresh interval from its winning margin, how
+# recently it changed and whether the result is declared, within one global request budget (see poll_scheduler.py)
+adaptive_polling = True
+requests_per_minute = 300
+
+if live_polling:
+    poller = LivePoller(valid_urls_df, page_cache, election_data_output_path / "live_deltas.csv",
+                        concurrency=concurrency, rate=requests_per_second)
+    if adaptive_polling:
+        scheduler = PollScheduler(valid_urls_df['url'], budget_per_minute=requests_per_minute)
+        poller.run_adaptive(scheduler, snapshot_path=full_results_path)
+    else:
+        poller.run(interval=poll_interval, snapshot_path=full_results_path)
@@ -0,0 +1,230 @@
+# Seat projections from swing scenarios, with Monte Carlo draws across processes
+# A scenario is a list of swing specs, each moving one party or alliance's vote share nationally or in some states:
+#   {"view": "BHARATIYA JANATA PARTY", "swing": -2.0}                        # points, nationally
+#   {"view": "INDIA", "swing": 1.5, "sd": 1.0, "state": "UTTAR PRADESH"}   # normal draws, mean 1.5, in UP only
+# "state" may be one state or a list (canonical names, election-data/constituencies.csv). Specs covering the same
+# candidate add up. An alliance spec moves its candidate in each constituency (the member party that stood for it).
+# - uniform swing: every candidate of the party/alliance in scope gains the swing in points
+# - proportional swing: every candidate's share is scaled by (scope share + swing) / scope share, where the scope
+#   share is the party/alliance's vote share across the scope (weighted by votes cast, when given)
+# Only the party/alliance's own shares move; swing from one party to another is two specs. Shares floor at 0.
+# Each draw takes one value per spec ("sd" 0: always the mean), plus optional independent constituency-level noise.
+# The simulator works on a constituency x slot array: the candidates any spec moves, plus the strongest candidate no
+# spec moves (which never changes), so a draw is one sparse product, an argmax per constituency and a bincount.
+# Draws are split into chunks with independent seeds (from one seed), run across worker processes; the results
+# don't depend on the number of workers.
+#   projection = project_seats(2024, [{"view": "NDA", "swing": -1.0, "sd": 2.0}], draws=20000)
+#   projection.summary(); projection.win_probability["NDA"]
+
+# Load packages
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from election_comparison import election_matrix, not_candidates, votes_cast
+from name_resolution import NameIndex
+
+methods = ["uniform", "proportional"]
+default_chunk_size = 1000  # Draws per task
+
+# Per-process simulation, set once by init_worker
+_worker = {}
+
+
+class SeatProjection:
+    """Seat distributions and win probabilities from a number of draws of a swing scenario.
+
+    - seats: draw x view seat counts, for every party that won a seat in any draw and every alliance
+    - win_probability: constituency x view, the share of draws in which the party/alliance won the seat
+    """
+
+    def __init__(self, seats, win_probability):
+        self.seats = seats
+        self.win_probability = win_probability
+
+    @property
+    def majority(self):
+        return len(self.win_probability) // 2 + 1
+
+    def summary(self, quantiles=(0.05, 0.5, 0.95)):
+        """Per view: mean seats, seat quantiles and the probability of a majority, by mean seats."""
+        table = pd.DataFrame({"Mean seats": self.seats.mean()})
+        for quantile in quantiles:
+            table[f"Seats ({quantile:.0%})"] = self.seats.quantile(quantile)
+        table["P(majority)"] = (self.seats >= self.majority).mean()
+        return table.sort_values("Mean seats", ascending=False)
+
+
+class SeatSimulator:
+    """Swing scenarios applied to one election's constituency x party vote shares (a ResultsMatrix)."""
+
+    def __init__(self, matrix, states=None, votes_cast=None):
+        # states: State by Constituency ID (default from the name index); votes_cast: total votes by Constituency ID,
+        # to weight scope shares for proportional swing (default: constituencies weighted equally)
+        table = matrix.table
+        alliances = list(table["Party"].columns) if "Party" in table else []
+        shares = table["Vote Share (%)"]
+        parties = [view for view in shares.columns if view not in alliances]
+        self.constituencies = table.index
+        self.parties, self.alliances = pd.Index(parties), pd.Index(alliances)
+
+        # Uncontested candidates (no vote share, e.g. Surat 2024) always win
+        stood = table["Candidate"][parties].notna().to_numpy()
+        share = shares[parties].to_numpy(dtype=float)
+        self.share = np.where(stood, np.where(np.isnan(share), np.inf, share), -np.inf)
+        # NOTA isn't a candidate: it never wins a seat, nor stands in slot 0 for the strongest unmoved candidate
+        self.share[:, self.parties.isin(not_candidates)] = -np.inf
+        self.alliance_share = shares[alliances].to_numpy(dtype=float)
+        # Position of the party standing for each alliance in each constituency (-1: none)
+        members = table["Party"][alliances].to_numpy(dtype=object)
+        self.members = self.parties.get_indexer(members.ravel()).reshape(members.shape)
+
+        if states is None:
+            states = NameIndex.load().state_names(self.constituencies).set_axis(self.constituencies)
+        self.states = states.reindex(self.constituencies).to_numpy()
+        self.weights = (np.ones(len(self.constituencies)) if votes_cast is None
+                        else votes_cast.reindex(self.constituencies).fillna(0).to_numpy(dtype=float))
+
+    def spec_cells(self, spec, method):
+        """Constituency and party positions of the candidates a spec moves, and each one's change per point of swing."""
+        scope = np.ones(len(self.constituencies), dtype=bool)
+        if spec.get("state") is not None:
+            states = [spec["state"]] if isinstance(spec["state"], str) else spec["state"]
+            scope = np.isin(self.states, states)
+        view = spec["view"]
+        if view in self.alliances:
+            column = self.alliances.get_loc(view)
+            rows = np.flatnonzero(scope & (self.members[:, column] >= 0))
+            cells = self.members[rows, column]
+            view_share = np.nan_to_num(self.alliance_share[:, column])
+        elif view in self.parties:
+            column = self.parties.get_loc(view)
+            rows = np.flatnonzero(scope & (self.share[:, column] > -np.inf))
+            cells = np.full(len(rows), column)
+            view_share = np.where(np.isfinite(self.share[:, column]), self.share[:, column], 0)
+        else:
+            raise ValueError(f"Unknown party or alliance: {view}")
+        if not len(rows):
+            raise ValueError(f"{view} has no candidates in scope of {spec}")
+
+        # Uncontested candidates don't move
+        contested = np.isfinite(self.share[rows, cells])
+        if method == "uniform":
+            return rows, cells, contested.astype(float)
+        scope_share = np.average(view_share[scope], weights=self.weights[scope])
+        return rows, cells, np.where(contested, self.share[rows, cells], 0) / scope_share
+
+    def simulation(self, scenario, method="uniform", constituency_sd=0.0):
+        """Arrays for simulate_draws: the slot layout, base shares and the spec -> slot change matrix."""
+        if method not in methods:
+            raise ValueError(f"Unknown swing method {method!r}; use one of {methods}")
+        specs = [self.spec_cells(spec, method) for spec in scenario]
+        rows = np.concatenate([spec_rows for spec_rows, _, _ in specs] + [np.array([], dtype=int)])
+        cells = np.concatenate([spec_cells for _, spec_cells, _ in specs] + [np.array([], dtype=int)])
+        moved, spec_positions = np.unique(rows * len(self.parties) + cells, return_inverse=True)
+        moved_rows, moved_parties = np.divmod(moved, len(self.parties))
+
+        # Slot 0 of each constituency: its strongest candidate that no spec moves; slots 1...: moved candidates
+        fixed = self.share.copy()
+        fixed[moved_rows, moved_parties] = -np.inf
+        slot = np.arange(len(moved)) - np.searchsorted(moved_rows, moved_rows) + 1
+        slots = slot.max() + 1 if len(moved) else 1
+        slot_party = np.full((len(self.constituencies), slots), -1)
+        slot_party[:, 0] = np.argmax(fixed, axis=1)
+        base = np.full(slot_party.shape, -np.inf)
+        base[:, 0] = fixed[np.arange(len(fixed)), slot_party[:, 0]]
+        slot_party[base[:, 0] == -np.inf, 0] = -1
+        slot_party[moved_rows, slot] = moved_parties
+        base[moved_rows, slot] = self.share[moved_rows, moved_parties]
+
+        # Seat-winning contenders (any party in a slot) and alliances are the views counted
+        contenders = np.unique(slot_party[slot_party >= 0])
+        view_of_party = np.full(len(self.parties) + 1, -1)  # Position -1: no candidate
+        view_of_party[contenders] = np.arange(len(contenders))
+        slot_view = view_of_party[slot_party]
+        alliance_slot = [(slot_party == self.members[:, [column]]) & (self.members[:, [column]] >= 0)
+                         for column in range(len(self.alliances))]
+
+        changes = sp.csr_matrix((np.concatenate([weights for _, _, weights in specs] + [np.array([])]),
+                                 (spec_positions, np.repeat(np.arange(len(specs)), [len(r) for r, _, _ in specs]))),
+                                shape=(len(moved), len(specs)))
+        return {
+            "views": list(self.parties[contenders]) + list(self.alliances),
+            "base": base, "slot_view": slot_view, "alliance_slot": alliance_slot,
+            "moved_slots": np.ravel_multi_index((moved_rows, slot), base.shape), "changes": changes,
+            "mean": np.array([spec["swing"] for spec in scenario], dtype=float),
+            "sd": np.array([spec.get("sd", 0.0) for spec in scenario], dtype=float),
+            "constituency_sd": constituency_sd,
+        }
+
+    def simulate(self, scenario, draws=1, method="uniform", constituency_sd=0.0, seed=None, workers=1,
+                 chunk_size=default_chunk_size):
+        """SeatProjection of `draws` draws of a scenario (a list of swing specs); workers=None: one per CPU."""
+        simulation = self.simulation(scenario, method, constituency_sd)
+        sizes = [min(chunk_size, draws - start) for start in range(0, draws, chunk_size)]
+        tasks = list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+
+        workers = min(workers or os.cpu_count() or 1, len(tasks)) or 1
+        if workers == 1:
+            init_worker(simulation)
+            results = [simulate_draws(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                     initargs=(simulation,)) as executor:
+                results = list(executor.map(simulate_draws, tasks))
+
+        seats = pd.DataFrame(np.concatenate([chunk_seats for chunk_seats, _ in results]),
+                             columns=simulation["views"]).rename_axis(index="draw", columns="view")
+        wins = sum(chunk_wins for _, chunk_wins in results)
+        win_probability = pd.DataFrame(wins / draws, index=self.constituencies, columns=simulation["views"])
+        # Contenders that never win a seat (e.g. in slot 0 only as a runner-up) are dropped
+        won = (seats.sum() > 0) | seats.columns.isin(self.alliances)
+        return SeatProjection(seats.loc[:, won], win_probability.loc[:, won].rename_axis(columns="view"))
+
+
+def init_worker(simulation):
+    _worker["simulation"] = simulation
+
+
+def simulate_draws(task):
+    """Seat counts (draw x view) and wins (constituency x view) for one chunk of draws: (draws, seed sequence)."""
+    draws, seed = task
+    simulation = _worker["simulation"]
+    rng = np.random.default_rng(seed)
+    base, slot_view, moved_slots = simulation["base"], simulation["slot_view"], simulation["moved_slots"]
+    constituencies, views = len(base), len(simulation["views"])
+
+    swings = simulation["mean"] + simulation["sd"] * rng.standard_normal((draws, len(simulation["mean"])))
+    moved = base.ravel()[moved_slots] + (simulation["changes"] @ swings.T).T
+    if simulation["constituency_sd"]:
+        moved += simulation["constituency_sd"] * rng.standard_normal(moved.shape)
+    values = np.broadcast_to(base.ravel(), (draws, base.size)).copy()
+    values[:, moved_slots] = np.maximum(moved, 0)
+    winning_slot = values.reshape(draws, *base.shape).argmax(axis=2)
+
+    # Party seats by bincount of (draw, view) and (constituency, view); alliances by their members' slots
+    rows = np.arange(constituencies)
+    winners = slot_view[rows, winning_slot]
+    won = winners >= 0
+    seats = np.zeros((draws, views), dtype=np.int32)
+    wins = np.zeros((constituencies, views))
+    parties = views - len(simulation["alliance_slot"])
+    draw_positions = np.broadcast_to(np.arange(draws)[:, None], winners.shape)
+    seats[:, :parties] = np.bincount((draw_positions * parties + winners)[won],
+                                     minlength=draws * parties).reshape(draws, parties)
+    wins[:, :parties] = np.bincount((rows * parties + winners)[won], minlength=constituencies * parties).reshape(
+        constituencies, parties)
+    for column, alliance_slot in enumerate(simulation["alliance_slot"]):
+        alliance_won = alliance_slot[rows, winning_slot]
+        seats[:, parties + column] = alliance_won.sum(axis=1)
+        wins[:, parties + column] = alliance_won.sum(axis=0)
+    return seats, wins
+
+
+def project_seats(year, scenario, draws=1, method="uniform", alliance_rules=None, **kwargs):
+    """SeatProjection of a scenario applied to one election in the results store; kwargs as SeatSimulator.simulate."""
+    simulator = SeatSimulator(election_matrix(year, alliance_rules), votes_cast=votes_cast(year))
+    return simulator.simulate(scenario, draws=draws, method=method, **kwargs)
@@ -0,0 +1,142 @@
+# Static (matplotlib) swing-arrow maps
+# The notebook's arrow plots drew the India outline, state and constituency borders with GeoDataFrame.plot, then
+# looped over constituencies adding one FancyArrowPatch each. Here:
+# - Basemap converts the outlines to matplotlib paths once (all coordinates at once, in EPSG:7755) and draws them as
+#   one collection per layer, so many figures (parties, alliances, years, scales) reuse the same paths
+# - draw_swing_arrows computes every arrow's start and end point in one NumPy step (swing_arrows.arrow_geometry) and
+#   draws all shafts as one LineCollection and all arrowheads as one PolyCollection
+# swing_arrow_map combines the two for any swing: e.g. matrix_2024["BHARATIYA JANATA PARTY"] - matrix_2019["BJP"].
+# vote_share_map shades the basemap's constituencies by vote share, as the scripts' static maps do with
+# GeoDataFrame.plot(column="Vote Share (%)"); Basemap.crop zooms any of them to one state.
+
+# Load packages
+import matplotlib.pyplot as plt
+import numpy as np
+import shapely
+from matplotlib.collections import LineCollection, PathCollection, PolyCollection
+from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.path import Path
+from matplotlib.transforms import Bbox
+
+from geometry_cache import load_geometry_cache, load_india_outline, load_points, load_state_outlines, projected_crs
+from swing_arrows import arrow_geometry, away_colour, towards_colour
+
+
+def geometry_paths(geometries):
+    """One matplotlib Path per (multi)polygon, holes included, built from all coordinates at once."""
+    geometries = np.asarray(geometries, dtype=object)
+    parts, part_owners = shapely.get_parts(geometries, return_index=True)
+    rings, ring_parts = shapely.get_rings(parts, return_index=True)
+    coords, vertex_rings = shapely.get_coordinates(rings, return_index=True)
+
+    # Every ring starts with MOVETO and ends with CLOSEPOLY (its closing vertex)
+    codes = np.full(len(coords), Path.LINETO, dtype=Path.code_type)
+    first = np.r_[True, vertex_rings[1:] != vertex_rings[:-1]]
+    codes[first] = Path.MOVETO
+    codes[np.r_[first[1:], True]] = Path.CLOSEPOLY
+
+    splits = np.searchsorted(part_owners[ring_parts[vertex_rings]], np.arange(1, len(geometries)))
+    return [Path(vertices, path_codes) for vertices, path_codes in zip(np.split(coords, splits),
+                                                                        np.split(codes, splits))]
+
+
+class Basemap:
+    """India outline, state and constituency borders as matplotlib paths, converted once and drawn on any axes."""
+
+    def __init__(self, constituencies, states, india):
+        # constituencies: GeoSeries indexed by Constituency ID; states, india: outlines, all in the same projected CRS
+        self.constituency_ids = constituencies.index
+        self.constituency_paths = geometry_paths(constituencies.to_numpy())
+        self.state_names = states.index
+        self.state_paths = geometry_paths(states.to_numpy())
+        self.india_paths = geometry_paths(india.to_numpy())
+
+    @classmethod
+    def from_cache(cls, level="full", crs=projected_crs):
+        """Basemap of the geometry cache's constituencies and state/national outlines (geometry_cache.py)."""
+        return cls(load_geometry_cache(level, columns=[]).geometry.to_crs(crs),
+                   load_state_outlines(level).geometry.to_crs(crs),
+                   load_india_outline(level).geometry.to_crs(crs))
+
+    def draw(self, ax, missing=()):
+        """Draw the basemap, with the constituencies in `missing` (Constituency IDs, e.g. no candidate) in grey."""
+        ax.add_collection(PathCollection(self.india_paths, facecolor='#FAFAFA', edgecolor='black', linewidth=0.25,
+                                         zorder=1))
+        ax.add_collection(PathCollection(self.state_paths, facecolor='none', edgecolor='#808080', linewidth=0.25,
+                                         zorder=1))
+        ax.add_collection(PathCollection(self.constituency_paths, facecolor='none', edgecolor='#A9A9A9',
+                                         linewidth=0.1, zorder=1))
+        missing_paths = [self.constituency_paths[position]
+                         for position in np.flatnonzero(self.constituency_ids.isin(missing))]
+        ax.add_collection(PathCollection(missing_paths, facecolor='#D3D3D3', edgecolor='gray', linewidth=0.05,
+                                         zorder=1))
+        ax.autoscale_view()
+        ax.set_aspect('equal')
+        ax.axis('off')
+
+    def crop(self, ax, state, margin=0.05):
+        """Zoom the axes to one state's outline."""
+        paths = [self.state_paths[position] for position in np.flatnonzero(self.state_names == state)]
+        if not paths:
+            raise ValueError(f"Unknown state {state!r}")
+        extent = Bbox.union([path.get_extents() for path in paths])
+        pad = margin * max(extent.width, extent.height)
+        ax.set_xlim(extent.x0 - pad, extent.x1 + pad)
+        ax.set_ylim(extent.y0 - pad, extent.y1 + pad)
+
+
+def draw_swing_arrows(ax, swing, points, scale=300000, head_length=0.08, linewidth=0.5, zorder=2):
+    """Draw one arrow per constituency with a swing, as two artists; returns them (remove() to redraw on the same axes).
+
+    swing: vote swings by Constituency ID; points: arrow start points (centroid_x, centroid_y, as from
+    geometry_cache.load_points) by Constituency ID. The largest swing's arrow is `scale` long (in map units, metres),
+    arrowheads are head_length * scale long.
+    """
+    swing = swing[swing.notna() & swing.index.isin(points.index)]  # Skip constituencies not on the map (Assam 2024)
+    starts = points.loc[swing.index, ['centroid_x', 'centroid_y']].to_numpy()
+    shafts, heads = arrow_geometry(starts[:, 0], starts[:, 1], swing.to_numpy(), scale,
+                                   head_length=(head_length, 0))
+    colours = np.where(swing.to_numpy() < 0, away_colour, towards_colour)
+    lines = LineCollection(shafts, colors=colours, linewidths=linewidth, zorder=zorder)
+    tips = PolyCollection(heads, facecolors=colours, edgecolors='none', zorder=zorder)
+    ax.add_collection(lines)
+    ax.add_collection(tips)
+    return lines, tips
+
+
+def swing_arrow_map(swing, basemap=None, points=None, title=None, ax=None, figsize=(12, 12), **arrow_options):
+    """Static swing-arrow map of any party/alliance swing (by Constituency ID) between two elections.
+
+    Constituencies without a swing (no candidate in either year) are shaded grey. Pass a Basemap and points to reuse
+    them across figures; arrow_options go to draw_swing_arrows (e.g. scale).
+    """
+    basemap = basemap or Basemap.from_cache()
+    points = load_points() if points is None else points
+    if ax is None:
+        fig, ax = plt.subplots(1, 1, figsize=figsize)
+    basemap.draw(ax, missing=basemap.constituency_ids.difference(swing.dropna().index))
+    draw_swing_arrows(ax, swing, points, **arrow_options)
+    if title:
+        ax.set_title(title, fontsize=16)
+    return ax.figure
+
+
+def vote_share_map(values, basemap=None, colors=('#FFEB99', '#FF6600'), title=None, ax=None, figsize=(8, 8)):
+    """Static map of vote shares (by Constituency ID) on a colour scale from colors[0] to colors[-1], with a colour bar.
+
+    Constituencies without a vote share (no candidate) are shaded grey.
+    """
+    basemap = basemap or Basemap.from_cache()
+    if ax is None:
+        fig, ax = plt.subplots(1, 1, figsize=figsize)
+    values = values[values.notna() & values.index.isin(basemap.constituency_ids)]  # Only constituencies on the map
+    basemap.draw(ax, missing=basemap.constituency_ids.difference(values.index))
+    positions = basemap.constituency_ids.get_indexer(values.index)
+    shading = PathCollection([basemap.constituency_paths[position] for position in positions],
+                             array=values.to_numpy(dtype=float), cmap=LinearSegmentedColormap.from_list(
+                                 'vote_share', list(colors)), edgecolor='gray', linewidth=0.1, zorder=1)
+    ax.add_collection(shading)
+    ax.figure.colorbar(shading, ax=ax, shrink=0.7)
+    if title:
+        ax.set_title(title, fontsize=16)
+    return ax.figure
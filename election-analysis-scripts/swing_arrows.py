@@ -0,0 +1,78 @@
+# Vote swing arrows, computed for all constituencies at once
+# Each arrow starts at the constituency centroid and points up-right for a swing towards a party/alliance and up-left
+# for a swing away from it, with length proportional to Vote Swing / max_swing. arrow_geometry returns every shaft
+# and arrowhead as NumPy arrays; swing_arrow_layer turns them into one folium layer of GeoJSON (one feature per arrow)
+# instead of a folium PolyLine plus a Marker with its own base64 SVG icon per constituency, so the map has one layer
+# to draw, arrows scale with the map at every zoom level, and the HTML holds only coordinates and tooltip fields.
+
+# Load packages
+import folium
+import numpy as np
+
+towards_colour = '#FF6600'  # Swing towards the party/alliance (orange)
+away_colour = '#0384fc'  # Swing away from it (blue)
+tooltip_style = ("background-color: white; color: black; font-size: 12px;"
+                 "padding: 5px; margin: 0; box-shadow: none; width: auto; height: auto;")
+
+
+def arrow_geometry(x, y, swing, scale, max_swing=None, head_length=(0.05, 0.15), head_width=0.8):
+    """Shaft and arrowhead coordinates of every swing arrow.
+
+    x, y: arrow start points (e.g. centroids); swing: vote swings, scaled by `scale` / max_swing (default the largest
+    absolute swing). Arrowheads are head_length[0] + head_length[1] * |swing| / max_swing long, in units of `scale`
+    (never longer than the arrow), and head_width times as wide as they are long.
+    Returns (shafts, heads): arrays of shape (n, 2, 2), start and head base, and (n, 4, 2), closed triangles.
+    """
+    start = np.column_stack([x, y]).astype(float)
+    swing = np.asarray(swing, dtype=float)
+    max_swing = np.nanmax(np.abs(swing)) if max_swing is None else max_swing
+    fraction = np.abs(swing) / max_swing
+    offset = np.column_stack([swing / max_swing, fraction]) * scale
+    end = start + offset
+
+    # Arrowhead: tip at the end, base back along the arrow, corners either side of the base
+    length = np.hypot(offset[:, 0], offset[:, 1])
+    direction = np.divide(offset, length[:, None], out=np.zeros_like(offset), where=length[:, None] > 0)
+    head = np.minimum((head_length[0] + head_length[1] * fraction) * scale, length)[:, None]
+    base = end - direction * head
+    side = direction[:, ::-1] * [-1, 1] * head * head_width / 2
+    shafts = np.stack([start, base], axis=1)
+    heads = np.stack([end, base + side, base - side, end], axis=1)
+    return shafts, heads
+
+
+def swing_arrow_layer(frame, swing="Vote Swing", x="centroid_lon", y="centroid_lat", scale=1,
+                      head_length=(0.05, 0.15), fields=None, aliases=None, precision=4, weight=2, opacity=0.9,
+                      **kwargs):
+    """folium layer with one arrow per row of `frame` (longitude/latitude start points in columns x and y).
+
+    Arrows as arrow_geometry (head_length=(0, 0) for lines only). Tooltips show `fields` (default: the swing), labelled
+    by `aliases`; kwargs go to folium.FeatureGroup. Rows without a swing are skipped.
+    """
+    frame = frame[frame[swing].notna()]
+    fields = fields or [swing]
+    shafts, heads = arrow_geometry(frame[x].to_numpy(), frame[y].to_numpy(), frame[swing].to_numpy(), scale,
+                                   head_length=head_length)
+    shafts, heads = shafts.round(precision), heads.round(precision)
+    properties = frame[fields].round(2)
+    properties = properties.astype(object).where(properties.notna(), None).to_dict("records")
+
+    # One GeoJSON layer per direction, so each has a single style rather than a style per feature
+    layer = folium.FeatureGroup(**kwargs)
+    away = frame[swing].to_numpy() < 0
+    for colour, rows in [(away_colour, np.flatnonzero(away)), (towards_colour, np.flatnonzero(~away))]:
+        features = [{"type": "Feature", "properties": properties[row],
+                     "geometry": {"type": "MultiLineString", "coordinates": [shaft, head]}}
+                    for row, shaft, head in zip(rows, shafts[rows].tolist(), heads[rows].tolist())]
+        if not features:
+            continue
+        # Polylines with fill: the shaft has no area, the closed arrowhead is filled
+        style = {"color": colour, "fillColor": colour, "weight": weight, "opacity": opacity, "fill": True,
+                 "fillOpacity": opacity}
+        folium.GeoJson(
+            {"type": "FeatureCollection", "features": features},
+            style_function=lambda feature, style=style: style,
+            tooltip=folium.GeoJsonTooltip(fields=fields, aliases=aliases or fields, localize=True, sticky=True,
+                                          style=tooltip_style),
+        ).add_to(layer)
+    return layer
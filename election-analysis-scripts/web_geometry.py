@@ -0,0 +1,186 @@
+# Compact geometry output for interactive (folium) maps
+# folium.GeoJson(frame.to_json()) inlines full-precision coordinates for every constituency, so each shared border is
+# stored twice. Two smaller encodings:
+# - to_topojson: quantised TopoJSON. Coordinates are snapped to an integer grid, borders shared by neighbouring
+#   constituencies are stored once as arcs, and arcs are delta-encoded. Shared borders are only found when both sides
+#   have identical vertices, as in the cleaned coverage of the geometry cache (geometry_cache.py)
+# - to_geojson: plain GeoJSON with coordinates rounded to fixed precision
+# Both keep the frame's non-geometry columns as feature properties, so folium style functions and tooltips work
+# unchanged; topojson_layer wraps a frame as a folium.TopoJson layer. Quantisation can make a few polygons
+# self-intersect at coarse precision, which Leaflet draws without complaint.
+# See benchmark map geometry output.py for sizes and parse times per precision.
+
+# Load packages
+import json
+
+import folium
+import numpy as np
+import shapely
+
+default_quantization = 1e5  # Grid steps across the map's extent: ~30m across India
+
+
+def feature_properties(frame):
+    """Non-geometry columns as JSON-ready dicts (missing values as null)."""
+    properties = frame.drop(columns=frame.geometry.name)
+    properties = properties.astype(object).where(properties.notna(), None)
+    return properties.to_dict("records")
+
+
+def to_geojson(frame, precision=4):
+    """GeoJSON FeatureCollection (dict) with coordinates rounded to `precision` decimal places."""
+    geometries = shapely.transform(frame.geometry.to_numpy(), lambda coords: coords.round(precision))
+    features = [{"type": "Feature", "properties": properties,
+                 "geometry": None if geometry is None else json.loads(shapely.to_geojson(geometry))}
+                for properties, geometry in zip(feature_properties(frame), geometries)]
+    return {"type": "FeatureCollection", "features": features}
+
+
+def quantise(frame, quantization):
+    """Ring vertices snapped to an integer grid, as one point id per vertex.
+
+    Returns (point ids, ring of each vertex, part of each ring, row of each part, grid steps, TopoJSON transform).
+    """
+    minx, miny, maxx, maxy = frame.total_bounds
+    steps = int(quantization)
+    scale = np.array([(maxx - minx) / (steps - 1) or 1, (maxy - miny) / (steps - 1) or 1])
+    parts, part_rows = shapely.get_parts(frame.geometry.to_numpy(), return_index=True)
+    rings, ring_parts = shapely.get_rings(parts, return_index=True)
+    coords, vertex_rings = shapely.get_coordinates(rings, return_index=True)
+    grid = np.round((coords - [minx, miny]) / scale).astype(np.int64)
+    point_ids = grid[:, 0] * steps + grid[:, 1]
+
+    # Drop each ring's closing vertex, and vertices that snap onto the previous one (also across the ring's end)
+    last = np.r_[vertex_rings[1:] != vertex_rings[:-1], True]
+    keep = ~last & np.r_[True, (point_ids[1:] != point_ids[:-1]) | (vertex_rings[1:] != vertex_rings[:-1])]
+    point_ids, vertex_rings = point_ids[keep], vertex_rings[keep]
+    first = np.r_[True, vertex_rings[1:] != vertex_rings[:-1]]
+    ring_firsts = np.flatnonzero(first)
+    ring_lasts = np.r_[ring_firsts[1:], len(point_ids)] - 1
+    wraps = point_ids[ring_lasts] == point_ids[ring_firsts]
+    keep = np.ones(len(point_ids), dtype=bool)
+    keep[ring_lasts[wraps & (ring_lasts > ring_firsts)]] = False
+    point_ids, vertex_rings = point_ids[keep], vertex_rings[keep]
+
+    transform = {"scale": scale.tolist(), "translate": [minx, miny]}
+    return point_ids, vertex_rings, ring_parts, part_rows, steps, transform
+
+
+def find_junctions(point_ids, vertex_rings):
+    """Points where rings meet or part ways: a point is a junction if rings pass it between different neighbours."""
+    first = np.r_[True, vertex_rings[1:] != vertex_rings[:-1]]
+    ring_firsts = np.flatnonzero(first)
+    ring_lasts = np.r_[ring_firsts[1:], len(point_ids)] - 1
+    ring_of = np.cumsum(first) - 1
+    positions = np.arange(len(point_ids))
+    previous = np.where(first, ring_lasts[ring_of], positions - 1)
+    following = np.where(positions == ring_lasts[ring_of], ring_firsts[ring_of], positions + 1)
+    low = np.minimum(point_ids[previous], point_ids[following])
+    high = np.maximum(point_ids[previous], point_ids[following])
+
+    passes = np.unique(np.column_stack([point_ids, low, high]), axis=0)
+    points, pass_counts = np.unique(passes[:, 0], return_counts=True)
+    return set(points[pass_counts > 1].tolist())
+
+
+def to_topojson(frame, quantization=default_quantization, object_name="constituencies"):
+    """Quantised TopoJSON Topology (dict) with one GeometryCollection object, `object_name`, of the frame's rows.
+
+    For folium: folium.TopoJson(topology, f"objects.{object_name}", style_function=..., tooltip=...)
+    """
+    point_ids, vertex_rings, ring_parts, part_rows, steps, transform = quantise(frame, quantization)
+    junctions = find_junctions(point_ids, vertex_rings)
+
+    arcs, arc_index = [], {}
+
+    def arc_reference(points):
+        # Index of an arc, or ~index if it's an existing arc traversed backwards
+        points = tuple(points)
+        if points in arc_index:
+            return arc_index[points]
+        if points[::-1] in arc_index:
+            return ~arc_index[points[::-1]]
+        arc_index[points] = len(arcs)
+        arcs.append(points)
+        return arc_index[points]
+
+    # Cut every ring into arcs at its junctions
+    ring_arcs = {}
+    ring_bounds = np.flatnonzero(np.r_[True, vertex_rings[1:] != vertex_rings[:-1], True])
+    for start, end in zip(ring_bounds[:-1], ring_bounds[1:]):
+        ring = point_ids[start:end].tolist()
+        if len(ring) < 3:  # Collapsed at this precision
+            continue
+        cuts = [position for position, point in enumerate(ring) if point in junctions]
+        if not cuts:
+            # A ring with no junctions (island, or enclave border) is one closed arc, started at its lowest point so
+            # both rings of an enclave border find the same arc (one forwards, one backwards)
+            lowest = ring.index(min(ring))
+            ring = ring[lowest:] + ring[:lowest + 1]
+            ring_arcs[vertex_rings[start]] = [arc_reference(ring)]
+            continue
+        ring = ring[cuts[0]:] + ring[:cuts[0]] + [ring[cuts[0]]]
+        cuts = [cut - cuts[0] for cut in cuts] + [len(ring) - 1]
+        ring_arcs[vertex_rings[start]] = [arc_reference(ring[a:b + 1]) for a, b in zip(cuts[:-1], cuts[1:])]
+
+    # Polygons: shell then holes per part; parts whose shell collapsed are dropped
+    row_polygons = [[] for _ in range(len(frame))]
+    part_ring_lists = {}
+    for ring, part in enumerate(ring_parts):
+        part_ring_lists.setdefault(part, []).append(ring)
+    for part, rings in part_ring_lists.items():
+        if rings[0] in ring_arcs:
+            row_polygons[part_rows[part]].append([ring_arcs[ring] for ring in rings if ring in ring_arcs])
+
+    geometries = []
+    for properties, polygons in zip(feature_properties(frame), row_polygons):
+        if not polygons:
+            geometries.append({"type": None, "properties": properties})
+        elif len(polygons) == 1:
+            geometries.append({"type": "Polygon", "arcs": polygons[0], "properties": properties})
+        else:
+            geometries.append({"type": "MultiPolygon", "arcs": polygons, "properties": properties})
+
+    # Arcs as delta-encoded grid positions
+    encoded_arcs = []
+    for points in arcs:
+        grid = np.column_stack(np.divmod(np.array(points, dtype=np.int64), steps))
+        encoded_arcs.append(np.vstack([grid[:1], np.diff(grid, axis=0)]).tolist())
+
+    return {"type": "Topology", "transform": transform, "arcs": encoded_arcs,
+            "objects": {object_name: {"type": "GeometryCollection", "geometries": geometries}}}
+
+
+def topojson_layer(frame, quantization=default_quantization, object_name="constituencies", **kwargs):
+    """folium.TopoJson layer of a frame's rows; kwargs (style_function, tooltip, ...) as for folium.GeoJson."""
+    return folium.TopoJson(to_topojson(frame, quantization, object_name), f"objects.{object_name}", **kwargs)
+
+
+def topology_to_geojson(topology, object_name="constituencies"):
+    """Decode a topology back to a GeoJSON FeatureCollection (for checks; browsers use topojson-client)."""
+    scale, translate = np.array(topology["transform"]["scale"]), np.array(topology["transform"]["translate"])
+    # Undo the delta encoding of all arcs at once: running sum over every position, minus the sum before each arc
+    lengths = np.array([len(arc) for arc in topology["arcs"]])
+    positions = np.cumsum(np.concatenate(topology["arcs"]), axis=0)
+    starts = np.r_[0, np.cumsum(lengths)[:-1]]
+    positions -= np.repeat(np.vstack([[0, 0], positions[starts[1:] - 1]]), lengths, axis=0)
+    decoded = np.split(positions * scale + translate, np.cumsum(lengths)[:-1])
+
+    def ring(references):
+        coords = []
+        for reference in references:
+            arc = decoded[reference] if reference >= 0 else decoded[~reference][::-1]
+            coords.extend((arc[1:] if coords else arc).tolist())
+        return coords
+
+    features = []
+    for geometry in topology["objects"][object_name]["geometries"]:
+        if geometry["type"] == "Polygon":
+            shape = {"type": "Polygon", "coordinates": [ring(references) for references in geometry["arcs"]]}
+        elif geometry["type"] == "MultiPolygon":
+            shape = {"type": "MultiPolygon",
+                     "coordinates": [[ring(references) for references in polygon] for polygon in geometry["arcs"]]}
+        else:
+            shape = None
+        features.append({"type": "Feature", "properties": geometry["properties"], "geometry": shape})
+    return {"type": "FeatureCollection", "features": features}